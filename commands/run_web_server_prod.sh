@@ -1,8 +1,10 @@
 #!/bin/sh
 
 # Running Gunicorn with Uvicorn workers
+# WEB_CONCURRENCY is also read by the app to size its per-worker password hashing pools
+export WEB_CONCURRENCY="${WEB_CONCURRENCY:-10}"
 gunicorn main:app \
-    --workers 10 \
+    --workers "$WEB_CONCURRENCY" \
     --worker-class uvicorn.workers.UvicornWorker \
     --bind 0.0.0.0:8000 \
     --log-level info \
@@ -0,0 +1,93 @@
+"""
+Benchmark the per-request cost of turning catalog filters into a compiled statement, without a database.
+
+"rebuilt" builds the statement from the filters on every request, as the
+routes did before `catalog_statements`; "memoized" looks the statement shape
+up in `catalog_statements`. Both then go through the engine's compiled cache
+the way an execution does, so a warm run shows what is left per request once
+every shape has been compiled once.
+
+Run from `src`:
+
+    python -m benchmarks.catalog_statements
+"""
+import argparse
+import time
+
+from fastapi_pagination import Params
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.util import LRUCache
+
+from benchmarks.columnar_catalog import movie_filters
+from catalog.cards import movie_cards_select
+from catalog.filters import apply_movie_filters, apply_movie_sorting, movie_filter_values
+from catalog.query import catalog_statements
+from schemas.movies import MovieSortField
+
+SHAPES = {
+    "no filters": movie_filters(sort_by=MovieSortField.YEAR_DESC),
+    "year range + price": movie_filters(year_min=1990, year_max=2010, price_max=15,
+                                        sort_by=MovieSortField.IMDB_DESC),
+    "genres + actors": movie_filters(genres=["Drama", "Crime"], actors=["Al Pacino"],
+                                     sort_by=MovieSortField.POPULARITY_DESC),
+    "full-text search": movie_filters(search="godfather", sort_by=MovieSortField.RELEVANCE),
+}
+
+
+def rebuilt(filters, params):
+    raw = params.to_raw_params()
+    query = apply_movie_sorting(apply_movie_filters(movie_cards_select(), filters), filters)
+    return query.limit(raw.limit).offset(raw.offset)
+
+
+def memoized(filters, params):
+    values = movie_filter_values(filters)
+    page, _ = catalog_statements(tuple(values), filters.sort_by)
+    return page
+
+
+def compile_cached(statement, dialect, compiled_cache):
+    return statement._compile_w_cache(
+        dialect,
+        compiled_cache=compiled_cache,
+        column_keys=[],
+        for_executemany=False,
+        schema_translate_map=None,
+    )
+
+
+def per_request_ms(build, filters, params, dialect, compiled_cache, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        compile_cached(build(filters, params), dialect, compiled_cache)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def cold_compile_ms(build, filters, params, dialect) -> float:
+    statement = build(filters, params)
+    started = time.perf_counter()
+    statement.compile(dialect=dialect)
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark catalog statement building and compilation.")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    dialect = asyncpg_dialect()
+    params = Params(page=3, size=20)
+    rebuilt(SHAPES["no filters"], params).compile(dialect=dialect)
+    print(f"{'shape':<22}{'cold compile ms':>17}{'rebuilt ms':>12}{'memoized ms':>13}")
+    for name, filters in SHAPES.items():
+        cold = cold_compile_ms(rebuilt, filters, params, dialect)
+        timings = []
+        for build in (rebuilt, memoized):
+            compiled_cache = LRUCache(100)
+            compile_cached(build(filters, params), dialect, compiled_cache)
+            timings.append(per_request_ms(build, filters, params, dialect, compiled_cache, args.repeat))
+        print(f"{name:<22}{cold:>17.3f}{timings[0]:>12.3f}{timings[1]:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Benchmark the columnar catalog engine on a synthetic catalog, alone or against the SQL path.
+
+Without a database, the engine is filled straight from random arrays and
+only its own timings are reported. With `--database-url`, the same kind of
+synthetic catalog is seeded into that (empty, disposable) Postgres database,
+the engine is loaded from it through its regular reload, and every scenario
+is timed both ways: `paginate_catalog` and `count_movie_facets` for SQL,
+the engine page plus `load_movie_cards` (what the listing route does) and the
+engine facet counts for the columnar side.
+
+Run from `src`:
+
+    python -m benchmarks.columnar_catalog --movies 1000000
+    python -m benchmarks.columnar_catalog --movies 1000000 \\
+        --database-url postgresql+asyncpg://postgres@localhost:5432/catalog_benchmark
+"""
+import argparse
+import asyncio
+import time
+from dataclasses import fields
+
+import numpy as np
+from fastapi_pagination import Params
+from sqlalchemy import ColumnElement, func, insert, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from catalog.bitmaps import RoaringBitmap
+from catalog.cards import load_movie_cards, movie_card_document
+from catalog.columnar import ColumnarCatalog, ColumnarSnapshot, MEMBERSHIP_KINDS
+from catalog.facets import count_movie_facets
+from catalog.filters import MovieFilterParams
+from catalog.query import paginate_catalog
+from catalog.search import DEFAULT_SIMILARITY_THRESHOLD
+from database.models import accounts, movies, order, payments, shopping_cart  # noqa: F401
+from database.models.base import Base
+from database.models.movies import CertificationsModel, MovieCardModel, MovieModel
+from schemas.movies import MovieSortField
+
+MEMBERSHIP_NAMES = {"genres": 25, "stars": 20000, "directors": 5000}
+MEMBERSHIPS_PER_MOVIE = {"genres": 3, "stars": 4, "directors": 1}
+
+
+def movie_filters(**values) -> MovieFilterParams:
+    defaults = {field.name: None for field in fields(MovieFilterParams)}
+    defaults.update(fuzzy=False, similarity=DEFAULT_SIMILARITY_THRESHOLD)
+    return MovieFilterParams(**{**defaults, **values})
+
+
+def synthetic_snapshot(movies: int, seed: int = 0) -> ColumnarSnapshot:
+    """
+    Fill a snapshot straight from random column arrays and membership postings.
+    """
+    rng = np.random.default_rng(seed)
+    snapshot = ColumnarSnapshot(capacity=movies)
+    snapshot.columns["id"][:] = np.arange(1, movies + 1)
+    snapshot.columns["year"][:] = rng.integers(1920, 2025, movies)
+    snapshot.columns["imdb"][:] = np.round(rng.uniform(1, 10, movies), 1)
+    snapshot.columns["price"][:] = np.round(rng.uniform(1, 30, movies), 2)
+    snapshot.columns["votes"][:] = rng.integers(0, 2_000_000, movies)
+    snapshot.alive[:] = True
+    snapshot.size = movies
+    snapshot.rows = dict(zip(range(1, movies + 1), range(movies)))
+    for kind in MEMBERSHIP_KINDS:
+        per_movie = MEMBERSHIPS_PER_MOVIE[kind]
+        names = rng.integers(0, MEMBERSHIP_NAMES[kind], movies * per_movie)
+        rows = np.repeat(np.arange(movies), per_movie)
+        order = np.argsort(names, kind="stable")
+        names, rows = names[order], rows[order]
+        starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+        for name, members in zip(names[starts], np.split(rows, starts[1:])):
+            snapshot.postings[kind][f"{kind}-{name}"] = RoaringBitmap(np.unique(members))
+    return snapshot
+
+
+def timed(function, repeat: int) -> float:
+    function()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+SCENARIOS = {
+    "no filters, newest first": movie_filters(sort_by=MovieSortField.YEAR_DESC),
+    "year range, imdb desc": movie_filters(year_min=1990, year_max=2010, sort_by=MovieSortField.IMDB_DESC),
+    "one genre, price asc": movie_filters(genres=["genres-3"], sort_by=MovieSortField.PRICE_ASC),
+    "two genres + director": movie_filters(genres=["genres-1", "genres-2"], directors=["directors-7"],
+                                           sort_by=MovieSortField.POPULARITY_DESC),
+    "genre + actor + ranges": movie_filters(genres=["genres-5"], actors=["stars-11", "stars-12"], imdb_min=5,
+                                            price_max=20, sort_by=MovieSortField.YEAR_ASC),
+}
+
+
+async def timed_async(function, repeat: int) -> float:
+    await function()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await function()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def _names(kind: str) -> ColumnElement:
+    return literal_column(
+        f"ARRAY(SELECT DISTINCT '{kind}-' || floor(random() * {MEMBERSHIP_NAMES[kind]})::int "
+        f"FROM generate_series(1, {MEMBERSHIPS_PER_MOVIE[kind]}) WHERE movies.id > 0)::varchar[]"
+    )
+
+
+async def seed_database(db: AsyncSession, movies: int) -> None:
+    """
+    Create the schema and insert `movies` synthetic movies with their listing cards, all server-side.
+    """
+    await db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    await db.run_sync(lambda session: Base.metadata.create_all(session.connection()))
+    certification_id = await db.scalar(
+        insert(CertificationsModel).values(name="PG-13").returning(CertificationsModel.id)
+    )
+    await db.execute(
+        text(
+            "INSERT INTO movies (id, uuid, name, year, time, imdb, votes, price, certification_id, available) "
+            "SELECT n, gen_random_uuid(), 'Movie ' || n, 1920 + floor(random() * 105)::int, 90, "
+            "round((1 + random() * 9)::numeric, 1), floor(random() * 2000000)::int, "
+            "round((1 + random() * 29)::numeric, 2), :certification_id, true "
+            "FROM generate_series(1, :movies) AS n"
+        ),
+        {"certification_id": certification_id, "movies": movies},
+    )
+    await db.execute(insert(MovieCardModel).from_select(
+        ["movie_id", "genre_names", "star_names", "director_names", "card"],
+        select(MovieModel.id, _names("genres"), _names("stars"), _names("directors"), movie_card_document()),
+    ))
+    await db.commit()
+    await db.execute(text("ANALYZE"))
+
+
+async def compare_with_sql(database_url: str, movies: int, repeat: int, page_size: int) -> None:
+    engine = create_async_engine(database_url)
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        existing = await db.scalar(text("SELECT to_regclass('movie_cards') IS NOT NULL"))
+        if not existing or not await db.scalar(select(func.count()).select_from(MovieCardModel)):
+            started = time.perf_counter()
+            await seed_database(db, movies)
+            print(f"seeded {movies} movies in {time.perf_counter() - started:.1f} s")
+
+        catalog = ColumnarCatalog()
+        started = time.perf_counter()
+        await catalog.rebuild(db)
+        await db.commit()
+        print(f"loaded the engine from the database in {time.perf_counter() - started:.1f} s")
+
+        async def engine_page(filters: MovieFilterParams, page: int) -> None:
+            _, movie_ids = catalog.page(filters, (page - 1) * page_size, page_size)
+            await load_movie_cards(db, movie_ids)
+
+        async def engine_facets(filters: MovieFilterParams) -> None:
+            catalog.facet_counts(filters)
+
+        print(f"{'scenario':<28}{'matches':>10}{'page 1 sql / engine ms':>26}{'page 100 sql / engine ms':>28}"
+              f"{'facets sql / engine ms':>26}")
+        sql_repeat = max(1, repeat // 4)
+        for name, filters in SCENARIOS.items():
+            total, _ = catalog.page(filters, 0, page_size)
+            timings = []
+            for page in (1, 100):
+                params = Params(page=page, size=page_size)
+                timings.append((
+                    await timed_async(lambda: paginate_catalog(db, filters, params), sql_repeat),
+                    await timed_async(lambda: engine_page(filters, page), repeat),
+                ))
+            timings.append((
+                await timed_async(lambda: count_movie_facets(db, filters), sql_repeat),
+                await timed_async(lambda: engine_facets(filters), sql_repeat),
+            ))
+            cells = "".join(f"{f'{sql:.2f} / {columnar:.2f}':>{width}}"
+                            for (sql, columnar), width in zip(timings, (26, 28, 26)))
+            print(f"{name:<28}{total:>10}{cells}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the columnar catalog engine.")
+    parser.add_argument("--movies", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--database-url", help="Empty Postgres database to seed and compare the SQL path on")
+    args = parser.parse_args()
+
+    if args.database_url:
+        asyncio.run(compare_with_sql(args.database_url, args.movies, args.repeat, args.page_size))
+        return
+
+    started = time.perf_counter()
+    snapshot = synthetic_snapshot(args.movies)
+    print(f"built {args.movies} movies in {time.perf_counter() - started:.1f} s")
+
+    print(f"{'scenario':<28}{'matches':>10}{'page 1 ms':>12}{'page 100 ms':>13}{'facets ms':>12}")
+    for name, filters in SCENARIOS.items():
+        total, _ = snapshot.page(filters, 0, args.page_size)
+        first = timed(lambda: snapshot.page(filters, 0, args.page_size), args.repeat)
+        deep = timed(lambda: snapshot.page(filters, 99 * args.page_size, args.page_size), args.repeat)
+        facets = timed(lambda: snapshot.facet_counts(filters), max(1, args.repeat // 4))
+        print(f"{name:<28}{total:>10}{first:>12.2f}{deep:>13.2f}{facets:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark the per-request cost of resolving the shared dependencies, without a database.
+
+"per-request" builds a fresh container, and so fresh settings (re-reading the
+environment and `.env`), JWT manager, email sender with its Jinja environment
+and S3 client, on every request, as the dependencies did before `AppContainer`;
+"container" reads them from the one built for the application. Each request
+goes through FastAPI's dependency resolution to a route that takes all of
+them, so the difference is what every route using them paid per request.
+
+Run from `src`:
+
+    python -m benchmarks.dependency_resolution --requests 2000
+"""
+import argparse
+import time
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from config import (AppContainer, BaseAppSettings, get_accounts_email_notificator, get_container,
+                    get_jwt_auth_manager, get_s3_storage_client, get_settings)
+from notifications import EmailSenderInterface
+from security.interface import JWTAuthManagerInterface
+from storages import S3StorageInterface
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    def resolve(
+            settings: BaseAppSettings = Depends(get_settings),
+            jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+            email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
+            s3_client: S3StorageInterface = Depends(get_s3_storage_client)
+    ) -> dict:
+        return {}
+
+    return app
+
+
+def per_request_container(request: Request) -> AppContainer:
+    return AppContainer(get_settings.__wrapped__())
+
+
+def time_requests(app: FastAPI, requests: int) -> float:
+    with TestClient(app) as client:
+        for _ in range(min(requests, 50)):
+            client.get("/")
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get("/")
+        return (time.perf_counter() - started) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-request dependency resolution.")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    shared = build_app()
+    per_request = build_app()
+    per_request.dependency_overrides[get_container] = per_request_container
+
+    results = {"per-request": time_requests(per_request, args.requests),
+               "container": time_requests(shared, args.requests)}
+    for name, seconds in results.items():
+        print(f"{name:<12} {seconds * 1000:8.3f} ms/request")
+    saved = results["per-request"] - results["container"]
+    print(f"{'saved':<12} {saved * 1000:8.3f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark login password verification throughput and event-loop stalls, without a database.
+
+"inline" verifies on the event loop, as the login route did before
+`AsyncPasswordHasher`; "pool" hands the calls to the hasher's process pool.
+While the logins run, a heartbeat task measures how long the event loop is
+blocked, which is the latency every other request on the worker pays.
+
+Run from `src`:
+
+    python -m benchmarks.password_hashing --logins 64 --cost 12
+"""
+import argparse
+import asyncio
+import time
+
+from security.passwords import AsyncPasswordHasher, PasswordHashPolicy
+
+PASSWORD = "correct horse battery staple"
+
+
+async def heartbeat(stop: asyncio.Event, interval: float = 0.005) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run_logins(verify, logins: int, concurrency: int) -> tuple[float, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login() -> None:
+        async with semaphore:
+            assert await verify()
+
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(stop))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, await monitor
+
+
+async def benchmark(logins: int, concurrency: int, policy: PasswordHashPolicy, workers: int) -> None:
+    context = policy.context()
+    hashed = context.hash(PASSWORD)
+
+    async def verify_inline() -> bool:
+        return context.verify(PASSWORD, hashed)
+
+    hasher = AsyncPasswordHasher(max_workers=workers, policy=policy)
+    await hasher.verify(PASSWORD, hashed)
+
+    async def verify_in_pool() -> bool:
+        return await hasher.verify(PASSWORD, hashed)
+
+    print(f"{policy.scheme} cost {policy.cost}, {logins} logins, {concurrency} concurrent, "
+          f"{hasher.stats().max_workers} pool processes")
+    print(f"{'mode':<8}{'logins/s':>10}{'total s':>10}{'worst loop stall ms':>22}")
+    try:
+        for name, verify in (("inline", verify_inline), ("pool", verify_in_pool)):
+            elapsed, stall = await run_logins(verify, logins, concurrency)
+            print(f"{name:<8}{logins / elapsed:>10.1f}{elapsed:>10.2f}{stall * 1000:>22.1f}")
+        print(f"peak waiting for the pool: {hasher.stats().peak_waiting}")
+    finally:
+        hasher.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark password verification throughput.")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--scheme", default="bcrypt")
+    parser.add_argument("--cost", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=0, help="Pool processes; default_hash_workers() when 0")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.logins, args.concurrency, PasswordHashPolicy(args.scheme, args.cost),
+                          args.workers or None))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from cache.interface import CacheBackendInterface
+from cache.memory import InMemoryCache
+from cache.redis_cache import RedisCache
+from cache.keys import cache_key, CATALOG_TAG
+from cache.single_flight import SingleFlight
+from cache.read_through import ReadThroughCache
+from cache.http import make_etag, is_not_modified, cache_headers, accepts_encoding
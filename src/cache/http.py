@@ -0,0 +1,61 @@
+from fastapi import Request
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong entity tag from the parts that fully determine a response.
+    """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match header matches the current entity tag.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def cache_headers(etag: str, max_age: int) -> dict[str, str]:
+    """
+    Validator and freshness headers for shared (proxy) caching of public catalog responses.
+    """
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}, must-revalidate",
+    }
+
+
+def _quality(parameters: list[str]) -> float:
+    for parameter in parameters:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepts_encoding(request: Request, encoding: str) -> bool:
+    """
+    Whether the request's Accept-Encoding header allows a content coding, honouring q-values.
+
+    An explicit entry for the coding wins over a `*` wildcard; `q=0` refuses it.
+    """
+    header = request.headers.get("accept-encoding")
+    if not header:
+        return False
+    wildcard = None
+    for entry in header.split(","):
+        coding, *parameters = entry.split(";")
+        coding = coding.strip().lower()
+        if coding == encoding or (encoding == "gzip" and coding == "x-gzip"):
+            return _quality(parameters) > 0
+        if coding == "*":
+            wildcard = _quality(parameters) > 0
+    return bool(wildcard)
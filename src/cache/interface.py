@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Iterable
+
+
+class CacheBackendInterface(ABC):
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached value stored under a key.
+
+        :param key: The cache key.
+        :return: The cached bytes, or None on a miss or an expired entry.
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: int, tags: Iterable[str] = ()) -> None:
+        """
+        Store a value under a key for a limited time.
+
+        :param key: The cache key.
+        :param value: The serialized value.
+        :param ttl_seconds: Time to live of the entry in seconds.
+        :param tags: Tags the entry can later be invalidated by.
+        """
+        pass
+
+    @abstractmethod
+    async def invalidate_tags(self, *tags: str) -> None:
+        """
+        Drop every entry stored with any of the given tags.
+
+        :param tags: The tags to invalidate.
+        """
+        pass
@@ -0,0 +1,28 @@
+import hashlib
+import json
+from enum import Enum
+from typing import Any
+
+CATALOG_TAG = "movies"
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple, set)):
+        return sorted(_normalize(item) for item in value)
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+
+def cache_key(namespace: str, params: dict[str, Any]) -> str:
+    """
+    Build a cache key from request parameters.
+
+    Unset parameters are dropped, list values are sorted and strings are
+    whitespace-normalized, so equivalent requests share one entry.
+    """
+    normalized = {name: _normalize(value) for name, value in params.items() if value not in (None, [], "")}
+    digest = hashlib.sha256(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{namespace}:{digest}"
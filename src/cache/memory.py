@@ -0,0 +1,55 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Iterable
+
+from cache.interface import CacheBackendInterface
+
+
+class InMemoryCache(CacheBackendInterface):
+    """
+    Per-process LRU cache with a TTL per entry and tag-based invalidation.
+
+    Entries are only visible to the worker process that stored them, so this
+    backend suits single-worker deployments; use `RedisCache` otherwise.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = OrderedDict()
+        self._tagged: dict[str, set[str]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int, tags: Iterable[str] = ()) -> None:
+        self._discard(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl_seconds, value, tags)
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._entries) > self._max_entries:
+            self._discard(next(iter(self._entries)))
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        for tag in tags:
+            for key in self._tagged.pop(tag, set()):
+                self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import struct
+import time
+from typing import Awaitable, Callable, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cache.interface import CacheBackendInterface
+from cache.single_flight import SingleFlight
+
+Loader = Callable[[AsyncSession], Awaitable[bytes]]
+
+_HEADER = struct.Struct("!d")
+
+
+def _pack(fresh_until: float, body: bytes) -> bytes:
+    return _HEADER.pack(fresh_until) + body
+
+
+def _unpack(envelope: bytes) -> tuple[float, bytes]:
+    (fresh_until,) = _HEADER.unpack_from(envelope)
+    return fresh_until, envelope[_HEADER.size:]
+
+
+class ReadThroughCache:
+    """
+    Serialized-response cache in front of the catalog read paths.
+
+    Misses for the same key are coalesced by a per-process `SingleFlight`, so an
+    expired hot entry costs one query per worker instead of one per request.
+    With `stale_seconds` > 0 an expired entry is still served for that long
+    while a single background task reloads it. Loaders receive their own
+    session because a background refresh outlives the request that started it.
+    """
+
+    def __init__(
+            self,
+            backend: CacheBackendInterface,
+            session_factory: Callable[[], AsyncSession],
+            ttl_seconds: int,
+            stale_seconds: int = 0
+    ):
+        self._backend = backend
+        self._session_factory = session_factory
+        self._ttl_seconds = ttl_seconds
+        self._stale_seconds = stale_seconds
+        self._flight = SingleFlight()
+        self._refreshing: set[asyncio.Task] = set()
+
+    async def get_or_load(self, key: str, loader: Loader, tags: Iterable[str] = ()) -> bytes:
+        tags = tuple(tags)
+        envelope = await self._backend.get(key)
+        if envelope is not None:
+            fresh_until, body = _unpack(envelope)
+            if fresh_until > time.time():
+                return body
+            if self._stale_seconds:
+                self._refresh_in_background(key, loader, tags)
+                return body
+        return await self._flight.do(key, lambda: self._load(key, loader, tags))
+
+    async def _load(self, key: str, loader: Loader, tags: tuple[str, ...]) -> bytes:
+        async with self._session_factory() as session:
+            body = await loader(session)
+        await self._backend.set(
+            key,
+            _pack(time.time() + self._ttl_seconds, body),
+            self._ttl_seconds + self._stale_seconds,
+            tags
+        )
+        return body
+
+    def _refresh_in_background(self, key: str, loader: Loader, tags: tuple[str, ...]) -> None:
+        if self._flight.is_in_flight(key):
+            return
+        task = asyncio.create_task(self._flight.do(key, lambda: self._load(key, loader, tags)))
+        self._refreshing.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refreshing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error(f"Failed to refresh a cached catalog response: {task.exception()}")
@@ -0,0 +1,54 @@
+import logging
+from typing import Optional, Iterable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from cache.interface import CacheBackendInterface
+
+
+class RedisCache(CacheBackendInterface):
+    """
+    Redis-backed cache shared by every worker process.
+
+    Each tag is a Redis set of the keys stored with it. Eviction is left to the
+    server's `maxmemory-policy` (e.g. `allkeys-lru`). Redis failures are logged
+    and treated as cache misses so the cache never takes the catalog down.
+    """
+
+    def __init__(self, url: str, prefix: str = "cache:"):
+        self._redis = Redis.from_url(url)
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}tag:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._redis.get(self._key(key))
+        except RedisError as error:
+            logging.error(f"Cache read failed: {error}")
+            return None
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int, tags: Iterable[str] = ()) -> None:
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.set(self._key(key), value, ex=ttl_seconds)
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), self._key(key))
+                    pipe.expire(self._tag_key(tag), ttl_seconds, gt=True)
+                    pipe.expire(self._tag_key(tag), ttl_seconds, nx=True)
+                await pipe.execute()
+        except RedisError as error:
+            logging.error(f"Cache write failed: {error}")
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        try:
+            for tag in tags:
+                keys = await self._redis.smembers(self._tag_key(tag))
+                await self._redis.delete(self._tag_key(tag), *keys)
+        except RedisError as error:
+            logging.error(f"Cache invalidation failed: {error}")
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def _retrieve_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key within one event loop.
+
+    The first caller for a key runs the loader; callers arriving while it is in
+    flight wait for the same result instead of repeating the work. If the
+    running caller is cancelled, one of the waiters takes over the load.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def is_in_flight(self, key: str) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        while (future := self._in_flight.get(key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_retrieve_exception)
+        self._in_flight[key] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
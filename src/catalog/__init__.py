@@ -0,0 +1,13 @@
+from catalog.search import refresh_search_documents, search_condition, search_rank
+from catalog.filters import MovieFilterParams, apply_movie_filters, apply_movie_sorting, configure_movie_filters
+from catalog.pagination import paginate_movies_by_cursor
+from catalog.cards import refresh_movie_cards, movie_cards_select, load_movie_cards
+from catalog.versions import (MOVIES_VERSION, GENRES_VERSION, get_catalog_version, bump_catalog_versions,
+                              get_movie_version, bump_movie_version)
+from catalog.engagement import REACTION_COUNT_COLUMNS, adjust_engagement, reconcile_engagement
+from catalog.comments import paginate_comment_threads
+from catalog.facets import count_movie_facets, movie_facets_schema
+from catalog.query import catalog_statements, paginate_catalog
+from catalog.changes import record_movie_changes, read_movie_changes
+from catalog.deletion import (request_movie_deletion, run_movie_deletion, fail_movie_deletion,
+                              stale_movie_deletions, is_stale_deletion)
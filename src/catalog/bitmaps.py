@@ -0,0 +1,236 @@
+import struct
+from typing import Iterable, Optional
+
+import numpy as np
+
+ARRAY_CONTAINER_LIMIT = 4096
+BITMAP_CONTAINER_WORDS = 1024
+
+_CONTAINER_HEADER = struct.Struct("<HBI")
+_ARRAY_KIND = 0
+_BITMAP_KIND = 1
+
+
+def _is_bitmap(container: np.ndarray) -> bool:
+    return container.dtype == np.uint64
+
+
+def _as_bitmap(container: np.ndarray) -> np.ndarray:
+    if _is_bitmap(container):
+        return container
+    words = np.zeros(BITMAP_CONTAINER_WORDS, dtype=np.uint64)
+    values = container.astype(np.uint64)
+    np.bitwise_or.at(words, values >> np.uint64(6), np.uint64(1) << (values & np.uint64(63)))
+    return words
+
+
+def _as_array(container: np.ndarray) -> np.ndarray:
+    if not _is_bitmap(container):
+        return container
+    bits = np.unpackbits(container.astype("<u8").view(np.uint8), bitorder="little")
+    return np.flatnonzero(bits).astype(np.uint16)
+
+
+def _contains(bitmap: np.ndarray, values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64)
+    return (bitmap[values >> np.uint64(6)] >> (values & np.uint64(63))) & np.uint64(1) != 0
+
+
+def _cardinality(container: np.ndarray) -> int:
+    if _is_bitmap(container):
+        return int(np.bitwise_count(container).sum())
+    return len(container)
+
+
+def _normalize(container: np.ndarray) -> Optional[np.ndarray]:
+    cardinality = _cardinality(container)
+    if cardinality == 0:
+        return None
+    if _is_bitmap(container) and cardinality <= ARRAY_CONTAINER_LIMIT:
+        return _as_array(container)
+    if not _is_bitmap(container) and cardinality > ARRAY_CONTAINER_LIMIT:
+        return _as_bitmap(container)
+    return container
+
+
+def _intersect(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    if _is_bitmap(left) and _is_bitmap(right):
+        return left & right
+    if _is_bitmap(left):
+        left, right = right, left
+    if _is_bitmap(right):
+        return left[_contains(right, left)]
+    return np.intersect1d(left, right, assume_unique=True)
+
+
+def _union(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    if not _is_bitmap(left) and not _is_bitmap(right):
+        return np.union1d(left, right)
+    return _as_bitmap(left) | _as_bitmap(right)
+
+
+def _difference(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    if _is_bitmap(left):
+        return left & ~_as_bitmap(right)
+    if _is_bitmap(right):
+        return left[~_contains(right, left)]
+    return np.setdiff1d(left, right, assume_unique=True)
+
+
+class RoaringBitmap:
+    """
+    Compressed set of non-negative 32-bit integers in the roaring layout.
+
+    Values are split by their high 16 bits into chunks; each chunk is stored as a
+    sorted `uint16` array while it holds at most 4096 values and as a 65536-bit
+    bitmap once it is denser. `&`, `|` and `-` (and-not; NOT against a universe
+    is `universe - bitmap`) work chunk by chunk, and `len()` is answered from the
+    containers without materializing the values.
+    """
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, values: Optional[Iterable[int]] = None):
+        self._containers: dict[int, np.ndarray] = {}
+        if values is not None:
+            self.update(values)
+
+    @classmethod
+    def _from_containers(cls, containers: dict[int, np.ndarray]) -> "RoaringBitmap":
+        bitmap = cls()
+        bitmap._containers = containers
+        return bitmap
+
+    def update(self, values: Iterable[int]) -> None:
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=np.int64)
+        if len(values) > 1 and not (values[1:] > values[:-1]).all():
+            values = np.unique(values)
+        if not len(values):
+            return
+        if values[0] < 0 or values[-1] > 0xFFFFFFFF:
+            raise ValueError("RoaringBitmap only holds values in the 0..2**32-1 range.")
+        highs = values >> 16
+        keys, starts = np.unique(highs, return_index=True)
+        lows = (values & 0xFFFF).astype(np.uint16)
+        for key, chunk in zip(keys.tolist(), np.split(lows, starts[1:])):
+            existing = self._containers.get(key)
+            self._containers[key] = _normalize(chunk if existing is None else _union(existing, chunk))
+
+    def add(self, value: int) -> None:
+        key, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(key)
+        if container is None:
+            self._containers[key] = np.array([low], dtype=np.uint16)
+        elif _is_bitmap(container):
+            container = container.copy()
+            container[low >> 6] |= np.uint64(1) << np.uint64(low & 63)
+            self._containers[key] = container
+        else:
+            position = int(np.searchsorted(container, low))
+            if position == len(container) or container[position] != low:
+                self._containers[key] = _normalize(np.insert(container, position, low))
+
+    def discard(self, value: int) -> None:
+        key, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(key)
+        if container is None or value not in self:
+            return
+        if _is_bitmap(container):
+            container = container.copy()
+            container[low >> 6] &= ~(np.uint64(1) << np.uint64(low & 63))
+        else:
+            container = np.delete(container, np.searchsorted(container, low))
+        container = _normalize(container)
+        if container is None:
+            del self._containers[key]
+        else:
+            self._containers[key] = container
+
+    def __contains__(self, value: int) -> bool:
+        container = self._containers.get(value >> 16)
+        if container is None:
+            return False
+        low = np.array([value & 0xFFFF], dtype=np.uint16)
+        if _is_bitmap(container):
+            return bool(_contains(container, low)[0])
+        position = int(np.searchsorted(container, low[0]))
+        return position < len(container) and container[position] == low[0]
+
+    def __len__(self) -> int:
+        return sum(_cardinality(container) for container in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._containers)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        return self._containers.keys() == other._containers.keys() and all(
+            np.array_equal(_as_array(container), _as_array(other._containers[key]))
+            for key, container in self._containers.items()
+        )
+
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        containers = {}
+        for key in self._containers.keys() & other._containers.keys():
+            container = _normalize(_intersect(self._containers[key], other._containers[key]))
+            if container is not None:
+                containers[key] = container
+        return self._from_containers(containers)
+
+    def __or__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        containers = dict(self._containers)
+        for key, container in other._containers.items():
+            existing = containers.get(key)
+            containers[key] = container if existing is None else _normalize(_union(existing, container))
+        return self._from_containers(containers)
+
+    def __sub__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        containers = {}
+        for key, container in self._containers.items():
+            removed = other._containers.get(key)
+            if removed is not None:
+                container = _normalize(_difference(container, removed))
+            if container is not None:
+                containers[key] = container
+        return self._from_containers(containers)
+
+    def intersection_len(self, other: "RoaringBitmap") -> int:
+        return sum(
+            _cardinality(_intersect(self._containers[key], other._containers[key]))
+            for key in self._containers.keys() & other._containers.keys()
+        )
+
+    def to_array(self) -> np.ndarray:
+        """
+        Return the values as a sorted `int64` array.
+        """
+        chunks = [
+            (np.int64(key) << 16) | _as_array(self._containers[key]).astype(np.int64)
+            for key in sorted(self._containers)
+        ]
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+    def to_bytes(self) -> bytes:
+        parts = [struct.pack("<I", len(self._containers))]
+        for key in sorted(self._containers):
+            container = self._containers[key]
+            kind = _BITMAP_KIND if _is_bitmap(container) else _ARRAY_KIND
+            data = container.astype("<u8" if kind == _BITMAP_KIND else "<u2").tobytes()
+            parts.append(_CONTAINER_HEADER.pack(key, kind, len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RoaringBitmap":
+        (count,) = struct.unpack_from("<I", data)
+        offset = 4
+        containers = {}
+        for _ in range(count):
+            key, kind, length = _CONTAINER_HEADER.unpack_from(data, offset)
+            offset += _CONTAINER_HEADER.size
+            dtype = "<u8" if kind == _BITMAP_KIND else "<u2"
+            containers[key] = np.frombuffer(data, dtype=dtype, count=length // np.dtype(dtype).itemsize,
+                                            offset=offset).astype(np.uint64 if kind == _BITMAP_KIND else np.uint16)
+            offset += length
+        return cls._from_containers(containers)
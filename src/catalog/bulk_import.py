@@ -0,0 +1,187 @@
+import argparse
+import asyncio
+import csv
+import json
+import uuid
+from decimal import Decimal
+from itertools import islice
+from typing import Callable, IO, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog.cards import CARD_RELATIONS, refresh_movie_cards
+from catalog.changes import record_movie_changes
+from catalog.lookups import resolve_names
+from catalog.search import refresh_search_documents
+from catalog.versions import MOVIES_VERSION, GENRES_VERSION, bump_catalog_versions
+from database.models.movies import MovieModel, CertificationsModel, MovieChangeType
+from exceptions import MovieImportError
+from schemas.movies import MovieImportSchema, MovieImportResultSchema
+
+IMPORT_FORMATS = ("csv", "ndjson")
+DEFAULT_IMPORT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 50
+
+MOVIE_COPY_COLUMNS = ("id", "uuid", "name", "year", "time", "imdb", "votes", "meta_score", "gross", "description",
+                      "price", "available", "certification_id")
+
+ProgressCallback = Callable[[MovieImportResultSchema], None]
+
+
+def read_movie_rows(file: IO[str], file_format: str) -> Iterator[tuple[int, dict]]:
+    """
+    Parse a CSV (with a header row) or NDJSON movie file into `(line number, raw row)` pairs.
+
+    Empty CSV cells are read as missing values; list columns may hold
+    comma-separated names.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, {key: value if value != "" else None for key, value in row.items()}
+    elif file_format == "ndjson":
+        for line_number, line in enumerate(file, start=1):
+            if line.strip():
+                yield line_number, json.loads(line)
+    else:
+        raise ValueError(f"Unsupported import format: {file_format}.")
+
+
+def _validate_batch(
+        rows: list[tuple[int, dict]],
+        result: MovieImportResultSchema
+) -> list[MovieImportSchema]:
+    movies = []
+    for line_number, row in rows:
+        result.received += 1
+        try:
+            movies.append(MovieImportSchema.model_validate(row))
+        except ValidationError as error:
+            result.rejected += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                details = "; ".join(f"{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in error.errors())
+                result.errors.append(f"Line {line_number}: {details}")
+    return movies
+
+
+async def _copy_records(db: AsyncSession, table: str, columns: Iterable[str], records: list[tuple]) -> None:
+    if not records:
+        return
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(table, columns=list(columns), records=records)
+
+
+async def _import_batch(db: AsyncSession, movies: list[MovieImportSchema], result: MovieImportResultSchema) -> None:
+    existing = await db.scalars(select(MovieModel.name).where(MovieModel.name.in_([movie.name for movie in movies])))
+    seen = set(existing.all())
+    fresh = []
+    for movie in movies:
+        if movie.name in seen:
+            result.skipped += 1
+        else:
+            seen.add(movie.name)
+            fresh.append(movie)
+    if not fresh:
+        return
+
+    certification_ids = await resolve_names(
+        db, CertificationsModel, [movie.certification for movie in fresh if movie.certification_id is None]
+    )
+    related_ids = {
+        relation: await resolve_names(db, model, [name for movie in fresh for name in getattr(movie, relation)])
+        for relation, (model, _, _) in CARD_RELATIONS.items()
+    }
+    movie_ids = list(await db.scalars(
+        select(func.nextval(func.pg_get_serial_sequence(MovieModel.__tablename__, "id")))
+        .select_from(func.generate_series(1, len(fresh)))
+    ))
+
+    await _copy_records(db, MovieModel.__tablename__, MOVIE_COPY_COLUMNS, [
+        (
+            movie_id, movie.uuid or uuid.uuid4(), movie.name, movie.year, movie.time, movie.imdb, movie.votes,
+            movie.meta_score, movie.gross, movie.description, Decimal(str(movie.price)), movie.available,
+            movie.certification_id or certification_ids[movie.certification],
+        )
+        for movie_id, movie in zip(movie_ids, fresh)
+    ])
+    for relation, (_, association, foreign_key) in CARD_RELATIONS.items():
+        ids = related_ids[relation]
+        await _copy_records(db, association.name, ("movie_id", foreign_key), [
+            (movie_id, ids[name])
+            for movie_id, movie in zip(movie_ids, fresh)
+            for name in getattr(movie, relation)
+        ])
+
+    await refresh_search_documents(db, movie_ids)
+    await refresh_movie_cards(db, movie_ids)
+    await record_movie_changes(db, movie_ids, MovieChangeType.UPSERT)
+    await bump_catalog_versions(db, MOVIES_VERSION, GENRES_VERSION)
+    result.imported += len(fresh)
+
+
+async def import_movies(
+        db: AsyncSession,
+        rows: Iterable[tuple[int, dict]],
+        batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+        on_progress: Optional[ProgressCallback] = None
+) -> MovieImportResultSchema:
+    """
+    Bulk-load movies, committing one transaction per batch.
+
+    Each batch resolves its certifications, genres, stars and directors with
+    one set-based get-or-create per lookup table, reserves movie ids from the
+    sequence in one round trip, and loads the movies and their association rows
+    with COPY. Search documents and listing cards are then rebuilt set-based.
+    Rows that fail validation are rejected, and movies whose name already
+    exists are skipped, as `add_movie` does.
+
+    Raises:
+        MovieImportError: If a batch fails to load; the batches before it stay committed
+        and are counted in the error's `result`.
+    """
+    result = MovieImportResultSchema()
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        committed = result.model_copy(deep=True)
+        movies = _validate_batch(batch, result)
+        if movies:
+            try:
+                await _import_batch(db, movies, result)
+                await db.commit()
+            except Exception as error:
+                await db.rollback()
+                raise MovieImportError(committed) from error
+        if on_progress is not None:
+            on_progress(result)
+    return result
+
+
+def _print_progress(result: MovieImportResultSchema) -> None:
+    print(f"{result.received} read, {result.imported} imported, {result.skipped} skipped, "
+          f"{result.rejected} rejected", flush=True)
+
+
+async def _main(path: str, file_format: str, batch_size: int) -> None:
+    from database.session_postgres import AsyncPostgresqlSessionLocal
+
+    with open(path, newline="", encoding="utf-8") as file:
+        async with AsyncPostgresqlSessionLocal() as session:
+            result = await import_movies(session, read_movie_rows(file, file_format), batch_size, _print_progress)
+    for error in result.errors:
+        print(error)
+
+
+if __name__ == "__main__":
+    from config import get_settings
+
+    parser = argparse.ArgumentParser(description="Bulk import movies from a CSV or NDJSON file.")
+    parser.add_argument("path", nargs="?", default=get_settings().PATH_TO_MOVIES_CSV)
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None,
+                        help="File format; guessed from the file extension by default")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_IMPORT_BATCH_SIZE)
+    arguments = parser.parse_args()
+    import_format = arguments.format or ("ndjson" if arguments.path.endswith((".ndjson", ".jsonl")) else "csv")
+    asyncio.run(_main(arguments.path, import_format, arguments.batch_size))
@@ -0,0 +1,104 @@
+from typing import Iterable
+
+from sqlalchemy import select, func, literal_column, Select, ColumnElement
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models.movies import (MovieModel, MovieCardModel, StarsModel, GenresModel, DirectorsModel,
+                                    MovieStarsModel, MovieGenresModel, MovieDirectorsModel)
+
+CARD_RELATIONS = {
+    "genres": (GenresModel, MovieGenresModel, "genre_id"),
+    "stars": (StarsModel, MovieStarsModel, "star_id"),
+    "directors": (DirectorsModel, MovieDirectorsModel, "director_id"),
+}
+
+CARD_COLUMNS = ("id", "uuid", "name", "year", "time", "imdb", "votes", "meta_score", "gross", "description",
+                "price", "available", "certification_id")
+
+
+def _related(model, association, foreign_key: str) -> Select:
+    return (
+        select()
+        .select_from(model)
+        .join(association, association.c[foreign_key] == model.id)
+        .where(association.c.movie_id == MovieModel.id)
+    )
+
+
+def _related_names(relation: str) -> ColumnElement:
+    model, association, foreign_key = CARD_RELATIONS[relation]
+    names = _related(model, association, foreign_key).add_columns(
+        func.array_agg(aggregate_order_by(model.name, model.name))
+    )
+    return func.coalesce(names.scalar_subquery(), literal_column("'{}'::varchar[]"))
+
+
+def _related_items(relation: str) -> ColumnElement:
+    model, association, foreign_key = CARD_RELATIONS[relation]
+    items = _related(model, association, foreign_key).add_columns(
+        func.jsonb_agg(aggregate_order_by(func.jsonb_build_object("id", model.id, "name", model.name), model.name))
+    )
+    return func.coalesce(items.scalar_subquery(), literal_column("'[]'::jsonb"))
+
+
+def movie_card_document() -> ColumnElement:
+    """
+    Build the JSON listing card of the current movie row in the shape of MovieListSchema.
+    """
+    fields = []
+    for column in CARD_COLUMNS:
+        fields.extend((column, getattr(MovieModel, column)))
+    for relation in CARD_RELATIONS:
+        fields.extend((relation, _related_items(relation)))
+    return func.jsonb_build_object(*fields)
+
+
+async def refresh_movie_cards(db: AsyncSession, movie_ids: Iterable[int]) -> None:
+    """
+    Rebuild the listing cards of the given movies inside the current transaction.
+    """
+    movie_ids = list(movie_ids)
+    if not movie_ids:
+        return
+    cards = select(
+        MovieModel.id,
+        _related_names("genres"),
+        _related_names("stars"),
+        _related_names("directors"),
+        movie_card_document(),
+    ).where(MovieModel.id.in_(movie_ids))
+
+    stmt = insert(MovieCardModel).from_select(
+        ["movie_id", "genre_names", "star_names", "director_names", "card"],
+        cards,
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[MovieCardModel.movie_id],
+        set_={
+            "genre_names": stmt.excluded.genre_names,
+            "star_names": stmt.excluded.star_names,
+            "director_names": stmt.excluded.director_names,
+            "card": stmt.excluded.card,
+        },
+    ))
+
+
+async def load_movie_cards(db: AsyncSession, movie_ids: list[int]) -> list[dict]:
+    """
+    Load the listing cards of the given movies, in the order of `movie_ids`.
+    """
+    if not movie_ids:
+        return []
+    result = await db.execute(
+        select(MovieCardModel.movie_id, MovieCardModel.card).where(MovieCardModel.movie_id.in_(movie_ids))
+    )
+    cards = dict(result.tuples().all())
+    return [cards[movie_id] for movie_id in movie_ids if movie_id in cards]
+
+
+def movie_cards_select() -> Select:
+    """
+    Select listing cards joined to their movies, so movie columns stay available for filtering and sorting.
+    """
+    return select(MovieCardModel.card).join(MovieModel, MovieModel.id == MovieCardModel.movie_id)
@@ -0,0 +1,73 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import select, insert, func, tuple_, cast, literal, BigInteger, Text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog.pagination import encode_cursor, decode_cursor
+from database.models.movies import MovieChangeModel, MovieChangeType, MovieCardModel
+from exceptions import InvalidCursorError
+from schemas.movies import MovieChangesPageSchema, MovieChangeSchema, MovieListSchema
+
+
+async def record_movie_changes(db: AsyncSession, movie_ids: Iterable[int], change_type: MovieChangeType) -> None:
+    """
+    Append changes of the given movies to the change feed inside the current transaction.
+    """
+    rows = [{"movie_id": movie_id, "change_type": change_type} for movie_id in movie_ids]
+    if rows:
+        await db.execute(insert(MovieChangeModel), rows)
+
+
+def _parse_change_cursor(cursor: str) -> tuple[int, int]:
+    payload = decode_cursor(cursor)
+    tx_id, seq = payload.get("tx"), payload.get("seq")
+    if not isinstance(tx_id, int) or not isinstance(seq, int):
+        raise InvalidCursorError
+    return tx_id, seq
+
+
+async def read_movie_changes(db: AsyncSession, cursor: Optional[str], size: int) -> MovieChangesPageSchema:
+    """
+    Read the changes committed after `cursor`, oldest first, with the current card of each changed movie.
+
+    Changes are ordered by (writing transaction, sequence) and only those of
+    transactions older than the oldest transaction still in flight are
+    returned. Every change that sorts before a handed-out cursor is therefore
+    already visible, so a client that follows `next_cursor` never misses one.
+    The cursor of an empty page is the one that was passed in.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    horizon = cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+    query = (
+        select(MovieChangeModel, MovieCardModel.card)
+        .outerjoin(MovieCardModel, MovieCardModel.movie_id == MovieChangeModel.movie_id)
+        .where(MovieChangeModel.tx_id < horizon)
+        .order_by(MovieChangeModel.tx_id, MovieChangeModel.seq)
+        .limit(size + 1)
+    )
+    if cursor is not None:
+        tx_id, seq = _parse_change_cursor(cursor)
+        query = query.where(tuple_(MovieChangeModel.tx_id, MovieChangeModel.seq) > tuple_(
+            literal(tx_id, BigInteger), literal(seq, BigInteger)
+        ))
+
+    rows = (await db.execute(query)).all()
+    has_more = len(rows) > size
+    rows = rows[:size]
+
+    items = []
+    for change, card in rows:
+        is_upsert = change.change_type == MovieChangeType.UPSERT
+        items.append(MovieChangeSchema(
+            movie_id=change.movie_id,
+            change_type=change.change_type.value,
+            changed_at=change.changed_at,
+            movie=MovieListSchema.model_validate(card) if is_upsert and card is not None else None,
+        ))
+    next_cursor = cursor
+    if rows:
+        last = rows[-1][0]
+        next_cursor = encode_cursor({"tx": last.tx_id, "seq": last.seq})
+    return MovieChangesPageSchema(items=items, next_cursor=next_cursor, has_more=has_more)
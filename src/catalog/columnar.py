@@ -0,0 +1,499 @@
+import asyncio
+import logging
+import operator
+import os
+import struct
+from functools import reduce
+from typing import Callable, Iterable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog.bitmaps import RoaringBitmap
+from catalog.facets import empty_facet_counts, IMDB_BAND_WIDTH, PRICE_BAND_EDGES
+from catalog.filters import MovieFilterParams
+from catalog.versions import MOVIES_VERSION, get_catalog_version
+from database.models.movies import MovieModel, MovieCardModel
+from schemas.movies import MovieSortField
+
+COLUMNAR_SORT_COLUMNS = {
+    MovieSortField.YEAR_ASC: ("year", False),
+    MovieSortField.YEAR_DESC: ("year", True),
+    MovieSortField.PRICE_ASC: ("price", False),
+    MovieSortField.PRICE_DESC: ("price", True),
+    MovieSortField.IMDB_ASC: ("imdb", False),
+    MovieSortField.IMDB_DESC: ("imdb", True),
+    MovieSortField.POPULARITY_ASC: ("votes", False),
+    MovieSortField.POPULARITY_DESC: ("votes", True),
+}
+
+COLUMN_TYPES = {
+    "id": np.int64,
+    "year": np.int32,
+    "imdb": np.float64,
+    "price": np.float64,
+    "votes": np.int64,
+}
+
+MEMBERSHIP_KINDS = ("genres", "stars", "directors")
+FACET_KINDS = ("genres", "directors")
+
+SNAPSHOT_QUERY_BATCH_ROWS = 10000
+
+SNAPSHOT_MAGIC = b"MCS1"
+_SNAPSHOT_HEADER = struct.Struct("<4sqq")
+_POSTING_HEADER = struct.Struct("<HI")
+
+
+class ColumnarSnapshot:
+    """
+    Column arrays for every movie plus, per genre/star/director name, a roaring bitmap of the rows that reference it.
+
+    Rows are append-only; a removed or replaced movie only has its `alive` flag
+    cleared, so bitmaps never have to be rewritten. Membership filters are
+    evaluated as bitmap algebra (OR within a kind, AND across kinds) before
+    they touch the dense columns.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMN_TYPES.items()}
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.rows: dict[int, int] = {}
+        self.postings: dict[str, dict[str, RoaringBitmap]] = {kind: {} for kind in MEMBERSHIP_KINDS}
+        self._facet_index: dict[str, tuple[list[str], np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def build(cls, movies: list[tuple[int, dict, dict[str, Iterable[str]]]]) -> "ColumnarSnapshot":
+        """
+        Build a snapshot from `(movie_id, values, memberships)` tuples in one pass.
+        """
+        builder = ColumnarSnapshotBuilder()
+        builder.add_rows([
+            (movie_id, values["year"], values["imdb"], values["price"], values["votes"],
+             *(memberships.get(kind) for kind in MEMBERSHIP_KINDS))
+            for movie_id, values, memberships in movies
+        ])
+        return builder.build()
+
+    def _grow(self) -> None:
+        capacity = len(self.alive) * 2
+        for name, column in self.columns.items():
+            self.columns[name] = np.resize(column, capacity)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.size] = self.alive[:self.size]
+        self.alive = alive
+
+    def _set_row(self, row: int, movie_id: int, values: dict) -> None:
+        self.columns["id"][row] = movie_id
+        for name in ("year", "imdb", "price", "votes"):
+            self.columns[name][row] = values[name]
+        self.alive[row] = True
+        self.rows[movie_id] = row
+
+    def upsert(self, movie_id: int, values: dict, memberships: dict[str, Iterable[str]]) -> None:
+        self.remove(movie_id)
+        if self.size == len(self.alive):
+            self._grow()
+        row = self.size
+        self.size += 1
+        self._set_row(row, movie_id, values)
+        for kind in MEMBERSHIP_KINDS:
+            postings = self.postings[kind]
+            for name in memberships.get(kind) or ():
+                postings.setdefault(name, RoaringBitmap()).add(row)
+                self._facet_index.pop(kind, None)
+
+    def remove(self, movie_id: int) -> None:
+        row = self.rows.pop(movie_id, None)
+        if row is not None:
+            self.alive[row] = False
+
+    def _membership_rows(self, filters: MovieFilterParams) -> Optional[RoaringBitmap]:
+        matched = None
+        for kind, names in (("genres", filters.genres), ("directors", filters.directors), ("stars", filters.actors)):
+            if not names:
+                continue
+            postings = self.postings[kind]
+            any_of = reduce(operator.or_, (postings.get(name, RoaringBitmap()) for name in names))
+            matched = any_of if matched is None else matched & any_of
+        return matched
+
+    def filter_mask(self, filters: MovieFilterParams) -> np.ndarray:
+        columns = {name: column[:self.size] for name, column in self.columns.items()}
+        mask = self.alive[:self.size].copy()
+        ranges = (
+            ("year", filters.year, filters.year),
+            ("year", filters.year_min, filters.year_max),
+            ("imdb", filters.imdb_min, filters.imdb_max),
+            ("price", filters.price_min, filters.price_max),
+        )
+        for name, low, high in ranges:
+            if low is not None:
+                mask &= columns[name] >= low
+            if high is not None:
+                mask &= columns[name] <= high
+        members = self._membership_rows(filters)
+        if members is not None:
+            in_members = np.zeros(self.size, dtype=bool)
+            in_members[members.to_array()] = True
+            mask &= in_members
+        return mask
+
+    def _facet_rows(self, kind: str) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """
+        Flatten the postings of `kind` into parallel (row, name index) arrays, rebuilt after an upsert changed them.
+        """
+        index = self._facet_index.get(kind)
+        if index is None:
+            names = list(self.postings[kind])
+            members = [self.postings[kind][name].to_array() for name in names]
+            rows = np.concatenate(members) if members else np.empty(0, dtype=np.int64)
+            name_indexes = np.repeat(np.arange(len(names)), [len(rows_of_name) for rows_of_name in members])
+            index = self._facet_index[kind] = (names, rows, name_indexes)
+        return index
+
+    def facet_counts(self, filters: MovieFilterParams) -> dict[str, dict]:
+        """
+        Count the live matches of `filters` per facet, in the shape of `count_movie_facets`.
+
+        Genre and director counts are one `bincount` over the name index of every
+        posting entry whose row matches; the bands are bucketed from the dense columns.
+        """
+        mask = self.filter_mask(filters)
+        rows = np.flatnonzero(mask)
+        counts = empty_facet_counts()
+        for kind in FACET_KINDS:
+            names, member_rows, name_indexes = self._facet_rows(kind)
+            name_counts = np.bincount(name_indexes[mask[member_rows]], minlength=len(names))
+            for position in np.flatnonzero(name_counts).tolist():
+                counts[kind][names[position]] = int(name_counts[position])
+
+        edges = np.array(PRICE_BAND_EDGES)
+        bands = {
+            "decades": self.columns["year"][rows] // 10 * 10,
+            "imdb": np.minimum(np.floor(self.columns["imdb"][rows]), 10 - IMDB_BAND_WIDTH),
+            "price": edges[np.searchsorted(edges, self.columns["price"][rows], side="right") - 1],
+        }
+        for facet, values in bands.items():
+            lowers, band_counts = np.unique(values, return_counts=True)
+            counts[facet] = dict(zip(lowers.tolist(), band_counts.tolist()))
+        return counts
+
+    def page(self, filters: MovieFilterParams, offset: int, limit: int) -> tuple[int, list[int]]:
+        """
+        Return the total number of matches and the movie ids of one page, in listing order.
+
+        Only the first `offset + limit` matches are fully ordered: an argpartition
+        finds the boundary sort key, and just the rows up to it are lexsorted by
+        (key, id), which is the same order the SQL path produces.
+        """
+        rows = np.flatnonzero(self.filter_mask(filters))
+        total = len(rows)
+        wanted = min(offset + limit, total)
+        if wanted <= offset:
+            return total, []
+
+        sort_by = filters.sort_by
+        if sort_by not in COLUMNAR_SORT_COLUMNS:
+            sort_by = MovieSortField.YEAR_DESC
+        column, descending = COLUMNAR_SORT_COLUMNS[sort_by]
+        keys = self.columns[column][rows]
+        ids = self.columns["id"][rows]
+        if descending:
+            keys, ids = -keys, -ids
+
+        if wanted < total:
+            boundary = keys[np.argpartition(keys, wanted - 1)[wanted - 1]]
+            candidates = keys <= boundary
+            keys, ids = keys[candidates], ids[candidates]
+
+        order = np.lexsort((ids, keys))[offset:wanted]
+        page_ids = ids[order]
+        if descending:
+            page_ids = -page_ids
+        return total, page_ids.tolist()
+
+    def save(self, path: str, version: int) -> None:
+        """
+        Write the live rows to `path`, tagged with the catalog version they were loaded at.
+
+        The file is written next to `path` and renamed over it, so concurrent
+        readers in other workers only ever see a complete snapshot.
+        """
+        live = np.flatnonzero(self.alive[:self.size])
+        remap = np.full(self.size, -1, dtype=np.int64)
+        remap[live] = np.arange(len(live))
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, version, len(live)))
+            for name in COLUMN_TYPES:
+                np.save(file, self.columns[name][live], allow_pickle=False)
+            for kind in MEMBERSHIP_KINDS:
+                postings = self.postings[kind]
+                file.write(struct.pack("<I", len(postings)))
+                for name, rows in postings.items():
+                    rows = remap[rows.to_array()]
+                    encoded_name = name.encode()
+                    encoded_rows = RoaringBitmap(rows[rows >= 0]).to_bytes()
+                    file.write(_POSTING_HEADER.pack(len(encoded_name), len(encoded_rows)))
+                    file.write(encoded_name)
+                    file.write(encoded_rows)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> tuple[int, "ColumnarSnapshot"]:
+        """
+        Read a snapshot written by `save`.
+
+        Returns:
+            tuple[int, ColumnarSnapshot]: The catalog version the snapshot was saved at, and the snapshot.
+        """
+        with open(path, "rb") as file:
+            magic, version, size = _SNAPSHOT_HEADER.unpack(file.read(_SNAPSHOT_HEADER.size))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a columnar catalog snapshot.")
+            snapshot = cls(capacity=max(1024, size * 2))
+            for name in COLUMN_TYPES:
+                snapshot.columns[name][:size] = np.load(file, allow_pickle=False)
+            snapshot.alive[:size] = True
+            snapshot.size = size
+            snapshot.rows = dict(zip(snapshot.columns["id"][:size].tolist(), range(size)))
+            for kind in MEMBERSHIP_KINDS:
+                (count,) = struct.unpack("<I", file.read(4))
+                postings = snapshot.postings[kind]
+                for _ in range(count):
+                    name_length, rows_length = _POSTING_HEADER.unpack(file.read(_POSTING_HEADER.size))
+                    name = file.read(name_length).decode()
+                    postings[name] = RoaringBitmap.from_bytes(file.read(rows_length))
+        return version, snapshot
+
+
+class ColumnarSnapshotBuilder:
+    """
+    Accumulates movie rows batch by batch, then builds a `ColumnarSnapshot` from them.
+
+    Rows are `(movie_id, year, imdb, price, votes, genres, stars, directors)`,
+    the shape of the reload query, so batches can be added as they are fetched.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self._chunks: dict[str, list[np.ndarray]] = {name: [] for name in COLUMN_TYPES}
+        self._members: dict[str, dict[str, list[int]]] = {kind: {} for kind in MEMBERSHIP_KINDS}
+
+    def add_rows(self, rows: Sequence[tuple]) -> None:
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        for name, values in zip(COLUMN_TYPES, columns):
+            self._chunks[name].append(np.array(values, dtype=COLUMN_TYPES[name]))
+        for kind, names_per_row in zip(MEMBERSHIP_KINDS, columns[len(COLUMN_TYPES):]):
+            kind_members = self._members[kind]
+            for row, names in enumerate(names_per_row, self.size):
+                for name in names or ():
+                    rows_of_name = kind_members.get(name)
+                    if rows_of_name is None:
+                        kind_members[name] = [row]
+                    else:
+                        rows_of_name.append(row)
+        self.size += len(rows)
+
+    def build(self) -> ColumnarSnapshot:
+        size = self.size
+        snapshot = ColumnarSnapshot(capacity=max(1024, size * 2))
+        for name, chunks in self._chunks.items():
+            if chunks:
+                snapshot.columns[name][:size] = np.concatenate(chunks)
+        snapshot.alive[:size] = True
+        snapshot.size = size
+        snapshot.rows = dict(zip(snapshot.columns["id"][:size].tolist(), range(size)))
+        for kind, names in self._members.items():
+            snapshot.postings[kind] = {name: RoaringBitmap(rows) for name, rows in names.items()}
+        return snapshot
+
+
+class ColumnarCatalog:
+    """
+    Optional in-process engine answering catalog filter + sort + page requests with vectorized NumPy operations.
+
+    Only requests without a search term, made at the catalog version the
+    engine reflects, are served; anything else, and every request before the
+    first load finishes, falls back to the SQL path. Movie write routes apply
+    deltas in place, each tagged with the catalog version its transaction
+    committed, and the engine moves on to that version once every version
+    before it has been applied. A version it cannot reach that way was
+    written by another process, and only then is a full reload needed.
+    Deltas arriving while a reload is running are replayed onto the new
+    snapshot before it is swapped in.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[ColumnarSnapshot] = None
+        self._version: Optional[int] = None
+        self._applied: set[int] = set()
+        self._pending: Optional[list[tuple]] = None
+        self._refresh_requested = asyncio.Event()
+
+    def supports(self, filters: MovieFilterParams, version: int) -> bool:
+        """
+        Whether a request made at catalog `version` can be answered from the snapshot.
+
+        A snapshot at another version is never used, since its result would be
+        cached and tagged with `version`; when `version` is newer, an early reload
+        is requested instead.
+        """
+        if self._snapshot is None or filters.search:
+            return False
+        if self._version != version:
+            if version > self._version:
+                self._refresh_requested.set()
+            return False
+        return True
+
+    async def wait_for_refresh(self, timeout: float) -> None:
+        """
+        Wait until a reload is requested or `timeout` seconds have passed.
+        """
+        try:
+            await asyncio.wait_for(self._refresh_requested.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._refresh_requested.clear()
+
+    def page(self, filters: MovieFilterParams, offset: int, limit: int) -> tuple[int, list[int]]:
+        return self._snapshot.page(filters, offset, limit)
+
+    def facet_counts(self, filters: MovieFilterParams) -> dict[str, dict]:
+        return self._snapshot.facet_counts(filters)
+
+    @staticmethod
+    async def _query_snapshot(db: AsyncSession) -> ColumnarSnapshot:
+        """
+        Stream every movie in batches of `SNAPSHOT_QUERY_BATCH_ROWS` and build a snapshot from them.
+
+        Each batch is folded into the snapshot, and the snapshot finally built,
+        in a worker thread, so a reload at a million movies does not stall the
+        event loop.
+        """
+        builder = ColumnarSnapshotBuilder()
+        result = await db.stream(
+            select(
+                MovieModel.id,
+                MovieModel.year,
+                MovieModel.imdb,
+                MovieModel.price,
+                MovieModel.votes,
+                MovieCardModel.genre_names,
+                MovieCardModel.star_names,
+                MovieCardModel.director_names,
+            )
+            .join(MovieCardModel, MovieCardModel.movie_id == MovieModel.id)
+            .order_by(MovieModel.id)
+            .execution_options(yield_per=SNAPSHOT_QUERY_BATCH_ROWS)
+        )
+        async for rows in result.partitions():
+            await asyncio.to_thread(builder.add_rows, rows)
+        return await asyncio.to_thread(builder.build)
+
+    @staticmethod
+    async def _load_snapshot(path: str, version: int) -> Optional[ColumnarSnapshot]:
+        try:
+            saved_version, snapshot = await asyncio.to_thread(ColumnarSnapshot.load, path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as error:
+            logging.warning(f"Ignoring unreadable columnar catalog snapshot {path}: {error}")
+            return None
+        return snapshot if saved_version == version else None
+
+    async def rebuild(self, db: AsyncSession, snapshot_path: Optional[str] = None) -> None:
+        """
+        Reload the engine unless it already reflects the current movies catalog version.
+
+        With `snapshot_path`, a snapshot saved at the current version (by this or
+        another worker) is loaded instead of querying the database, and a fresh
+        load from the database is saved there for the next worker.
+        """
+        version = await get_catalog_version(db, MOVIES_VERSION)
+        if self._snapshot is not None and version == self._version:
+            return
+        self._pending = []
+        try:
+            snapshot = await self._load_snapshot(snapshot_path, version) if snapshot_path else None
+            if snapshot is None:
+                snapshot = await self._query_snapshot(db)
+                if snapshot_path:
+                    try:
+                        await asyncio.to_thread(snapshot.save, snapshot_path, version)
+                    except OSError as error:
+                        logging.warning(f"Failed to save the columnar catalog snapshot {snapshot_path}: {error}")
+            applied = set()
+            for operation, delta_version, *args in self._pending:
+                if delta_version > version:
+                    getattr(snapshot, operation)(*args)
+                    applied.add(delta_version)
+            self._snapshot = snapshot
+            self._version = version
+            self._applied = applied
+            self._advance()
+        finally:
+            self._pending = None
+
+    def _advance(self) -> None:
+        while self._version + 1 in self._applied:
+            self._version += 1
+        self._applied = {version for version in self._applied if version > self._version}
+
+    def _apply(self, operation: str, version: int, *args) -> None:
+        if self._pending is not None:
+            self._pending.append((operation, version, *args))
+        if self._snapshot is not None:
+            getattr(self._snapshot, operation)(*args)
+            self._applied.add(version)
+            self._advance()
+
+    def upsert_movie(self, movie: MovieModel, version: int) -> None:
+        """
+        Apply an added or changed movie, committed together with movies catalog version `version`.
+        """
+        self._apply(
+            "upsert",
+            version,
+            movie.id,
+            {"year": movie.year, "imdb": movie.imdb, "price": movie.price, "votes": movie.votes},
+            {
+                "genres": [genre.name for genre in movie.genres],
+                "stars": [star.name for star in movie.stars],
+                "directors": [director.name for director in movie.directors],
+            },
+        )
+
+    def remove_movie(self, movie_id: int, version: int) -> None:
+        """
+        Drop a movie taken off the catalog, committed together with movies catalog version `version`.
+        """
+        self._apply("remove", version, movie_id)
+
+
+async def keep_columnar_catalog_fresh(
+        catalog: ColumnarCatalog,
+        session_factory: Callable[[], AsyncSession],
+        interval_seconds: int,
+        snapshot_path: Optional[str] = None
+) -> None:
+    """
+    Load the columnar catalog now and then reload it every `interval_seconds`.
+
+    Writes handled by other worker processes only reach this worker's engine
+    through these reloads; a reload is skipped while the engine is at the
+    catalog version, and starts early once a request sees a newer one.
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                await catalog.rebuild(session, snapshot_path)
+        except Exception as error:
+            logging.error(f"Failed to rebuild the columnar catalog: {error}")
+        await catalog.wait_for_refresh(interval_seconds)
@@ -0,0 +1,108 @@
+from typing import Optional
+
+from sqlalchemy import select, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from catalog.pagination import encode_cursor, decode_cursor
+from database.models.movies import CommentsModel, CommentLikesModel
+from exceptions import InvalidCursorError
+from schemas.movies import MovieCommentsPageSchema, CommentThreadSchema
+
+
+def _parse_comment_cursor(cursor: str) -> int:
+    comment_id = decode_cursor(cursor).get("id")
+    if not isinstance(comment_id, int):
+        raise InvalidCursorError
+    return comment_id
+
+
+async def paginate_comment_threads(
+        db: AsyncSession,
+        movie_id: int,
+        cursor: Optional[str],
+        size: int,
+        depth: int
+) -> MovieCommentsPageSchema:
+    """
+    Fetch one page of a movie's top-level comments, newest first, with their reply trees.
+
+    Top-level comments are paged by id with a keyset cursor. Replies down to
+    `depth` levels are then loaded for the whole page with one recursive CTE,
+    so the cost of a page is bounded by its size and depth instead of by the
+    total number of comments on the movie. `replies_count` tells clients which
+    comments at the depth limit have more replies to fetch.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    top_level = (
+        select(CommentsModel.id)
+        .where(CommentsModel.movie_id == movie_id, CommentsModel.parent_id.is_(None))
+        .order_by(CommentsModel.id.desc())
+        .limit(size + 1)
+    )
+    if cursor is not None:
+        top_level = top_level.where(CommentsModel.id < _parse_comment_cursor(cursor))
+
+    root_ids = list((await db.execute(top_level)).scalars())
+    has_more = len(root_ids) > size
+    root_ids = root_ids[:size]
+    if not root_ids:
+        return MovieCommentsPageSchema(items=[], size=size, next_cursor=None)
+
+    thread = (
+        select(CommentsModel.id, literal(0).label("depth"))
+        .where(CommentsModel.id.in_(root_ids))
+        .cte("thread", recursive=True)
+    )
+    reply = aliased(CommentsModel)
+    thread = thread.union_all(
+        select(reply.id, thread.c.depth + 1)
+        .where(reply.parent_id == thread.c.id, thread.c.depth < depth)
+    )
+
+    likes = (
+        select(CommentLikesModel.comment_id, func.count().label("likes_count"))
+        .where(CommentLikesModel.comment_id.in_(select(thread.c.id)))
+        .group_by(CommentLikesModel.comment_id)
+        .subquery()
+    )
+    replies = aliased(CommentsModel)
+    replies_count = (
+        select(replies.parent_id, func.count().label("replies_count"))
+        .where(replies.parent_id.in_(select(thread.c.id)))
+        .group_by(replies.parent_id)
+        .subquery()
+    )
+    rows = await db.execute(
+        select(
+            CommentsModel.id,
+            CommentsModel.text,
+            CommentsModel.user_profile_id,
+            CommentsModel.movie_id,
+            CommentsModel.parent_id,
+            CommentsModel.created_at,
+            func.coalesce(likes.c.likes_count, 0).label("likes_count"),
+            func.coalesce(replies_count.c.replies_count, 0).label("replies_count"),
+        )
+        .join(thread, thread.c.id == CommentsModel.id)
+        .outerjoin(likes, likes.c.comment_id == CommentsModel.id)
+        .outerjoin(replies_count, replies_count.c.parent_id == CommentsModel.id)
+        .order_by(thread.c.depth, CommentsModel.id)
+    )
+
+    roots = set(root_ids)
+    comments: dict[int, CommentThreadSchema] = {}
+    for row in rows.mappings():
+        comment = CommentThreadSchema(**row)
+        comments[comment.id] = comment
+        if comment.id not in roots:
+            comments[comment.parent_id].replies.append(comment)
+
+    next_cursor = encode_cursor({"id": root_ids[-1]}) if has_more else None
+    return MovieCommentsPageSchema(
+        items=[comments[comment_id] for comment_id in root_ids if comment_id in comments],
+        size=size,
+        next_cursor=next_cursor,
+    )
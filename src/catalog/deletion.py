@@ -0,0 +1,252 @@
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from sqlalchemy import select, insert, delete, update, func, literal, exists, or_, and_, ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog.cards import refresh_movie_cards
+from catalog.changes import record_movie_changes
+from catalog.versions import MOVIES_VERSION, GENRES_VERSION, bump_catalog_versions
+from database.models.accounts import UserModel, UserGroupModel, UserGroupEnum, UserProfileModel
+from database.models.movies import (MovieModel, MovieDeletionModel, MovieDeletionStatus, MovieChangeType,
+                                    NotificationsModel, CommentsModel, RatingsModel)
+from database.models.order import OrdersModel, OrderItemsModel
+from database.models.shopping_cart import CartItemsModel
+
+DELETION_CHUNK_ROWS = 1000
+DELETION_STALE_SECONDS = 5 * 60
+
+ACTIVE_DELETION_STATUSES = (MovieDeletionStatus.PENDING, MovieDeletionStatus.RUNNING)
+CLAIMABLE_DELETION_STATUSES = (MovieDeletionStatus.PENDING, MovieDeletionStatus.FAILED)
+
+
+def _stale_deletion(stale_after_seconds: int) -> ColumnElement:
+    """
+    Match deletions whose job was lost: still pending, or running without a step committed, for `stale_after_seconds`.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after_seconds)
+    return or_(
+        and_(MovieDeletionModel.status == MovieDeletionStatus.PENDING, MovieDeletionModel.created_at < cutoff),
+        and_(MovieDeletionModel.status == MovieDeletionStatus.RUNNING, MovieDeletionModel.updated_at < cutoff),
+    )
+
+
+async def request_movie_deletion(
+        db: AsyncSession,
+        movie: MovieModel,
+        requested_by_id: Optional[int]
+) -> tuple[MovieDeletionModel, bool]:
+    """
+    Take a movie off sale and register its deletion, to be run by the `process_movie_deletion` worker task.
+
+    The movie is marked unavailable and its listing card refreshed in the
+    current transaction. If a deletion of the movie is already pending or
+    running, that one is returned instead of registering another.
+    `requested_by_id` is the profile id of the moderator asking for it.
+
+    Returns:
+        tuple[MovieDeletionModel, bool]: The deletion, and whether it was created by this call.
+    """
+    existing = await db.scalar(
+        select(MovieDeletionModel)
+        .where(MovieDeletionModel.movie_id == movie.id, MovieDeletionModel.status.in_(ACTIVE_DELETION_STATUSES))
+    )
+    if existing is not None:
+        return existing, False
+
+    movie.available = False
+    deletion = MovieDeletionModel(movie_id=movie.id, movie_name=movie.name, requested_by_id=requested_by_id)
+    db.add(deletion)
+    await db.flush()
+    await refresh_movie_cards(db, [movie.id])
+    await record_movie_changes(db, [movie.id], MovieChangeType.UPSERT)
+    await bump_catalog_versions(db, MOVIES_VERSION)
+    return deletion, True
+
+
+async def _notify_moderators(db: AsyncSession, deletion: MovieDeletionModel, movie: MovieModel) -> None:
+    count_in_carts = await db.scalar(select(func.count()).where(CartItemsModel.movie_id == movie.id))
+    if not count_in_carts:
+        return
+    requested_by = await db.get(UserProfileModel, deletion.requested_by_id) if deletion.requested_by_id else None
+    author = f"{requested_by.first_name} {requested_by.last_name}" if requested_by else "A moderator"
+    message = f"{author} delete movie {movie.name}. Movie exists in {count_in_carts} carts."
+    await db.execute(
+        insert(NotificationsModel).from_select(
+            ["user_profile_id", "movie_id", "message", "movie_title"],
+            select(UserProfileModel.id, literal(movie.id), literal(message), literal(movie.name))
+            .join(UserModel, UserModel.id == UserProfileModel.user_id)
+            .join(UserGroupModel, UserGroupModel.id == UserModel.group_id)
+            .where(UserGroupModel.name == UserGroupEnum.moderator)
+        )
+    )
+
+
+async def _delete_in_chunks(db: AsyncSession, deletion: MovieDeletionModel, model, chunk_size: int) -> None:
+    deletion.stage = model.__tablename__
+    await db.commit()
+    while True:
+        chunk = select(model.id).where(model.movie_id == deletion.movie_id).limit(chunk_size).scalar_subquery()
+        result = await db.execute(
+            delete(model).where(model.id.in_(chunk)).returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = len(result.all())
+        if not deleted:
+            return
+        deletion.processed += deleted
+        await db.commit()
+
+
+async def _remove_from_orders(db: AsyncSession, deletion: MovieDeletionModel, movie: MovieModel,
+                              chunk_size: int) -> None:
+    deletion.stage = OrderItemsModel.__tablename__
+    await db.commit()
+    message = (f"Movie {movie.name} has been deleted from our site. "
+               f"Film was excluded from your order and recalculated the amount order.")
+    while True:
+        result = await db.execute(
+            select(OrderItemsModel.id, OrderItemsModel.order_id)
+            .where(OrderItemsModel.movie_id == movie.id)
+            .limit(chunk_size)
+        )
+        items = result.tuples().all()
+        if not items:
+            return
+        item_ids = [item_id for item_id, _ in items]
+        order_ids = sorted({order_id for _, order_id in items})
+
+        already_notified = exists().where(
+            NotificationsModel.user_id == OrdersModel.user_id,
+            NotificationsModel.movie_id == movie.id,
+            NotificationsModel.message == message,
+        )
+        await db.execute(
+            insert(NotificationsModel).from_select(
+                ["user_id", "message", "movie_title", "movie_id"],
+                select(OrdersModel.user_id, literal(message), literal(movie.name), literal(movie.id))
+                .where(OrdersModel.id.in_(order_ids), ~already_notified)
+                .distinct()
+            )
+        )
+        await db.execute(
+            delete(OrderItemsModel).where(OrderItemsModel.id.in_(item_ids))
+            .execution_options(synchronize_session=False)
+        )
+        remaining_total = (
+            select(func.coalesce(func.sum(OrderItemsModel.price_at_order), 0))
+            .where(OrderItemsModel.order_id == OrdersModel.id)
+            .scalar_subquery()
+        )
+        await db.execute(
+            update(OrdersModel).where(OrdersModel.id.in_(order_ids)).values(total_amount=remaining_total)
+            .execution_options(synchronize_session=False)
+        )
+        deletion.processed += len(item_ids)
+        await db.commit()
+
+
+async def run_movie_deletion(
+        db: AsyncSession,
+        deletion_id: int,
+        chunk_size: int = DELETION_CHUNK_ROWS,
+        stale_after_seconds: int = DELETION_STALE_SECONDS
+) -> Optional[MovieDeletionModel]:
+    """
+    Delete a movie registered by `request_movie_deletion`, in short transactions.
+
+    Cart items, order items, comments and ratings are removed `chunk_size` rows
+    per transaction, so no lock is held for long. Each chunk of order items
+    notifies the owners of the affected orders with one `INSERT ... SELECT`
+    and recomputes their totals with one set-based `UPDATE`. The movie itself
+    is deleted in the last transaction, together with its change feed entry.
+    Every step can be re-run, so a failed deletion is resumed by running it
+    again. A run first claims the deletion by moving it to `running`, so a
+    job enqueued twice only does the work once. A running deletion with no
+    step committed for `stale_after_seconds` lost its job (the worker died
+    mid-run) and can be claimed again.
+
+    Returns:
+        Optional[MovieDeletionModel]: The deletion, or None if there is no deletion with this id.
+        A deletion running elsewhere or already completed is returned untouched.
+    """
+    claimed = await db.scalar(
+        update(MovieDeletionModel)
+        .where(
+            MovieDeletionModel.id == deletion_id,
+            or_(MovieDeletionModel.status.in_(CLAIMABLE_DELETION_STATUSES), _stale_deletion(stale_after_seconds)),
+        )
+        .values(status=MovieDeletionStatus.RUNNING, error=None)
+        .returning(MovieDeletionModel.id)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    deletion = await db.get(MovieDeletionModel, deletion_id)
+    if deletion is None or claimed is None:
+        return deletion
+
+    movie = await db.get(MovieModel, deletion.movie_id)
+    if movie is not None:
+        first_run = deletion.stage is None
+        if deletion.total is None:
+            counts = await db.execute(select(*(
+                select(func.count()).where(model.movie_id == movie.id).scalar_subquery()
+                for model in (CartItemsModel, OrderItemsModel, CommentsModel, RatingsModel)
+            )))
+            deletion.total = sum(counts.one())
+        if first_run:
+            await _notify_moderators(db, deletion, movie)
+
+        await _delete_in_chunks(db, deletion, CartItemsModel, chunk_size)
+        await _remove_from_orders(db, deletion, movie, chunk_size)
+        await _delete_in_chunks(db, deletion, CommentsModel, chunk_size)
+        await _delete_in_chunks(db, deletion, RatingsModel, chunk_size)
+
+        deletion.stage = MovieModel.__tablename__
+        await db.execute(delete(MovieModel).where(MovieModel.id == movie.id)
+                         .execution_options(synchronize_session=False))
+        await record_movie_changes(db, [movie.id], MovieChangeType.DELETE)
+        await bump_catalog_versions(db, MOVIES_VERSION, GENRES_VERSION)
+
+    # Replies removed together with their parent comment are never counted, so settle the total here.
+    deletion.processed = max(deletion.processed, deletion.total or 0)
+    deletion.status = MovieDeletionStatus.COMPLETED
+    deletion.finished_at = datetime.now(timezone.utc)
+    await db.commit()
+    return deletion
+
+
+async def fail_movie_deletion(db: AsyncSession, deletion_id: int, error: str) -> None:
+    """
+    Record that a deletion stopped on an error; the rows it already removed stay removed.
+    """
+    await db.execute(
+        update(MovieDeletionModel)
+        .where(MovieDeletionModel.id == deletion_id, MovieDeletionModel.status != MovieDeletionStatus.COMPLETED)
+        .values(status=MovieDeletionStatus.FAILED, error=error, finished_at=func.now())
+    )
+
+
+async def stale_movie_deletions(db: AsyncSession, stale_after_seconds: int = DELETION_STALE_SECONDS) -> list[int]:
+    """
+    Return the ids of deletions whose worker job was lost.
+
+    These are deletions still pending `stale_after_seconds` after they were
+    requested, for example because the broker was unavailable when they were
+    enqueued, and running deletions with no step committed for as long,
+    because the worker running them died.
+    """
+    result = await db.scalars(
+        select(MovieDeletionModel.id)
+        .where(_stale_deletion(stale_after_seconds))
+        .order_by(MovieDeletionModel.id)
+    )
+    return list(result.all())
+
+
+def is_stale_deletion(deletion: MovieDeletionModel, stale_after_seconds: int = DELETION_STALE_SECONDS) -> bool:
+    """
+    Tell whether a loaded deletion is running without a step committed for `stale_after_seconds`.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after_seconds)
+    return deletion.status == MovieDeletionStatus.RUNNING and deletion.updated_at < cutoff
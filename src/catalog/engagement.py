@@ -0,0 +1,109 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models.movies import (MovieModel, ReactionsModel, ReactionType, CommentsModel, RatingsModel,
+                                    MovieFavoritesModel)
+
+ENGAGEMENT_COLUMNS = ("likes_count", "dislikes_count", "comments_count", "favorites_count", "ratings_count",
+                      "ratings_sum")
+
+REACTION_COUNT_COLUMNS = {
+    ReactionType.LIKE: "likes_count",
+    ReactionType.DISLIKE: "dislikes_count",
+}
+
+
+async def adjust_engagement(db: AsyncSession, movie_id: int, **deltas: int) -> None:
+    """
+    Atomically add deltas to a movie's engagement counters inside the current transaction.
+
+    The increment is applied by the database (`col = col + delta`), so concurrent
+    writers never lose updates, and the movie version is bumped so cached and
+    conditional detail responses are refreshed.
+    """
+    values = {column: getattr(MovieModel, column) + delta for column, delta in deltas.items() if delta}
+    if not values:
+        return
+    await db.execute(
+        update(MovieModel)
+        .where(MovieModel.id == movie_id)
+        .values(**values, version=MovieModel.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _engagement_totals(movie_ids: Optional[list[int]]):
+    def restrict(query, movie_id_column):
+        if movie_ids is None:
+            return query
+        return query.where(movie_id_column.in_(movie_ids))
+
+    reactions = restrict(
+        select(
+            ReactionsModel.movie_id,
+            func.count().filter(ReactionsModel.reaction_type == ReactionType.LIKE).label("likes_count"),
+            func.count().filter(ReactionsModel.reaction_type == ReactionType.DISLIKE).label("dislikes_count"),
+        )
+        .group_by(ReactionsModel.movie_id),
+        ReactionsModel.movie_id
+    ).subquery()
+    comments = restrict(
+        select(CommentsModel.movie_id, func.count().label("comments_count"))
+        .group_by(CommentsModel.movie_id),
+        CommentsModel.movie_id
+    ).subquery()
+    favorites = restrict(
+        select(MovieFavoritesModel.c.movie_id, func.count().label("favorites_count"))
+        .group_by(MovieFavoritesModel.c.movie_id),
+        MovieFavoritesModel.c.movie_id
+    ).subquery()
+    ratings = restrict(
+        select(
+            RatingsModel.movie_id,
+            func.count().label("ratings_count"),
+            func.sum(RatingsModel.rating).label("ratings_sum"),
+        )
+        .group_by(RatingsModel.movie_id),
+        RatingsModel.movie_id
+    ).subquery()
+    totals = (
+        select(
+            MovieModel.id.label("movie_id"),
+            func.coalesce(reactions.c.likes_count, 0).label("likes_count"),
+            func.coalesce(reactions.c.dislikes_count, 0).label("dislikes_count"),
+            func.coalesce(comments.c.comments_count, 0).label("comments_count"),
+            func.coalesce(favorites.c.favorites_count, 0).label("favorites_count"),
+            func.coalesce(ratings.c.ratings_count, 0).label("ratings_count"),
+            func.coalesce(ratings.c.ratings_sum, 0).label("ratings_sum"),
+        )
+        .outerjoin(reactions, reactions.c.movie_id == MovieModel.id)
+        .outerjoin(comments, comments.c.movie_id == MovieModel.id)
+        .outerjoin(favorites, favorites.c.movie_id == MovieModel.id)
+        .outerjoin(ratings, ratings.c.movie_id == MovieModel.id)
+    )
+    return restrict(totals, MovieModel.id)
+
+
+async def reconcile_engagement(db: AsyncSession, movie_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute engagement counters from the source tables in one set-based statement.
+
+    Only movies whose stored counters drifted are rewritten (and get their
+    version bumped). Restrict the pass to `movie_ids` when given.
+
+    Returns:
+        int: The number of movies whose counters were corrected.
+    """
+    totals = _engagement_totals(list(movie_ids) if movie_ids is not None else None).subquery()
+
+    stored = tuple_(*(getattr(MovieModel, column) for column in ENGAGEMENT_COLUMNS))
+    actual = tuple_(*(totals.c[column] for column in ENGAGEMENT_COLUMNS))
+    result = await db.execute(
+        update(MovieModel)
+        .where(MovieModel.id == totals.c.movie_id, stored.is_distinct_from(actual))
+        .values(**{column: totals.c[column] for column in ENGAGEMENT_COLUMNS}, version=MovieModel.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog.cards import CARD_COLUMNS, CARD_RELATIONS, movie_cards_select
+from catalog.filters import MovieFilterParams, apply_movie_filters, apply_movie_sorting, configure_movie_filters
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_BATCH_ROWS = 1000
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+CSV_EXPORT_COLUMNS = tuple(column for column in CARD_COLUMNS if column != "id") + tuple(CARD_RELATIONS)
+
+
+def _ndjson_rows(cards: list[dict]) -> str:
+    return "".join(json.dumps(card, separators=(",", ":")) + "\n" for card in cards)
+
+
+def _csv_rows(cards: list[dict], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_EXPORT_COLUMNS)
+    for card in cards:
+        writer.writerow(
+            [card[column] for column in CARD_COLUMNS if column != "id"]
+            + [", ".join(item["name"] for item in card[relation]) for relation in CARD_RELATIONS]
+        )
+    return buffer.getvalue()
+
+
+async def stream_movie_export(
+        session_factory: Callable[[], AsyncSession],
+        filters: MovieFilterParams,
+        file_format: str,
+        compress: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Stream the listing cards matching `filters` as NDJSON or CSV, optionally gzip-compressed.
+
+    Rows are read through a server-side cursor in batches of `EXPORT_BATCH_ROWS`
+    and written out in chunks of about `EXPORT_CHUNK_BYTES`, so memory stays
+    constant whatever the size of the catalog. The export opens its own session
+    because the response body is produced after the request's dependencies have
+    been closed. CSV rows use the bulk import columns, with people and genres as
+    comma-separated names, so an export can be imported again.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+    pending = []
+    pending_size = 0
+
+    def flush() -> bytes:
+        nonlocal pending, pending_size
+        data = b"".join(pending)
+        pending, pending_size = [], 0
+        return compressor.compress(data) if compressor else data
+
+    async with session_factory() as session:
+        await configure_movie_filters(session, filters)
+        query = apply_movie_sorting(apply_movie_filters(movie_cards_select(), filters), filters)
+        result = await session.stream_scalars(query.execution_options(yield_per=EXPORT_BATCH_ROWS))
+        header = True
+        async for cards in result.partitions():
+            if file_format == "csv":
+                text = _csv_rows(cards, header)
+                header = False
+            else:
+                text = _ndjson_rows(cards)
+            pending.append(text.encode())
+            pending_size += len(pending[-1])
+            if pending_size >= EXPORT_CHUNK_BYTES:
+                chunk = flush()
+                if chunk:
+                    yield chunk
+
+        if header and file_format == "csv":
+            pending.append(_csv_rows([], header).encode())
+    chunk = flush()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
@@ -0,0 +1,97 @@
+from typing import Optional
+
+from sqlalchemy import select, func, case, true, distinct
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog.filters import MovieFilterParams, apply_movie_filters, configure_movie_filters
+from database.models.movies import MovieModel, MovieCardModel
+from schemas.movies import MovieFacetsSchema
+
+FACET_KINDS = ("genres", "directors", "decades", "imdb", "price")
+
+IMDB_BAND_WIDTH = 1
+PRICE_BAND_EDGES = (0, 5, 10, 20, 50)
+
+
+def empty_facet_counts() -> dict[str, dict]:
+    return {kind: {} for kind in FACET_KINDS}
+
+
+def _price_band(price):
+    return case(
+        *((price >= edge, edge) for edge in reversed(PRICE_BAND_EDGES[1:])),
+        else_=PRICE_BAND_EDGES[0],
+    )
+
+
+async def count_movie_facets(db: AsyncSession, filters: MovieFilterParams) -> dict[str, dict]:
+    """
+    Count the movies matching `filters` per genre, director, decade, IMDb band and price band.
+
+    Every facet comes out of one GROUPING SETS aggregate over the matching
+    cards; genre and director names are unnested laterally, so the counts are
+    of distinct movies.
+
+    Returns:
+        dict[str, dict]: Counts keyed by facet kind, then by name or band lower bound.
+    """
+    matches = apply_movie_filters(
+        select(
+            MovieModel.id,
+            (MovieModel.year // 10 * 10).label("decade"),
+            func.least(func.floor(MovieModel.imdb), 10 - IMDB_BAND_WIDTH).label("imdb_band"),
+            _price_band(MovieModel.price).label("price_band"),
+            MovieCardModel.genre_names,
+            MovieCardModel.director_names,
+        ).select_from(MovieCardModel).join(MovieModel, MovieModel.id == MovieCardModel.movie_id),
+        filters
+    ).subquery("matches")
+    genre = func.unnest(matches.c.genre_names).table_valued("name").render_derived().lateral("genre")
+    director = func.unnest(matches.c.director_names).table_valued("name").render_derived().lateral("director")
+
+    facets = (genre.c.name, director.c.name, matches.c.decade, matches.c.imdb_band, matches.c.price_band)
+    stmt = (
+        select(func.grouping(*facets), *facets, func.count(distinct(matches.c.id)))
+        .select_from(matches.outerjoin(genre, true()).outerjoin(director, true()))
+        .group_by(func.grouping_sets(*facets))
+    )
+
+    await configure_movie_filters(db, filters)
+    result = await db.execute(stmt)
+
+    # GROUPING() sets one bit per facet that is *not* grouped; the only clear bit names the set.
+    width = len(facets)
+    counts = empty_facet_counts()
+    for grouping, *values, count in result.tuples():
+        position = next(index for index in range(width) if not grouping & (1 << (width - 1 - index)))
+        value = values[position]
+        if value is not None:
+            counts[FACET_KINDS[position]][value] = count
+    return counts
+
+
+def movie_facets_schema(counts: dict[str, dict], limit: int) -> MovieFacetsSchema:
+    """
+    Shape facet counts into the response: the `limit` most frequent names, and every band in ascending order.
+    """
+    def top(names: dict[str, int]) -> list[dict]:
+        ranked = sorted(names.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [{"name": name, "count": count} for name, count in ranked]
+
+    def price_max(lower) -> Optional[float]:
+        edge = PRICE_BAND_EDGES.index(lower)
+        return PRICE_BAND_EDGES[edge + 1] if edge + 1 < len(PRICE_BAND_EDGES) else None
+
+    return MovieFacetsSchema(
+        genres=top(counts["genres"]),
+        directors=top(counts["directors"]),
+        decades=[{"decade": decade, "count": count} for decade, count in sorted(counts["decades"].items())],
+        imdb=[
+            {"min": lower, "max": lower + IMDB_BAND_WIDTH, "count": count}
+            for lower, count in sorted(counts["imdb"].items())
+        ],
+        price=[
+            {"min": lower, "max": price_max(lower), "count": count}
+            for lower, count in sorted(counts["price"].items())
+        ],
+    )
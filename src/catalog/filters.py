@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, List
+
+from fastapi import Query
+from sqlalchemy import Select, ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog.search import (search_condition, search_rank, fuzzy_condition, fuzzy_rank, set_similarity_threshold,
+                            DEFAULT_SIMILARITY_THRESHOLD)
+from database.models.movies import MovieModel, MovieCardModel
+from schemas.movies import MovieSortField
+
+MOVIE_SORT_COLUMNS = {
+    MovieSortField.YEAR_ASC: (MovieModel.year, False),
+    MovieSortField.YEAR_DESC: (MovieModel.year, True),
+    MovieSortField.PRICE_ASC: (MovieModel.price, False),
+    MovieSortField.PRICE_DESC: (MovieModel.price, True),
+    MovieSortField.IMDB_ASC: (MovieModel.imdb, False),
+    MovieSortField.IMDB_DESC: (MovieModel.imdb, True),
+    MovieSortField.POPULARITY_ASC: (MovieModel.votes, False),
+    MovieSortField.POPULARITY_DESC: (MovieModel.votes, True),
+}
+
+
+@dataclass
+class MovieFilterParams:
+    """
+    Query parameters shared by the catalog listing endpoints.
+    """
+    year: Optional[int] = Query(None, description="Filter by exact release year")
+    year_min: Optional[int] = Query(None, description="Minimum release year")
+    year_max: Optional[int] = Query(None, description="Maximum release year")
+    imdb_min: Optional[float] = Query(None, ge=0, le=10, description="Minimum IMDb rating (0-10)")
+    imdb_max: Optional[float] = Query(None, ge=0, le=10, description="Maximum IMDb rating (0-10)")
+    price_min: Optional[float] = Query(None, ge=0, description="Minimum price")
+    price_max: Optional[float] = Query(None, ge=0, description="Maximum price")
+    genres: Optional[List[str]] = Query(None, description="Filter by genre names")
+    directors: Optional[List[str]] = Query(None, description="Filter by director names")
+    actors: Optional[List[str]] = Query(None, description="Filter by actor names")
+    search: Optional[str] = Query(None, description="Search in title, description, actors or directors")
+    fuzzy: bool = Query(False, description="Typo-tolerant search over titles, actors and directors")
+    similarity: float = Query(
+        DEFAULT_SIMILARITY_THRESHOLD,
+        ge=0,
+        le=1,
+        description="Minimum trigram similarity (0-1) for fuzzy search"
+    )
+    sort_by: Optional[MovieSortField] = Query(
+        None,
+        description="Sort by field and direction. Defaults to relevance for fuzzy search, newest first otherwise"
+    )
+
+    def __post_init__(self):
+        if self.sort_by is None:
+            self.sort_by = MovieSortField.RELEVANCE if self.is_fuzzy else MovieSortField.YEAR_DESC
+
+    @property
+    def is_fuzzy(self) -> bool:
+        return bool(self.fuzzy and self.search)
+
+
+async def configure_movie_filters(db: AsyncSession, filters: MovieFilterParams) -> None:
+    """
+    Prepare the session for the filters before the filtered statement is executed.
+    """
+    if filters.is_fuzzy:
+        await set_similarity_threshold(db, filters.similarity)
+
+
+MOVIE_FILTER_CONDITIONS: dict[str, Callable[[Any], ColumnElement]] = {
+    "year": lambda year: MovieModel.year == year,
+    "year_min": lambda year: MovieModel.year >= year,
+    "year_max": lambda year: MovieModel.year <= year,
+    "imdb_min": lambda imdb: MovieModel.imdb >= imdb,
+    "imdb_max": lambda imdb: MovieModel.imdb <= imdb,
+    "price_min": lambda price: MovieModel.price >= price,
+    "price_max": lambda price: MovieModel.price <= price,
+    "genres": lambda names: MovieCardModel.genre_names.overlap(names),
+    "directors": lambda names: MovieCardModel.director_names.overlap(names),
+    "actors": lambda names: MovieCardModel.star_names.overlap(names),
+    "search": search_condition,
+    "fuzzy_search": fuzzy_condition,
+}
+
+
+def movie_filter_values(filters: MovieFilterParams) -> dict[str, Any]:
+    """
+    Collect the active filters as `MOVIE_FILTER_CONDITIONS` names mapped to their values.
+
+    The names always come out in the same order, so the keys of the result
+    identify the shape of the filtered statement.
+    """
+    values = {}
+    for name in ("year", "year_min", "year_max", "imdb_min", "imdb_max", "price_min", "price_max"):
+        value = getattr(filters, name)
+        if value is not None:
+            values[name] = value
+    for name in ("genres", "directors", "actors"):
+        names = getattr(filters, name)
+        if names:
+            values[name] = names
+    if filters.is_fuzzy:
+        values["fuzzy_search"] = filters.search
+    elif filters.search:
+        values["search"] = filters.search
+    return values
+
+
+def apply_movie_filters(query: Select, filters: MovieFilterParams) -> Select:
+    """
+    Apply the catalog filter predicates to a select over movie cards joined to MovieModel.
+
+    Genre, director and actor filters are array overlaps against the card's
+    GIN-indexed name arrays, so the statement keeps exactly one row per movie,
+    which both offset and keyset pagination rely on.
+    """
+    for name, value in movie_filter_values(filters).items():
+        query = query.where(MOVIE_FILTER_CONDITIONS[name](value))
+    return query
+
+
+def sort_expression(sort_by: MovieSortField, search: Any = None, fuzzy: bool = False) -> tuple[ColumnElement, bool]:
+    """
+    Resolve an ordering into a sort expression and its direction.
+
+    Relevance ranks fuzzy matches by trigram similarity and full-text matches by
+    ts_rank, and falls back to the newest movies first when there is no search
+    term to rank against.
+    """
+    if sort_by == MovieSortField.RELEVANCE:
+        if search is None:
+            return MOVIE_SORT_COLUMNS[MovieSortField.YEAR_DESC]
+        return (fuzzy_rank(search) if fuzzy else search_rank(search)), True
+    return MOVIE_SORT_COLUMNS[sort_by]
+
+
+def movie_sort_expression(filters: MovieFilterParams) -> tuple[ColumnElement, bool]:
+    """
+    Resolve the requested ordering of the filters into a sort expression and its direction.
+    """
+    return sort_expression(filters.sort_by, filters.search or None, filters.is_fuzzy)
+
+
+def apply_movie_sorting(query: Select, filters: MovieFilterParams) -> Select:
+    """
+    Order a catalog select by the requested field, using the movie id as a tiebreaker.
+    """
+    return order_movies(query, *movie_sort_expression(filters))
+
+
+def order_movies(query: Select, column: ColumnElement, descending: bool) -> Select:
+    if descending:
+        return query.order_by(column.desc(), MovieModel.id.desc())
+    return query.order_by(column.asc(), MovieModel.id.asc())
@@ -0,0 +1,61 @@
+from typing import Iterable
+
+from sqlalchemy import select, func, String, any_, bindparam
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _insert_missing(model, requested):
+    return (
+        insert(model)
+        .from_select(["name"], select(func.unnest(requested)))
+        .on_conflict_do_nothing(index_elements=[model.name])
+        .returning(model.id, model.name)
+    )
+
+
+async def insert_names(db: AsyncSession, model, names: Iterable[str]) -> dict[str, int]:
+    """
+    Insert the names of a lookup table that do not exist yet, in one statement and without raising on duplicates.
+
+    Returns:
+        dict[str, int]: The ids of the names this call created; names that already existed are left out.
+    """
+    names = sorted(set(names))
+    if not names:
+        return {}
+    result = await db.execute(_insert_missing(model, bindparam("names", names, type_=ARRAY(String))))
+    return {name: row_id for row_id, name in result.tuples().all()}
+
+
+async def resolve_names(db: AsyncSession, model, names: Iterable[str]) -> dict[str, int]:
+    """
+    Get or create rows of a name lookup table (stars, genres, directors, certifications) in one statement.
+
+    Missing names are inserted with `ON CONFLICT DO NOTHING RETURNING`, and the
+    ids of names that already existed are read back in the same statement.
+    Names are inserted in sorted order, so concurrent resolvers lock them in the
+    same order. A name committed by a concurrent transaction after this
+    statement's snapshot was taken is neither returned nor visible, so those few
+    are read again afterwards instead of retrying on IntegrityError.
+
+    Returns:
+        dict[str, int]: The id of every requested name.
+    """
+    names = sorted(set(names))
+    if not names:
+        return {}
+
+    requested = bindparam("names", names, type_=ARRAY(String))
+    inserted = _insert_missing(model, requested).cte("inserted")
+    result = await db.execute(
+        select(inserted.c.name, inserted.c.id)
+        .union_all(select(model.name, model.id).where(model.name == any_(requested)))
+    )
+    ids = dict(result.tuples().all())
+
+    missing = [name for name in names if name not in ids]
+    if missing:
+        result = await db.execute(select(model.name, model.id).where(model.name.in_(missing)))
+        ids.update(result.tuples().all())
+    return ids
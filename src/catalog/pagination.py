@@ -0,0 +1,166 @@
+import base64
+import binascii
+import json
+import math
+from decimal import Decimal
+from typing import Optional, Any
+
+from sqlalchemy import Select, tuple_, Integer, Float, Numeric, String
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog.filters import MovieFilterParams, movie_sort_expression
+from database.models.movies import MovieModel
+from exceptions import InvalidCursorError
+from schemas.movies import MovieSortField, MovieCursorPageSchema, MovieListSchema
+
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+
+INT4_MIN, INT4_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def encode_cursor(payload: dict) -> str:
+    """
+    Encode a cursor payload into an opaque URL-safe string.
+    """
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise InvalidCursorError
+    if not isinstance(payload, dict):
+        raise InvalidCursorError
+    return payload
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _movie_cursor(movie_id: int, value: Any, sort_by: MovieSortField, direction: str) -> str:
+    return encode_cursor({
+        "s": sort_by.value,
+        "v": _cursor_value(value),
+        "id": movie_id,
+        "d": direction,
+    })
+
+
+def _is_int4(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and INT4_MIN <= value <= INT4_MAX
+
+
+def _cursor_sort_value(value: Any, expression: ColumnElement) -> Any:
+    """
+    Check a cursor's sort value against the type of the sort expression it is compared with.
+
+    Ranks are untyped SQL functions and take any finite number.
+
+    Raises:
+        InvalidCursorError: If the value cannot be bound to the expression.
+    """
+    column_type = expression.type
+    if isinstance(column_type, Integer):
+        if not _is_int4(value):
+            raise InvalidCursorError
+        return value
+    if isinstance(column_type, String):
+        if not isinstance(value, str):
+            raise InvalidCursorError
+        return value
+    if isinstance(column_type, Numeric) and not isinstance(column_type, Float):
+        if not isinstance(value, (str, int)) or isinstance(value, bool):
+            raise InvalidCursorError
+        try:
+            value = Decimal(value)
+        except ArithmeticError:
+            raise InvalidCursorError
+        if not value.is_finite():
+            raise InvalidCursorError
+        return value
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+        raise InvalidCursorError
+    return float(value)
+
+
+def _parse_movie_cursor(cursor: str, sort_by: MovieSortField, expression: ColumnElement) -> tuple[Any, int, str]:
+    payload = decode_cursor(cursor)
+    if payload.get("s") != sort_by.value or payload.get("d") not in (CURSOR_NEXT, CURSOR_PREV):
+        raise InvalidCursorError("Cursor does not match the requested ordering.")
+
+    movie_id = payload.get("id")
+    if not _is_int4(movie_id):
+        raise InvalidCursorError
+    return _cursor_sort_value(payload.get("v"), expression), movie_id, payload["d"]
+
+
+async def paginate_movies_by_cursor(
+        db: AsyncSession,
+        query: Select,
+        filters: MovieFilterParams,
+        cursor: Optional[str],
+        size: int
+) -> MovieCursorPageSchema:
+    """
+    Fetch one page of a filtered movie card select using keyset pagination.
+
+    The page is located with a row comparison on (sort expression, id) instead of
+    OFFSET, and no total count is computed, so the cost of a page does not
+    depend on how deep into the listing it is.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another ordering.
+    """
+    sort_by = filters.sort_by
+    expression, descending = movie_sort_expression(filters)
+    direction = CURSOR_NEXT
+    if cursor is not None:
+        value, movie_id, direction = _parse_movie_cursor(cursor, sort_by, expression)
+        backwards = direction == CURSOR_PREV
+        if descending != backwards:
+            query = query.where(tuple_(expression, MovieModel.id) < tuple_(value, movie_id))
+        else:
+            query = query.where(tuple_(expression, MovieModel.id) > tuple_(value, movie_id))
+
+    backwards = direction == CURSOR_PREV
+    if descending != backwards:
+        query = query.order_by(expression.desc(), MovieModel.id.desc())
+    else:
+        query = query.order_by(expression.asc(), MovieModel.id.asc())
+
+    result = await db.execute(query.add_columns(expression, MovieModel.id).limit(size + 1))
+    rows = list(result.all())
+    has_more = len(rows) > size
+    rows = rows[:size]
+    if backwards:
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        _, first_value, first_id = rows[0]
+        _, last_value, last_id = rows[-1]
+        if backwards or has_more:
+            next_cursor = _movie_cursor(last_id, last_value, sort_by, CURSOR_NEXT)
+        if (backwards and has_more) or (not backwards and cursor is not None):
+            prev_cursor = _movie_cursor(first_id, first_value, sort_by, CURSOR_PREV)
+
+    return MovieCursorPageSchema(
+        items=[MovieListSchema.model_validate(card) for card, _, _ in rows],
+        size=size,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
@@ -0,0 +1,70 @@
+from functools import lru_cache
+from typing import Optional
+
+from fastapi_pagination import Params, Page, create_page
+from sqlalchemy import Select, bindparam, func, select, String
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog.cards import movie_cards_select
+from catalog.filters import (MovieFilterParams, MOVIE_FILTER_CONDITIONS, movie_filter_values, sort_expression,
+                             order_movies, configure_movie_filters)
+from database.models.movies import MovieModel, MovieFavoritesModel
+from schemas.movies import MovieSortField
+
+SEARCH_FILTERS = ("search", "fuzzy_search")
+
+
+@lru_cache(maxsize=512)
+def catalog_statements(
+        filter_names: tuple[str, ...],
+        sort_by: MovieSortField,
+        favourites: bool = False
+) -> tuple[Select, Select]:
+    """
+    Build the page and count statements of one catalog query shape, with every filter value as a bind parameter.
+
+    The statements are memoized per shape, so a hot shape reuses the same
+    statement objects, whose cache key is computed once and whose compiled
+    form stays in the engine's compiled cache; each request only supplies
+    parameter values.
+
+    Returns:
+        tuple[Select, Select]: The page statement (with `limit`/`offset` parameters) and the count statement.
+    """
+    query = movie_cards_select()
+    if favourites:
+        query = query.join(MovieFavoritesModel, MovieFavoritesModel.c.movie_id == MovieModel.id).where(
+            MovieFavoritesModel.c.user_profile_id == bindparam("user_profile_id")
+        )
+
+    search = None
+    for name in filter_names:
+        value = bindparam(name, type_=String) if name in SEARCH_FILTERS else bindparam(name)
+        if name in SEARCH_FILTERS:
+            search = value
+        query = query.where(MOVIE_FILTER_CONDITIONS[name](value))
+
+    count = select(func.count()).select_from(query.subquery())
+    page = order_movies(query, *sort_expression(sort_by, search, "fuzzy_search" in filter_names))
+    return page.limit(bindparam("limit")).offset(bindparam("offset")), count
+
+
+async def paginate_catalog(
+        db: AsyncSession,
+        filters: MovieFilterParams,
+        params: Params,
+        user_profile_id: Optional[int] = None
+) -> Page:
+    """
+    Fetch one offset page of movie cards matching the filters, optionally restricted to a user's favourites.
+    """
+    values = movie_filter_values(filters)
+    page, count = catalog_statements(tuple(values), filters.sort_by, user_profile_id is not None)
+    if user_profile_id is not None:
+        values["user_profile_id"] = user_profile_id
+
+    await configure_movie_filters(db, filters)
+    raw_params = params.to_raw_params()
+    total = await db.scalar(count, values)
+    cards = await db.scalars(page, {**values, "limit": raw_params.limit, "offset": raw_params.offset})
+    return create_page(cards.all(), total=total, params=params)
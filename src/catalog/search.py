@@ -0,0 +1,115 @@
+from typing import Iterable
+
+from sqlalchemy import select, func, update, literal, literal_column, or_, ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models.movies import (MovieModel, StarsModel, DirectorsModel, MovieStarsModel,
+                                    MovieDirectorsModel)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.3
+
+TS_CONFIG = "english"
+
+_ts_config = literal_column(f"'{TS_CONFIG}'::regconfig")
+
+
+def _weight(label: str) -> ColumnElement:
+    return literal_column(f"'{label}'::\"char\"")
+
+
+def _people_names(model, association, foreign_key: str) -> ColumnElement:
+    return (
+        select(func.string_agg(model.name, literal(" ")))
+        .join(association, association.c[foreign_key] == model.id)
+        .where(association.c.movie_id == MovieModel.id)
+        .scalar_subquery()
+    )
+
+
+def movie_search_document() -> ColumnElement:
+    """
+    Build the weighted tsvector for the current movie row.
+
+    The title is weighted highest, then stars and directors, then the description.
+    """
+    people = func.concat_ws(
+        " ",
+        _people_names(StarsModel, MovieStarsModel, "star_id"),
+        _people_names(DirectorsModel, MovieDirectorsModel, "director_id"),
+    )
+    return (
+        func.setweight(func.to_tsvector(_ts_config, func.coalesce(MovieModel.name, "")), _weight("A"))
+        .op("||")(func.setweight(func.to_tsvector(_ts_config, people), _weight("B")))
+        .op("||")(func.setweight(func.to_tsvector(_ts_config, func.coalesce(MovieModel.description, "")), _weight("C")))
+    )
+
+
+async def refresh_search_documents(db: AsyncSession, movie_ids: Iterable[int]) -> None:
+    """
+    Recompute the stored search document of the given movies inside the current transaction.
+    """
+    movie_ids = list(movie_ids)
+    if not movie_ids:
+        return
+    await db.execute(
+        update(MovieModel)
+        .where(MovieModel.id.in_(movie_ids))
+        .values(search_vector=movie_search_document())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def search_query(term: str) -> ColumnElement:
+    return func.websearch_to_tsquery(_ts_config, term)
+
+
+def search_condition(term: str) -> ColumnElement:
+    """
+    Full-text match of the stored movie document against a user search string.
+    """
+    return MovieModel.search_vector.op("@@")(search_query(term))
+
+
+def search_rank(term: str) -> ColumnElement:
+    return func.ts_rank(MovieModel.search_vector, search_query(term))
+
+
+async def set_similarity_threshold(db: AsyncSession, threshold: float) -> None:
+    """
+    Set the pg_trgm similarity threshold used by the `%` operator for the current transaction.
+
+    The threshold is applied through the session setting rather than a
+    `similarity() >= x` predicate so the trigram GIN indexes stay usable.
+    """
+    await db.execute(select(func.set_config("pg_trgm.similarity_threshold", str(threshold), True)))
+
+
+def fuzzy_condition(term: str) -> ColumnElement:
+    """
+    Typo-tolerant match of a search string against movie titles, stars and directors.
+    """
+    return or_(
+        MovieModel.name.op("%")(term),
+        MovieModel.stars.any(StarsModel.name.op("%")(term)),
+        MovieModel.directors.any(DirectorsModel.name.op("%")(term)),
+    )
+
+
+def _best_people_similarity(model, association, foreign_key: str, term: str) -> ColumnElement:
+    return (
+        select(func.max(func.similarity(model.name, term)))
+        .join(association, association.c[foreign_key] == model.id)
+        .where(association.c.movie_id == MovieModel.id)
+        .scalar_subquery()
+    )
+
+
+def fuzzy_rank(term: str) -> ColumnElement:
+    """
+    Best trigram similarity between a search string and the movie title or any of its people.
+    """
+    return func.greatest(
+        func.similarity(MovieModel.name, term),
+        func.coalesce(_best_people_similarity(StarsModel, MovieStarsModel, "star_id", term), 0),
+        func.coalesce(_best_people_similarity(DirectorsModel, MovieDirectorsModel, "director_id", term), 0),
+    )
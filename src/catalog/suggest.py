@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from typing import Callable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models.movies import MovieModel, StarsModel, GenresModel, DirectorsModel
+
+SUGGEST_SOURCES = {
+    "movies": MovieModel,
+    "stars": StarsModel,
+    "directors": DirectorsModel,
+    "genres": GenresModel,
+}
+
+
+def _prefix_keys(name: str) -> set[str]:
+    """
+    Normalized keys under which a name is reachable: the whole name and every word-start suffix.
+    """
+    words = name.casefold().split()
+    return {" ".join(words[position:]) for position in range(len(words))}
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index mapping normalized name keys to entity ids.
+    """
+
+    def __init__(self, items: Iterable[tuple[int, str]] = ()):
+        self._names: dict[int, str] = {}
+        self._keys: dict[int, set[str]] = {}
+        entries = []
+        for entity_id, name in items:
+            keys = _prefix_keys(name)
+            self._names[entity_id] = name
+            self._keys[entity_id] = keys
+            entries.extend((key, entity_id) for key in keys)
+        entries.sort()
+        self._entries: list[tuple[str, int]] = entries
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def upsert(self, entity_id: int, name: str) -> None:
+        self.remove(entity_id)
+        keys = _prefix_keys(name)
+        self._names[entity_id] = name
+        self._keys[entity_id] = keys
+        for key in keys:
+            insort(self._entries, (key, entity_id))
+
+    def remove(self, entity_id: int) -> None:
+        keys = self._keys.pop(entity_id, ())
+        self._names.pop(entity_id, None)
+        for key in keys:
+            position = bisect_left(self._entries, (key, entity_id))
+            if position < len(self._entries) and self._entries[position] == (key, entity_id):
+                del self._entries[position]
+
+    def search(self, prefix: str, limit: int) -> list[tuple[int, str]]:
+        """
+        Return up to `limit` (id, name) pairs whose name or any of its words starts with the prefix.
+        """
+        prefix = " ".join(prefix.casefold().split())
+        if not prefix:
+            return []
+
+        found: dict[int, str] = {}
+        position = bisect_left(self._entries, (prefix,))
+        while position < len(self._entries) and len(found) < limit:
+            key, entity_id = self._entries[position]
+            if not key.startswith(prefix):
+                break
+            found.setdefault(entity_id, self._names[entity_id])
+            position += 1
+        return list(found.items())
+
+
+class CatalogSuggestIndex:
+    """
+    In-process typeahead index over movie titles, stars, directors and genres.
+
+    The index is rebuilt from the database periodically and patched in place by
+    the catalog write routes, so suggestion requests never reach Postgres.
+    """
+
+    def __init__(self):
+        self._indexes: dict[str, PrefixIndex] = {kind: PrefixIndex() for kind in SUGGEST_SOURCES}
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        indexes = {}
+        for kind, model in SUGGEST_SOURCES.items():
+            result = await db.execute(select(model.id, model.name))
+            indexes[kind] = PrefixIndex(result.tuples().all())
+        self._indexes = indexes
+
+    def suggest(self, prefix: str, limit: int) -> dict[str, list[tuple[int, str]]]:
+        return {kind: index.search(prefix, limit) for kind, index in self._indexes.items()}
+
+    def upsert(self, kind: str, entity_id: int, name: str) -> None:
+        self._indexes[kind].upsert(entity_id, name)
+
+    def remove(self, kind: str, entity_id: int) -> None:
+        self._indexes[kind].remove(entity_id)
+
+    def upsert_movie(self, movie: MovieModel) -> None:
+        """
+        Index a movie together with its (possibly newly created) stars, directors and genres.
+        """
+        self.upsert("movies", movie.id, movie.name)
+        for kind, related in (("stars", movie.stars), ("directors", movie.directors), ("genres", movie.genres)):
+            for entity in related:
+                self.upsert(kind, entity.id, entity.name)
+
+
+async def keep_suggest_index_fresh(
+        index: CatalogSuggestIndex,
+        session_factory: Callable[[], AsyncSession],
+        interval_seconds: int
+) -> None:
+    """
+    Rebuild the suggest index now and then every `interval_seconds`.
+
+    Writes handled by other worker processes only reach this worker's index
+    through these rebuilds.
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                await index.rebuild(session)
+        except Exception as error:
+            logging.error(f"Failed to rebuild the catalog suggest index: {error}")
+        await asyncio.sleep(interval_seconds)
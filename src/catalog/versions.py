@@ -0,0 +1,49 @@
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models.movies import MovieModel, CatalogVersionModel
+
+MOVIES_VERSION = "movies"
+GENRES_VERSION = "genres"
+
+
+async def get_catalog_version(db: AsyncSession, name: str) -> int:
+    """
+    Return the current version of a catalog collection, 0 if it was never bumped.
+    """
+    result = await db.execute(select(CatalogVersionModel.version).where(CatalogVersionModel.name == name))
+    return result.scalar_one_or_none() or 0
+
+
+async def bump_catalog_versions(db: AsyncSession, *names: str) -> None:
+    """
+    Increment the versions of catalog collections inside the current transaction.
+
+    The bump commits together with the write that caused it, so a client can
+    never see a new version paired with the old data.
+    """
+    stmt = insert(CatalogVersionModel).values([{"name": name, "version": 1} for name in sorted(set(names))])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[CatalogVersionModel.name],
+        set_={"version": CatalogVersionModel.version + 1},
+    ))
+
+
+async def get_movie_version(db: AsyncSession, movie_id: int) -> Optional[int]:
+    """
+    Return the version of a movie, or None if the movie does not exist.
+    """
+    result = await db.execute(select(MovieModel.version).where(MovieModel.id == movie_id))
+    return result.scalar_one_or_none()
+
+
+async def bump_movie_version(db: AsyncSession, movie_id: int) -> None:
+    await db.execute(
+        update(MovieModel)
+        .where(MovieModel.id == movie_id)
+        .values(version=MovieModel.version + 1)
+        .execution_options(synchronize_session=False)
+    )
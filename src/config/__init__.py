@@ -1,5 +1,15 @@
 from config.settings import BaseAppSettings
+from config.container import AppContainer
 from config.dependencies import (
     get_settings,
+    get_container,
     get_jwt_auth_manager,
-    get_accounts_email_notificator)
+    get_token_cache,
+    get_token_versions,
+    get_password_hasher,
+    get_accounts_email_notificator,
+    get_s3_storage_client,
+    get_suggest_index,
+    get_catalog_cache,
+    get_catalog_reader,
+    get_columnar_catalog)
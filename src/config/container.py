@@ -0,0 +1,120 @@
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from cache import CacheBackendInterface, InMemoryCache, RedisCache, ReadThroughCache
+from catalog.suggest import CatalogSuggestIndex
+from config.settings import BaseAppSettings
+from notifications import EmailSenderInterface, EmailSender
+from security.claims import TokenVersionCache
+from security.interface import JWTAuthManagerInterface
+from security.passwords import AsyncPasswordHasher, PasswordHashPolicy
+from security.token_cache import VerifiedTokenCache
+from security.token_manager import JWTAuthManager
+from storages import S3StorageInterface, S3StorageClient
+
+if TYPE_CHECKING:
+    from catalog.columnar import ColumnarCatalog
+
+
+class AppContainer:
+    """
+    Process-wide services built from one settings instance, shared by every request.
+
+    The application lifespan puts a container on `app.state.container`, and the
+    dependencies in `config.dependencies` read their services from it instead of
+    building them per request. Each service is created on first use, so a
+    container built from settings that lack, say, the S3 configuration works as
+    long as storage is not used. Tests can replace `app.state.container` or
+    override `get_container`.
+    """
+
+    def __init__(self, settings: BaseAppSettings):
+        self.settings = settings
+
+    @cached_property
+    def token_cache(self) -> VerifiedTokenCache:
+        return VerifiedTokenCache(max_entries=self.settings.ACCESS_TOKEN_CACHE_MAX_ENTRIES)
+
+    @cached_property
+    def token_versions(self) -> TokenVersionCache:
+        return TokenVersionCache(
+            ttl_seconds=self.settings.ACCESS_TOKEN_VERSION_TTL_SECONDS,
+            max_entries=self.settings.ACCESS_TOKEN_CACHE_MAX_ENTRIES
+        )
+
+    @cached_property
+    def jwt_manager(self) -> JWTAuthManagerInterface:
+        return JWTAuthManager(
+            secret_key_access=self.settings.SECRET_KEY_ACCESS,
+            secret_key_refresh=self.settings.SECRET_KEY_REFRESH,
+            algorithm=self.settings.JWT_SIGNING_ALGORITHM,
+            token_cache=self.token_cache
+        )
+
+    @cached_property
+    def password_hasher(self) -> AsyncPasswordHasher:
+        settings = self.settings
+        policy = PasswordHashPolicy(settings.PASSWORD_HASH_SCHEME, settings.PASSWORD_HASH_COST or None)
+        return AsyncPasswordHasher(
+            max_workers=settings.PASSWORD_HASH_WORKERS or None,
+            max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY or None,
+            policy=policy
+        )
+
+    @cached_property
+    def email_sender(self) -> EmailSenderInterface:
+        settings = self.settings
+        return EmailSender(
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            email=settings.EMAIL_HOST_USER,
+            password=settings.EMAIL_HOST_PASSWORD,
+            use_tls=settings.EMAIL_USE_TLS,
+            template_dir=settings.PATH_TO_EMAIL_TEMPLATES_DIR,
+            activation_email_template_name=settings.ACTIVATION_EMAIL_TEMPLATE_NAME,
+            activation_complete_email_template_name=settings.ACTIVATION_COMPLETE_EMAIL_TEMPLATE_NAME,
+            password_email_template_name=settings.PASSWORD_RESET_TEMPLATE_NAME,
+            password_complete_email_template_name=settings.PASSWORD_RESET_COMPLETE_TEMPLATE_NAME
+        )
+
+    @cached_property
+    def s3_storage(self) -> S3StorageInterface:
+        return S3StorageClient(
+            endpoint_url=self.settings.S3_STORAGE_ENDPOINT,
+            access_key=self.settings.S3_STORAGE_ACCESS_KEY,
+            secret_key=self.settings.S3_STORAGE_SECRET_KEY,
+            bucket_name=self.settings.S3_BUCKET_NAME
+        )
+
+    @cached_property
+    def suggest_index(self) -> CatalogSuggestIndex:
+        return CatalogSuggestIndex()
+
+    @cached_property
+    def columnar_catalog(self) -> "ColumnarCatalog | None":
+        if not self.settings.CATALOG_COLUMNAR_ENGINE:
+            return None
+        from catalog.columnar import ColumnarCatalog
+
+        return ColumnarCatalog()
+
+    @cached_property
+    def catalog_cache(self) -> CacheBackendInterface:
+        if self.settings.CATALOG_CACHE_BACKEND == "redis":
+            return RedisCache(self.settings.CATALOG_CACHE_REDIS_URL)
+        return InMemoryCache(max_entries=self.settings.CATALOG_CACHE_MAX_ENTRIES)
+
+    @cached_property
+    def catalog_reader(self) -> ReadThroughCache:
+        from database.session_postgres import AsyncPostgresqlSessionLocal
+
+        return ReadThroughCache(
+            backend=self.catalog_cache,
+            session_factory=AsyncPostgresqlSessionLocal,
+            ttl_seconds=self.settings.CATALOG_CACHE_TTL_SECONDS,
+            stale_seconds=self.settings.CATALOG_CACHE_STALE_SECONDS
+        )
+
+    def close(self) -> None:
+        if "password_hasher" in self.__dict__:
+            self.password_hasher.shutdown()
@@ -1,21 +1,33 @@
 import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from fastapi import Depends
+from fastapi import Depends, Request
 
+from cache import CacheBackendInterface, ReadThroughCache
+from catalog.suggest import CatalogSuggestIndex
+from config.container import AppContainer
 from config.settings import  Settings, BaseAppSettings, TestingSettings
-from notifications import EmailSenderInterface, EmailSender
+from notifications import EmailSenderInterface
+from security.claims import TokenVersionCache
 from security.interface import JWTAuthManagerInterface
-from security.token_manager import JWTAuthManager
-from storages import S3StorageInterface, S3StorageClient
+from security.passwords import AsyncPasswordHasher
+from security.token_cache import VerifiedTokenCache
+from storages import S3StorageInterface
 
+if TYPE_CHECKING:
+    from catalog.columnar import ColumnarCatalog
 
+
+@lru_cache(maxsize=1)
 def get_settings() -> BaseAppSettings:
     """
     Retrieve the application settings based on the current environment.
 
     This function reads the 'ENVIRONMENT' environment variable (defaulting to 'developing' if not set)
     and returns a corresponding settings instance. If the environment is 'testing', it returns an instance
-    of TestingSettings; otherwise, it returns an instance of Settings.
+    of TestingSettings; otherwise, it returns an instance of Settings. The environment and `.env` are read
+    once per process; later calls return the same instance.
 
     Returns:
         BaseAppSettings: The settings instance appropriate for the current environment.
@@ -26,80 +38,209 @@ def get_settings() -> BaseAppSettings:
     return Settings()
 
 
-def get_jwt_auth_manager(settings: BaseAppSettings = Depends(get_settings)) -> JWTAuthManagerInterface:
+def get_container(request: Request) -> AppContainer:
+    """
+    Retrieve the application's service container.
+
+    The container is created by the application lifespan and stored on `app.state`; if the
+    application was started without its lifespan, one is built from `get_settings()` on first use.
+
+    Args:
+        request (Request): The current request, used to reach the application state.
+
+    Returns:
+        AppContainer: The process-wide services shared by every request.
+    """
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        container = request.app.state.container = AppContainer(get_settings())
+    return container
+
+
+def get_token_cache(container: AppContainer = Depends(get_container)) -> VerifiedTokenCache:
+    """
+    Retrieve the process-wide cache of verified access tokens.
+
+    Holds up to `ACCESS_TOKEN_CACHE_MAX_ENTRIES` tokens; setting it to zero disables caching.
+
+    Args:
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
+
+    Returns:
+        VerifiedTokenCache: The shared cache.
+    """
+    return container.token_cache
+
+
+def get_token_versions(container: AppContainer = Depends(get_container)) -> TokenVersionCache:
+    """
+    Retrieve the process-wide cache of users' current token versions.
+
+    A version read from the database is trusted for `ACCESS_TOKEN_VERSION_TTL_SECONDS`, so a token
+    revoked through another worker process stops being accepted here within that time.
+
+    Args:
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
+
+    Returns:
+        TokenVersionCache: The shared cache.
+    """
+    return container.token_versions
+
+
+def get_jwt_auth_manager(container: AppContainer = Depends(get_container)) -> JWTAuthManagerInterface:
     """
-    Create and return a JWT authentication manager instance.
+    Retrieve the JWT authentication manager.
 
-    This function uses the provided application settings to instantiate a JWTAuthManager, which implements
-    the JWTAuthManagerInterface. The manager is configured with secret keys for access and refresh tokens
-    as well as the JWT signing algorithm specified in the settings.
+    The manager is a JWTAuthManager, which implements the JWTAuthManagerInterface. It is configured with
+    secret keys for access and refresh tokens as well as the JWT signing algorithm specified in the settings,
+    and shares the process-wide cache of verified access tokens, so every auth dependency benefits from
+    tokens verified by the others. It is created once per process.
 
     Args:
-        settings (BaseAppSettings, optional): The application settings instance.
-        Defaults to the output of get_settings().
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
 
     Returns:
         JWTAuthManagerInterface: An instance of JWTAuthManager configured with
         the appropriate secret keys and algorithm.
     """
-    return JWTAuthManager(
-        secret_key_access=settings.SECRET_KEY_ACCESS,
-        secret_key_refresh=settings.SECRET_KEY_REFRESH,
-        algorithm=settings.JWT_SIGNING_ALGORITHM
-    )
+    return container.jwt_manager
+
+
+def get_password_hasher(container: AppContainer = Depends(get_container)) -> AsyncPasswordHasher:
+    """
+    Retrieve the process-wide password hasher.
+
+    Hashing runs in a pool of `PASSWORD_HASH_WORKERS` processes (when unset, the CPUs divided
+    by `WEB_CONCURRENCY`, the number of server worker processes),
+    with at most `PASSWORD_HASH_MAX_CONCURRENCY` calls handed to it at a time; callers
+    beyond that wait their turn without blocking the event loop. New hashes use
+    `PASSWORD_HASH_SCHEME` at `PASSWORD_HASH_COST`, checked against the scheme's cost limits.
+    When the cost is left at 0, the default, the application lifespan calibrates one against
+    `PASSWORD_HASH_TARGET_MS` at startup, once per host: the first worker stores it in
+    `PASSWORD_HASH_CALIBRATION_PATH` and the others reuse it. The calibrated cost follows the
+    hardware and may be below the scheme's default (bcrypt 14); stronger existing hashes are
+    kept, since only hashes below the current cost are rehashed.
+
+    Args:
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
+
+    Returns:
+        AsyncPasswordHasher: The shared hasher.
+    """
+    return container.password_hasher
 
 
 def get_accounts_email_notificator(
-    settings: BaseAppSettings = Depends(get_settings)
+    container: AppContainer = Depends(get_container)
 ) -> EmailSenderInterface:
     """
     Retrieve an instance of the EmailSenderInterface configured with the application settings.
 
-    This function creates an EmailSender using the provided settings, which include details such as the email host,
-    port, credentials, TLS usage, and the directory and filenames for email templates. This allows the application
-    to send various email notifications (e.g., activation, password reset) as required.
+    The EmailSender is created once per process from the settings, which include details such as the email
+    host, port, credentials, TLS usage, and the directory and filenames for email templates, so its Jinja
+    environment and loaded templates are reused. This allows the application to send various email
+    notifications (e.g., activation, password reset) as required.
 
     Args:
-        settings (BaseAppSettings, optional): The application settings,
-        provided via dependency injection from `get_settings`.
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
 
     Returns:
         EmailSenderInterface: An instance of EmailSender configured with the appropriate email settings.
     """
-    return EmailSender(
-        hostname=settings.EMAIL_HOST,
-        port=settings.EMAIL_PORT,
-        email=settings.EMAIL_HOST_USER,
-        password=settings.EMAIL_HOST_PASSWORD,
-        use_tls=settings.EMAIL_USE_TLS,
-        template_dir=settings.PATH_TO_EMAIL_TEMPLATES_DIR,
-        activation_email_template_name=settings.ACTIVATION_EMAIL_TEMPLATE_NAME,
-        activation_complete_email_template_name=settings.ACTIVATION_COMPLETE_EMAIL_TEMPLATE_NAME,
-        password_email_template_name=settings.PASSWORD_RESET_TEMPLATE_NAME,
-        password_complete_email_template_name=settings.PASSWORD_RESET_COMPLETE_TEMPLATE_NAME
-    )
+    return container.email_sender
 
 
 def get_s3_storage_client(
-    settings: BaseAppSettings = Depends(get_settings)
+    container: AppContainer = Depends(get_container)
 ) -> S3StorageInterface:
     """
     Retrieve an instance of the S3StorageInterface configured with the application settings.
 
-    This function instantiates an S3StorageClient using the provided settings, which include the S3 endpoint URL,
-    access credentials, and the bucket name. The returned client can be used to interact with an S3-compatible
-    storage service for file uploads and URL generation.
+    The S3StorageClient, and its aioboto3 session, is created once per process from the S3 endpoint URL,
+    access credentials, and the bucket name in the settings. It can be used to interact with an
+    S3-compatible storage service for file uploads and URL generation.
 
     Args:
-        settings (BaseAppSettings, optional): The application settings,
-        provided via dependency injection from `get_settings`.
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
 
     Returns:
         S3StorageInterface: An instance of S3StorageClient configured with the appropriate S3 storage settings.
     """
-    return S3StorageClient(
-        endpoint_url=settings.S3_STORAGE_ENDPOINT,
-        access_key=settings.S3_STORAGE_ACCESS_KEY,
-        secret_key=settings.S3_STORAGE_SECRET_KEY,
-        bucket_name=settings.S3_BUCKET_NAME
-    )
+    return container.s3_storage
+
+
+def get_suggest_index(container: AppContainer = Depends(get_container)) -> CatalogSuggestIndex:
+    """
+    Retrieve the process-wide catalog suggest index.
+
+    The index is built and kept fresh by the application lifespan, and the catalog
+    write routes patch it in place after their changes are committed.
+
+    Args:
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
+
+    Returns:
+        CatalogSuggestIndex: The in-memory prefix index over movies, stars, directors and genres.
+    """
+    return container.suggest_index
+
+
+def get_columnar_catalog(container: AppContainer = Depends(get_container)) -> "ColumnarCatalog | None":
+    """
+    Retrieve the process-wide columnar catalog engine, if it is enabled.
+
+    With `CATALOG_COLUMNAR_ENGINE` set, the engine is loaded and periodically reloaded by the
+    application lifespan and patched in place by the movie write routes.
+
+    Args:
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
+
+    Returns:
+        ColumnarCatalog | None: The in-memory engine, or None when catalog reads should go to SQL only.
+    """
+    return container.columnar_catalog
+
+
+def get_catalog_cache(container: AppContainer = Depends(get_container)) -> CacheBackendInterface:
+    """
+    Retrieve the process-wide response cache for catalog listings.
+
+    The backend is chosen by `CATALOG_CACHE_BACKEND`: "memory" keeps an LRU cache inside
+    each worker process, "redis" shares one cache between all workers through the server
+    at `CATALOG_CACHE_REDIS_URL`.
+
+    Args:
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
+
+    Returns:
+        CacheBackendInterface: The configured cache backend.
+    """
+    return container.catalog_cache
+
+
+def get_catalog_reader(container: AppContainer = Depends(get_container)) -> ReadThroughCache:
+    """
+    Retrieve the process-wide read-through cache used by the hot catalog read paths.
+
+    Concurrent misses for the same response are coalesced into one database query per worker.
+    Setting `CATALOG_CACHE_STALE_SECONDS` above zero enables stale-while-revalidate: an expired
+    response keeps being served for that long while a single background task reloads it.
+
+    Args:
+        container (AppContainer, optional): The application's service container,
+        provided via dependency injection from `get_container`.
+
+    Returns:
+        ReadThroughCache: The read-through cache bound to the catalog cache backend.
+    """
+    return container.catalog_reader
@@ -11,8 +11,18 @@ load_dotenv()
 class BaseAppSettings(BaseSettings):
     BASE_DIR: Path = Path(__file__).parent.parent
     PATH_TO_DB: str = str(BASE_DIR / "database" / "source" / "data.db")
+    PATH_TO_MOVIES_CSV: str = str(BASE_DIR / "database" / "seed_data" / "imdb_movies.csv")
 
     LOGIN_TIME_DAYS: int = 7
+    ACCESS_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    ACCESS_TOKEN_VERSION_TTL_SECONDS: int = 30
+
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 0
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    PASSWORD_HASH_COST: int = 0
+    PASSWORD_HASH_TARGET_MS: int = 250
+    PASSWORD_HASH_CALIBRATION_PATH: str = "/tmp/password_hash_policy.json"
 
     PATH_TO_EMAIL_TEMPLATES_DIR: str = str(BASE_DIR / "notifications" / "templates")
     ACTIVATION_EMAIL_TEMPLATE_NAME: str = "activation_request.html"
@@ -20,6 +30,19 @@ class BaseAppSettings(BaseSettings):
     PASSWORD_RESET_TEMPLATE_NAME: str = "password_reset_request.html"
     PASSWORD_RESET_COMPLETE_TEMPLATE_NAME: str = "password_reset_complete.html"
 
+    SUGGEST_INDEX_REFRESH_SECONDS: int = 300
+
+    CATALOG_CACHE_BACKEND: str = "memory"
+    CATALOG_CACHE_REDIS_URL: str = "redis://redis:6379/1"
+    CATALOG_CACHE_TTL_SECONDS: int = 60
+    CATALOG_CACHE_MAX_ENTRIES: int = 1024
+    CATALOG_CACHE_STALE_SECONDS: int = 0
+    CATALOG_HTTP_MAX_AGE_SECONDS: int = 5
+
+    CATALOG_COLUMNAR_ENGINE: bool = False
+    CATALOG_COLUMNAR_REFRESH_SECONDS: int = 600
+    CATALOG_COLUMNAR_SNAPSHOT_PATH: str = "/tmp/columnar_catalog.snapshot"
+
 
 class Settings(BaseAppSettings):
     """POSTGRES DATABASE"""
@@ -0,0 +1,33 @@
+"""comment thread indexes
+
+Revision ID: 2f6c8d91e4a5
+Revises: b81d4e6f0a37
+Create Date: 2026-10-16 14:38:29.610254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6c8d91e4a5'
+down_revision: Union[str, None] = 'b81d4e6f0a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_comments_movie_top_level', 'comments', ['movie_id', 'id'], unique=False,
+                    postgresql_where=sa.text('parent_id IS NULL'))
+    op.create_index('ix_comments_parent_id', 'comments', ['parent_id'], unique=False)
+    op.create_index('ix_comment_likes_comment_id', 'comment_likes', ['comment_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comment_likes_comment_id', table_name='comment_likes')
+    op.drop_index('ix_comments_parent_id', table_name='comments')
+    op.drop_index('ix_comments_movie_top_level', table_name='comments', postgresql_where=sa.text('parent_id IS NULL'))
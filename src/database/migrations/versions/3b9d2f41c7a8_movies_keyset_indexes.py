@@ -0,0 +1,33 @@
+"""movies keyset indexes
+
+Revision ID: 3b9d2f41c7a8
+Revises: 663f699fb9f5
+Create Date: 2026-10-16 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2f41c7a8'
+down_revision: Union[str, None] = '663f699fb9f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_movies_year_id', 'movies', ['year', 'id'], unique=False)
+    op.create_index('ix_movies_price_id', 'movies', ['price', 'id'], unique=False)
+    op.create_index('ix_movies_imdb_id', 'movies', ['imdb', 'id'], unique=False)
+    op.create_index('ix_movies_votes_id', 'movies', ['votes', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movies_votes_id', table_name='movies')
+    op.drop_index('ix_movies_imdb_id', table_name='movies')
+    op.drop_index('ix_movies_price_id', table_name='movies')
+    op.drop_index('ix_movies_year_id', table_name='movies')
@@ -0,0 +1,35 @@
+"""catalog versions
+
+Revision ID: 5a9e3f17c2b6
+Revises: e27a9c4b5d18
+Create Date: 2026-10-16 13:27:44.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9e3f17c2b6'
+down_revision: Union[str, None] = 'e27a9c4b5d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.create_table('catalog_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='1', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO catalog_versions (name, version) VALUES ('movies', 1), ('genres', 1)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalog_versions')
+    op.drop_column('movies', 'version')
@@ -0,0 +1,43 @@
+"""movie change feed
+
+Revision ID: 7d3a0c52e9b1
+Revises: 2f6c8d91e4a5
+Create Date: 2026-10-16 18:22:47.905163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3a0c52e9b1'
+down_revision: Union[str, None] = '2f6c8d91e4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'),
+                                      nullable=False))
+    op.create_table('movie_changes',
+    sa.Column('seq', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('tx_id', sa.BigInteger(), server_default=sa.text('pg_current_xact_id()::text::bigint'),
+              nullable=False),
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('change_type', sa.Enum('UPSERT', 'DELETE', name='moviechangetype'), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('seq')
+    )
+    op.create_index('ix_movie_changes_tx_id_seq', 'movie_changes', ['tx_id', 'seq'], unique=False)
+    op.execute("INSERT INTO movie_changes (movie_id, change_type) SELECT id, 'UPSERT' FROM movies ORDER BY id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_changes_tx_id_seq', table_name='movie_changes')
+    op.drop_table('movie_changes')
+    sa.Enum(name='moviechangetype').drop(op.get_bind(), checkfirst=True)
+    op.drop_column('movies', 'updated_at')
@@ -0,0 +1,43 @@
+"""movies search vector
+
+Revision ID: 8e1c5a07d2f4
+Revises: 3b9d2f41c7a8
+Create Date: 2026-10-16 11:03:17.554201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e1c5a07d2f4'
+down_revision: Union[str, None] = '3b9d2f41c7a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute("""
+        UPDATE movies SET search_vector =
+            setweight(to_tsvector('english'::regconfig, coalesce(movies.name, '')), 'A')
+            || setweight(to_tsvector('english'::regconfig, concat_ws(' ',
+                (SELECT string_agg(stars.name, ' ')
+                   FROM stars JOIN movies_stars ON movies_stars.star_id = stars.id
+                  WHERE movies_stars.movie_id = movies.id),
+                (SELECT string_agg(directors.name, ' ')
+                   FROM directors JOIN movie_directors ON movie_directors.director_id = directors.id
+                  WHERE movie_directors.movie_id = movies.id))), 'B')
+            || setweight(to_tsvector('english'::regconfig, coalesce(movies.description, '')), 'C')
+    """)
+    op.create_index('ix_movies_search_vector', 'movies', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movies_search_vector', table_name='movies', postgresql_using='gin')
+    op.drop_column('movies', 'search_vector')
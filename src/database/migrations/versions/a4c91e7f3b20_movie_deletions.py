@@ -0,0 +1,46 @@
+"""movie deletions
+
+Revision ID: a4c91e7f3b20
+Revises: 7d3a0c52e9b1
+Create Date: 2026-10-16 19:41:08.362514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c91e7f3b20'
+down_revision: Union[str, None] = '7d3a0c52e9b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('movie_deletions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('movie_name', sa.String(length=250), nullable=False),
+    sa.Column('requested_by_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='moviedeletionstatus'),
+              nullable=False),
+    sa.Column('stage', sa.String(length=32), nullable=True),
+    sa.Column('processed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by_id'], ['user_profiles.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_movie_deletions_movie_id', 'movie_deletions', ['movie_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_deletions_movie_id', table_name='movie_deletions')
+    op.drop_table('movie_deletions')
+    sa.Enum(name='moviedeletionstatus').drop(op.get_bind(), checkfirst=True)
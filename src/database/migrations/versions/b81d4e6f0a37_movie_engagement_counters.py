@@ -0,0 +1,43 @@
+"""movie engagement counters
+
+Revision ID: b81d4e6f0a37
+Revises: 5a9e3f17c2b6
+Create Date: 2026-10-16 14:05:12.447631
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d4e6f0a37'
+down_revision: Union[str, None] = '5a9e3f17c2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ('likes_count', 'dislikes_count', 'comments_count', 'favorites_count', 'ratings_count', 'ratings_sum')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for counter in COUNTERS:
+        op.add_column('movies', sa.Column(counter, sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE movies SET
+            likes_count = (SELECT count(*) FROM reactions
+                            WHERE reactions.movie_id = movies.id AND reactions.reaction_type = 'LIKE'),
+            dislikes_count = (SELECT count(*) FROM reactions
+                               WHERE reactions.movie_id = movies.id AND reactions.reaction_type = 'DISLIKE'),
+            comments_count = (SELECT count(*) FROM comments WHERE comments.movie_id = movies.id),
+            favorites_count = (SELECT count(*) FROM movie_favorites WHERE movie_favorites.movie_id = movies.id),
+            ratings_count = (SELECT count(*) FROM ratings WHERE ratings.movie_id = movies.id),
+            ratings_sum = (SELECT coalesce(sum(ratings.rating), 0) FROM ratings WHERE ratings.movie_id = movies.id)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for counter in reversed(COUNTERS):
+        op.drop_column('movies', counter)
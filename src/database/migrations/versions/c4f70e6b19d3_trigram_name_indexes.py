@@ -0,0 +1,35 @@
+"""trigram name indexes
+
+Revision ID: c4f70e6b19d3
+Revises: 8e1c5a07d2f4
+Create Date: 2026-10-16 11:48:52.091376
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f70e6b19d3'
+down_revision: Union[str, None] = '8e1c5a07d2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_movies_name_trgm', 'movies', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_stars_name_trgm', 'stars', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_directors_name_trgm', 'directors', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_directors_name_trgm', table_name='directors', postgresql_using='gin')
+    op.drop_index('ix_stars_name_trgm', table_name='stars', postgresql_using='gin')
+    op.drop_index('ix_movies_name_trgm', table_name='movies', postgresql_using='gin')
@@ -0,0 +1,28 @@
+"""user token version
+
+Revision ID: d5b28f4c7e19
+Revises: a4c91e7f3b20
+Create Date: 2026-10-16 21:07:33.518240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b28f4c7e19'
+down_revision: Union[str, None] = 'a4c91e7f3b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
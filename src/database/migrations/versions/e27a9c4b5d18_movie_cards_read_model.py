@@ -0,0 +1,80 @@
+"""movie cards read model
+
+Revision ID: e27a9c4b5d18
+Revises: c4f70e6b19d3
+Create Date: 2026-10-16 12:41:05.318724
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e27a9c4b5d18'
+down_revision: Union[str, None] = 'c4f70e6b19d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('movie_cards',
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('genre_names', postgresql.ARRAY(sa.String()), server_default='{}', nullable=False),
+    sa.Column('star_names', postgresql.ARRAY(sa.String()), server_default='{}', nullable=False),
+    sa.Column('director_names', postgresql.ARRAY(sa.String()), server_default='{}', nullable=False),
+    sa.Column('card', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('movie_id')
+    )
+    op.execute("""
+        INSERT INTO movie_cards (movie_id, genre_names, star_names, director_names, card)
+        SELECT movies.id,
+               coalesce((SELECT array_agg(genres.name ORDER BY genres.name)
+                           FROM genres JOIN movie_genres ON movie_genres.genre_id = genres.id
+                          WHERE movie_genres.movie_id = movies.id), '{}'::varchar[]),
+               coalesce((SELECT array_agg(stars.name ORDER BY stars.name)
+                           FROM stars JOIN movies_stars ON movies_stars.star_id = stars.id
+                          WHERE movies_stars.movie_id = movies.id), '{}'::varchar[]),
+               coalesce((SELECT array_agg(directors.name ORDER BY directors.name)
+                           FROM directors JOIN movie_directors ON movie_directors.director_id = directors.id
+                          WHERE movie_directors.movie_id = movies.id), '{}'::varchar[]),
+               jsonb_build_object(
+                   'id', movies.id, 'uuid', movies.uuid, 'name', movies.name, 'year', movies.year,
+                   'time', movies.time, 'imdb', movies.imdb, 'votes', movies.votes,
+                   'meta_score', movies.meta_score, 'gross', movies.gross, 'description', movies.description,
+                   'price', movies.price, 'available', movies.available,
+                   'certification_id', movies.certification_id,
+                   'genres', coalesce((SELECT jsonb_agg(jsonb_build_object('id', genres.id, 'name', genres.name)
+                                                        ORDER BY genres.name)
+                                         FROM genres JOIN movie_genres ON movie_genres.genre_id = genres.id
+                                        WHERE movie_genres.movie_id = movies.id), '[]'::jsonb),
+                   'stars', coalesce((SELECT jsonb_agg(jsonb_build_object('id', stars.id, 'name', stars.name)
+                                                       ORDER BY stars.name)
+                                        FROM stars JOIN movies_stars ON movies_stars.star_id = stars.id
+                                       WHERE movies_stars.movie_id = movies.id), '[]'::jsonb),
+                   'directors', coalesce((SELECT jsonb_agg(jsonb_build_object('id', directors.id,
+                                                                              'name', directors.name)
+                                                           ORDER BY directors.name)
+                                            FROM directors
+                                            JOIN movie_directors ON movie_directors.director_id = directors.id
+                                           WHERE movie_directors.movie_id = movies.id), '[]'::jsonb))
+          FROM movies
+    """)
+    op.create_index('ix_movie_cards_genre_names', 'movie_cards', ['genre_names'], unique=False,
+                    postgresql_using='gin')
+    op.create_index('ix_movie_cards_star_names', 'movie_cards', ['star_names'], unique=False,
+                    postgresql_using='gin')
+    op.create_index('ix_movie_cards_director_names', 'movie_cards', ['director_names'], unique=False,
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_cards_director_names', table_name='movie_cards', postgresql_using='gin')
+    op.drop_index('ix_movie_cards_star_names', table_name='movie_cards', postgresql_using='gin')
+    op.drop_index('ix_movie_cards_genre_names', table_name='movie_cards', postgresql_using='gin')
+    op.drop_table('movie_cards')
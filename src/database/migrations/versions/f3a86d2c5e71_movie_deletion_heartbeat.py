@@ -0,0 +1,29 @@
+"""movie deletion heartbeat
+
+Revision ID: f3a86d2c5e71
+Revises: d5b28f4c7e19
+Create Date: 2026-10-17 00:12:46.207391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a86d2c5e71'
+down_revision: Union[str, None] = 'd5b28f4c7e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movie_deletions', sa.Column('updated_at', sa.DateTime(timezone=True),
+                                               server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('movie_deletions', 'updated_at')
@@ -6,7 +6,7 @@ from sqlalchemy import (Integer, String, Enum, Boolean, func, DateTime, ForeignK
 from sqlalchemy.orm import mapped_column, Mapped, relationship, validates
 
 from database import Base, account_validators
-from security import verify_password, hash_password, generate_secure_token
+from security import verify_password, hash_password, generate_secure_token, AsyncPasswordHasher
 
 if TYPE_CHECKING:
     from database import (ReactionsModel, CommentsModel, MovieModel,
@@ -51,6 +51,8 @@ class UserModel(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+
     group_id: Mapped[int] = mapped_column(ForeignKey("user_groups.id", ondelete="CASCADE"), nullable=False)
     group: Mapped["UserGroupModel"] = relationship("UserGroupModel", back_populates="users")
 
@@ -121,6 +123,31 @@ class UserModel(Base):
         """
         return verify_password(raw_password, self._hashed_password)
 
+    async def set_password(self, raw_password: str, hasher: AsyncPasswordHasher) -> None:
+        """
+        Set the user's password like the `password` setter, hashing it off the event loop.
+        """
+        account_validators.validate_password_strength(raw_password)
+        self._hashed_password = await hasher.hash(raw_password)
+
+    async def check_password(self, raw_password: str, hasher: AsyncPasswordHasher) -> bool:
+        """
+        Verify the provided password like `verify_password`, off the event loop.
+        """
+        return await hasher.verify(raw_password, self._hashed_password)
+
+    def password_needs_rehash(self, hasher: AsyncPasswordHasher) -> bool:
+        """
+        Tell whether the stored hash predates the hasher's current scheme or cost.
+        """
+        return hasher.needs_update(self._hashed_password)
+
+    def revoke_tokens(self) -> None:
+        """
+        Invalidate every access token issued so far; they carry the previous `token_version`.
+        """
+        self.token_version += 1
+
     @validates("email")
     def validate_email(self, key, value):
         return account_validators.validate_email(value.lower())
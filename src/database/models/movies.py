@@ -1,12 +1,13 @@
 import enum
 from datetime import datetime
 
+from sqlalchemy.dialects.postgresql import TSVECTOR, JSONB, ARRAY
 from sqlalchemy.types import Uuid
 
 from typing import Optional, List, TYPE_CHECKING
 
 from sqlalchemy import (Integer, String, ForeignKey, types, Float, Text, DECIMAL, Table, Column,
-                        UniqueConstraint, Enum as SQLEnum, DateTime, func, Boolean)
+                        UniqueConstraint, Enum as SQLEnum, DateTime, func, Boolean, Index, BigInteger, text)
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from database import Base
@@ -20,6 +21,18 @@ class ReactionType(enum.Enum):
     DISLIKE = "dislike"
 
 
+class MovieChangeType(enum.Enum):
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class MovieDeletionStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 MovieStarsModel = Table(
     "movies_stars",
     Base.metadata,
@@ -52,6 +65,9 @@ MovieFavoritesModel = Table(
 
 class StarsModel(Base):
     __tablename__ = "stars"
+    __table_args__ = (
+        Index("ix_stars_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
@@ -74,6 +90,9 @@ class GenresModel(Base):
 
 class DirectorsModel(Base):
     __tablename__ = "directors"
+    __table_args__ = (
+        Index("ix_directors_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
@@ -141,6 +160,10 @@ class NotificationsModel(Base):
 
 class CommentsModel(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_movie_top_level", "movie_id", "id", postgresql_where=text("parent_id IS NULL")),
+        Index("ix_comments_parent_id", "parent_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     text: Mapped[str] = mapped_column(Text(), nullable=False)
@@ -169,11 +192,22 @@ class CommentLikesModel(Base):
     user_profile: Mapped["UserProfileModel"] = relationship("UserProfileModel", back_populates="comment_likes")
     comment: Mapped["CommentsModel"] = relationship("CommentsModel", back_populates="comment_likes")
 
-    __table_args__ = (UniqueConstraint('user_profile_id', 'comment_id', name='_user_profile_comment_uc'),)
+    __table_args__ = (
+        UniqueConstraint('user_profile_id', 'comment_id', name='_user_profile_comment_uc'),
+        Index("ix_comment_likes_comment_id", "comment_id"),
+    )
 
 
 class MovieModel(Base):
     __tablename__ = "movies"
+    __table_args__ = (
+        Index("ix_movies_year_id", "year", "id"),
+        Index("ix_movies_price_id", "price", "id"),
+        Index("ix_movies_imdb_id", "imdb", "id"),
+        Index("ix_movies_votes_id", "votes", "id"),
+        Index("ix_movies_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_movies_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, nullable=False)
     uuid: Mapped[Uuid] = mapped_column(types.UUID(as_uuid=True), unique=True, nullable=False)
@@ -190,6 +224,17 @@ class MovieModel(Base):
     certification: Mapped["CertificationsModel"] = relationship("CertificationsModel", back_populates="movies")
     ratings: Mapped[list["RatingsModel"]] = relationship("RatingsModel", back_populates="movie")
     available: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, nullable=True, deferred=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(),
+                                                 onupdate=func.now(), nullable=False)
+
+    likes_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    dislikes_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    comments_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    favorites_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    ratings_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    ratings_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     in_favorites: Mapped[list["UserProfileModel"]] = relationship(
         "UserProfileModel",
@@ -218,13 +263,100 @@ class MovieModel(Base):
     in_carts: Mapped[list["CartItemsModel"]] = relationship("CartItemsModel",
                                                             back_populates="movie")
 
+    @property
+    def rating_average(self) -> Optional[float]:
+        if not self.ratings_count:
+            return None
+        return round(self.ratings_sum / self.ratings_count, 2)
+
     def __repr__(self):
         return f"(Movie_id={self.id}, name={self.name}, year={self.year}, time={self.time})"
 
+
+class MovieCardModel(Base):
+    """
+    Denormalized catalog read model: one pre-rendered listing card per movie.
+
+    Rows are rebuilt by `catalog.cards.refresh_movie_cards` whenever a movie or
+    its genres, stars or directors change, and removed with the movie.
+    """
+    __tablename__ = "movie_cards"
+    __table_args__ = (
+        Index("ix_movie_cards_genre_names", "genre_names", postgresql_using="gin"),
+        Index("ix_movie_cards_star_names", "star_names", postgresql_using="gin"),
+        Index("ix_movie_cards_director_names", "director_names", postgresql_using="gin"),
+    )
+
+    movie_id: Mapped[int] = mapped_column(ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    genre_names: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False, server_default="{}")
+    star_names: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False, server_default="{}")
+    director_names: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False, server_default="{}")
+    card: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+
+class CatalogVersionModel(Base):
+    __tablename__ = "catalog_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=1, server_default="1")
+
+
+class MovieChangeModel(Base):
+    """
+    Append-only change log of the movie catalog, read by the incremental sync endpoint.
+
+    `tx_id` is the id of the writing transaction. Readers only consume changes of
+    transactions older than the oldest one still running, so a change can never
+    appear behind a cursor that was already handed out.
+    """
+    __tablename__ = "movie_changes"
+    __table_args__ = (
+        Index("ix_movie_changes_tx_id_seq", "tx_id", "seq"),
+    )
+
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    tx_id: Mapped[int] = mapped_column(BigInteger, nullable=False,
+                                       server_default=text("pg_current_xact_id()::text::bigint"))
+    movie_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    change_type: Mapped[MovieChangeType] = mapped_column(SQLEnum(MovieChangeType), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class MovieDeletionModel(Base):
+    """
+    Progress of a movie deletion, run in the background by the `delete_movie` worker task.
+
+    `movie_id` is kept without a foreign key so the record outlives the movie.
+    `processed` counts the dependent rows (cart items, order items, comments and
+    ratings) handled so far out of the `total` found when the job started.
+    `updated_at` moves on every step the job commits, so a running deletion
+    whose job died is recognised by it going stale.
+    """
+    __tablename__ = "movie_deletions"
+    __table_args__ = (
+        Index("ix_movie_deletions_movie_id", "movie_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    movie_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    movie_name: Mapped[str] = mapped_column(String(250), nullable=False)
+    requested_by_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user_profiles.id", ondelete="SET NULL"),
+                                                           nullable=True)
+    status: Mapped[MovieDeletionStatus] = mapped_column(SQLEnum(MovieDeletionStatus), nullable=False,
+                                                        default=MovieDeletionStatus.PENDING)
+    stage: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(),
+                                                 onupdate=func.now(), nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
 PurchasedMoviesModel = Table(
     "purchased_movies",
     Base.metadata,
     Column("movie_id", Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
     Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False))
-
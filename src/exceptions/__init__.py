@@ -2,3 +2,4 @@ from exceptions.security import TokenExpiredError, InvalidTokenError
 from exceptions.email import BaseEmailError
 from exceptions.storage import S3ConnectionError, S3FileUploadError
 from exceptions.security import BaseSecurityError
+from exceptions.catalog import BaseCatalogError, InvalidCursorError, MovieImportError
@@ -0,0 +1,28 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from schemas.movies import MovieImportResultSchema
+
+
+class BaseCatalogError(Exception):
+    """Base class for all catalog-related errors."""
+
+    def __init__(self, message=None):
+        if message is None:
+            message = "A catalog error occurred."
+        super().__init__(message)
+
+
+class InvalidCursorError(BaseCatalogError):
+    """Raised when a pagination cursor cannot be decoded or does not match the requested ordering."""
+
+    def __init__(self, message="Invalid cursor."):
+        super().__init__(message)
+
+
+class MovieImportError(BaseCatalogError):
+    """Raised when a bulk import batch fails; `result` counts only the batches committed before it."""
+
+    def __init__(self, result: "MovieImportResultSchema", message="The movie import stopped on a failed batch."):
+        super().__init__(message)
+        self.result = result
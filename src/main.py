@@ -1,9 +1,50 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from catalog.columnar import keep_columnar_catalog_fresh
+from catalog.suggest import keep_suggest_index_fresh
+from config import get_settings, AppContainer
+from database.session_postgres import AsyncPostgresqlSessionLocal
 from routes import (accounts_router, movies_router, shopping_cart_router,
                     orders_router, payments_router, webhooks_router)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = getattr(app.state, "container", None)
+    if container is None:
+        container = app.state.container = AppContainer(get_settings())
+    settings = container.settings
+    if not settings.PASSWORD_HASH_COST:
+        policy = await container.password_hasher.calibrate(
+            settings.PASSWORD_HASH_SCHEME,
+            settings.PASSWORD_HASH_TARGET_MS / 1000,
+            settings.PASSWORD_HASH_CALIBRATION_PATH or None
+        )
+        logging.info(f"Hashing new passwords with {policy.scheme} at cost {policy.cost}")
+    background_tasks = [asyncio.create_task(keep_suggest_index_fresh(
+        container.suggest_index,
+        AsyncPostgresqlSessionLocal,
+        settings.SUGGEST_INDEX_REFRESH_SECONDS
+    ))]
+    columnar_catalog = container.columnar_catalog
+    if columnar_catalog is not None:
+        background_tasks.append(asyncio.create_task(keep_columnar_catalog_fresh(
+            columnar_catalog,
+            AsyncPostgresqlSessionLocal,
+            settings.CATALOG_COLUMNAR_REFRESH_SECONDS,
+            settings.CATALOG_COLUMNAR_SNAPSHOT_PATH or None
+        )))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    container.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 api_prefix = "/api"
 
@@ -1,13 +1,15 @@
+import logging
 from datetime import datetime, timezone
 from typing import cast
 
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy import select, delete
+from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException
+from sqlalchemy import select, delete, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from config import get_jwt_auth_manager, get_settings, BaseAppSettings, get_accounts_email_notificator
+from config import (get_jwt_auth_manager, get_settings, BaseAppSettings, get_accounts_email_notificator,
+                    get_password_hasher, get_token_versions)
 from database import (
     get_db,
     UserModel,
@@ -18,6 +20,7 @@ from database import (
     RefreshTokenModel, CartsModel
 )
 from database.models.accounts import UserProfileModel
+from database.session_postgres import AsyncPostgresqlSessionLocal
 from exceptions import BaseSecurityError
 from notifications import EmailSenderInterface
 from schemas import (
@@ -32,12 +35,51 @@ from schemas import (
     TokenRefreshRequestSchema,
     TokenRefreshResponseSchema
 )
+from security.claims import AccessClaims, TokenVersionCache
 from security.interface import JWTAuthManagerInterface
+from security.passwords import AsyncPasswordHasher
 from workers.tasks import remove_activation_token_after_delay
 
 router = APIRouter()
 
 
+def access_claims(user: UserModel) -> AccessClaims:
+    """
+    Build the access token claims of a user loaded with its profile and group.
+    """
+    return AccessClaims(
+        user_id=user.id,
+        profile_id=user.profile.id if user.profile else None,
+        group=user.group.name.value,
+        version=user.token_version
+    )
+
+
+async def upgrade_password_hash(
+        password_hasher: AsyncPasswordHasher,
+        user_id: int,
+        raw_password: str,
+        outdated_hash: str
+) -> None:
+    """
+    Rehash a password under the current policy after a successful login.
+
+    The new hash only replaces the one the login was verified against, so a
+    password changed in the meantime is never overwritten.
+    """
+    try:
+        new_hash = await password_hasher.hash(raw_password)
+        async with AsyncPostgresqlSessionLocal() as session:
+            await session.execute(
+                update(UserModel)
+                .where(UserModel.id == user_id, UserModel._hashed_password == outdated_hash)
+                .values({UserModel._hashed_password: new_hash})
+            )
+            await session.commit()
+    except Exception as error:
+        logging.error(f"Failed to upgrade the password hash of user {user_id}: {error}")
+
+
 @router.post(
     "/register/",
     response_model=UserRegistrationResponseSchema,
@@ -71,6 +113,7 @@ async def register_user(
         user_data: UserRegistrationRequestSchema,
         db: AsyncSession = Depends(get_db),
         email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
+        password_hasher: AsyncPasswordHasher = Depends(get_password_hasher),
 ) -> UserRegistrationResponseSchema:
     """
     Endpoint for user registration.
@@ -83,6 +126,7 @@ async def register_user(
         user_data (UserRegistrationRequestSchema): The registration details including email and password.
         db (AsyncSession): The asynchronous database session.
         email_sender (EmailSenderInterface): The asynchronous email sender.
+        password_hasher (AsyncPasswordHasher): The process pool the password is hashed in.
 
     Returns:
         UserRegistrationResponseSchema: The newly created user's details.
@@ -110,17 +154,15 @@ async def register_user(
             detail="Default user group not found."
         )
 
+    new_user = UserModel(email=str(user_data.email), group_id=user_group.id)
+    await new_user.set_password(user_data.password, password_hasher)
+
     try:
         cart = CartsModel()
         db.add(cart)
         await db.flush()
 
-        new_user = UserModel.create(
-            email=str(user_data.email),
-            raw_password=user_data.password,
-            group_id=user_group.id,
-            cart_id=cart.id,
-        )
+        new_user.cart_id = cart.id
         db.add(new_user)
         await db.flush()
 
@@ -355,19 +397,23 @@ async def request_password_reset_token(
 async def reset_password(
         data: PasswordResetCompleteRequestSchema,
         db: AsyncSession = Depends(get_db),
-        email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator)
+        email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
+        password_hasher: AsyncPasswordHasher = Depends(get_password_hasher),
+        token_versions: TokenVersionCache = Depends(get_token_versions)
 ) -> MessageResponseSchema:
     """
     Endpoint for resetting a user's password.
 
     Validates the token and updates the user's password if the token is valid and not expired.
-    Deletes the token after a successful password reset.
+    Deletes the token after a successful password reset and revokes the access tokens issued so far.
 
     Args:
         data (PasswordResetCompleteRequestSchema): The request data containing the user's email,
          token, and new password.
         db (AsyncSession): The asynchronous database session.
         email_sender (EmailSenderInterface): The asynchronous email sender.
+        password_hasher (AsyncPasswordHasher): The process pool the new password is hashed in.
+        token_versions (TokenVersionCache): The cached token versions, updated with the revocation.
 
     Returns:
         MessageResponseSchema: A response message indicating successful password reset.
@@ -409,9 +455,11 @@ async def reset_password(
         )
 
     try:
-        user.password = data.password
+        await user.set_password(data.password, password_hasher)
+        user.revoke_tokens()
         await db.run_sync(lambda s: s.delete(token_record))
         await db.commit()
+        token_versions.invalidate(user.id)
     except SQLAlchemyError:
         await db.rollback()
         raise HTTPException(
@@ -470,21 +518,27 @@ async def reset_password(
 )
 async def login_user(
         login_data: UserLoginRequestSchema,
+        background_tasks: BackgroundTasks,
         db: AsyncSession = Depends(get_db),
         settings: BaseAppSettings = Depends(get_settings),
         jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+        password_hasher: AsyncPasswordHasher = Depends(get_password_hasher),
 ) -> UserLoginResponseSchema:
     """
     Endpoint for user login.
 
     Authenticates a user using their email and password.
     If authentication is successful, creates a new refresh token and returns both access and refresh tokens.
+    The access token carries the user's profile id, group and token version as signed claims.
+    A password hash made with an outdated scheme or cost is replaced after the response is sent.
 
     Args:
         login_data (UserLoginRequestSchema): The login credentials.
+        background_tasks (BackgroundTasks): Runs the rehash of an outdated password hash after the response.
         db (AsyncSession): The asynchronous database session.
         settings (BaseAppSettings): The application settings.
         jwt_manager (JWTAuthManagerInterface): The JWT authentication manager.
+        password_hasher (AsyncPasswordHasher): The process pool the password is verified in.
 
     Returns:
         UserLoginResponseSchema: A response containing the access and refresh tokens.
@@ -495,11 +549,15 @@ async def login_user(
             - 403 Forbidden if the user account is not activated.
             - 500 Internal Server Error if an error occurs during token creation.
     """
-    stmt = select(UserModel).filter_by(email=login_data.email)
+    stmt = (
+        select(UserModel)
+        .options(joinedload(UserModel.profile), joinedload(UserModel.group))
+        .filter_by(email=login_data.email)
+    )
     result = await db.execute(stmt)
     user = result.scalars().first()
 
-    if not user or not user.verify_password(login_data.password):
+    if not user or not await user.check_password(login_data.password, password_hasher):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password.",
@@ -511,6 +569,11 @@ async def login_user(
             detail="User account is not activated.",
         )
 
+    if user.password_needs_rehash(password_hasher):
+        background_tasks.add_task(
+            upgrade_password_hash, password_hasher, user.id, login_data.password, user._hashed_password
+        )
+
     jwt_refresh_token = jwt_manager.create_refresh_token({"user_id": user.id})
 
     try:
@@ -529,7 +592,7 @@ async def login_user(
             detail="An error occurred while processing the request.",
         )
 
-    jwt_access_token = jwt_manager.create_access_token({"user_id": user.id})
+    jwt_access_token = jwt_manager.create_access_token(access_claims(user).to_payload())
     return UserLoginResponseSchema(
         access_token=jwt_access_token,
         refresh_token=jwt_refresh_token,
@@ -584,7 +647,8 @@ async def refresh_access_token(
     Endpoint to refresh an access token.
 
     Validates the provided refresh token, extracts the user ID from it, and issues
-    a new access token. If the token is invalid or expired, an error is returned.
+    a new access token with the user's current claims. If the token is invalid or expired,
+    an error is returned.
 
     Args:
         token_data (TokenRefreshRequestSchema): Contains the refresh token.
@@ -618,7 +682,11 @@ async def refresh_access_token(
             detail="Refresh token not found.",
         )
 
-    stmt = select(UserModel).filter_by(id=user_id)
+    stmt = (
+        select(UserModel)
+        .options(joinedload(UserModel.profile), joinedload(UserModel.group))
+        .filter_by(id=user_id)
+    )
     result = await db.execute(stmt)
     user = result.scalars().first()
     if not user:
@@ -627,6 +695,6 @@ async def refresh_access_token(
             detail="User not found.",
         )
 
-    new_access_token = jwt_manager.create_access_token({"user_id": user_id})
+    new_access_token = jwt_manager.create_access_token(access_claims(user).to_payload())
 
     return TokenRefreshResponseSchema(access_token=new_access_token)
@@ -1,216 +1,247 @@
+import csv
+import io
+import json
+import logging
+import tempfile
 import uuid
-from enum import Enum
-from typing import Optional, List
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi_pagination import add_pagination, Page
-from sqlalchemy import select, or_, insert, delete, func
-from sqlalchemy.exc import IntegrityError
+from dataclasses import asdict
+from typing import Literal, Optional, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi_pagination import add_pagination, Page, Params, create_page
+from kombu.exceptions import OperationalError as BrokerError
+from pydantic import TypeAdapter
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm import selectinload
 from starlette import status
 
-from database.models.accounts import UserProfileModel, UserModel
+from database.models.accounts import UserProfileModel
 from database.models.movies import MovieModel, StarsModel, GenresModel, DirectorsModel, CommentsModel, ReactionsModel, \
     ReactionType, MovieFavoritesModel, RatingsModel, MovieGenresModel, CommentLikesModel, NotificationsModel, \
-    MovieStarsModel, MovieDirectorsModel
+    MovieStarsModel, MovieDirectorsModel, MovieCardModel, MovieChangeType, MovieDeletionModel, MovieDeletionStatus
 from schemas import MovieListSchema
-from database import get_db, CartItemsModel, UserGroupModel, UserGroupEnum, OrderItemsModel, OrdersModel
+from database.session_postgres import AsyncPostgresqlSessionLocal
+from database import get_db
 from schemas.movies import (MovieDetailSchema, MovieCreateSchema, MovieCommentCreateResponseSchema,
                             MovieCommentCreateRequestSchema, MovieUserReactionResponseSchema, MovieCreateResponseSchema,
                             MovieAddFavoriteResponseSchema, MovieRatingRequestSchema, MovieRatingResponseSchema,
                             GenresMoviesCountSchema, CommentLikeResponseSchema, MovieCommentRepliesResponseSchema,
                             GenresDetailSchema, GenresSchema, StarSchema, StarsDetailSchema, DirectorsDetailSchema,
-                            DirectorSchema)
-from security.auth import get_current_user
-
-
-async def current_user_profile(
-        current_user_id: int = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
-):
-    user_profile = await db.execute(select(UserProfileModel).where(UserProfileModel.user_id == current_user_id))
-    existing_user_profile = user_profile.scalar_one_or_none()
-    if not existing_user_profile:
+                            DirectorSchema, MovieCursorPageSchema, CatalogSuggestionsSchema,
+                            MovieCommentsPageSchema, MovieFacetsSchema, MovieImportResultSchema,
+                            MovieChangesPageSchema, MovieDeletionSchema)
+from security.auth import get_current_claims
+from security.claims import AccessClaims
+from catalog.bulk_import import import_movies, read_movie_rows, DEFAULT_IMPORT_BATCH_SIZE
+from catalog.cards import CARD_RELATIONS
+from catalog.columnar import ColumnarCatalog
+from catalog.export import stream_movie_export, EXPORT_FORMATS
+from catalog.lookups import resolve_names, insert_names
+from catalog.suggest import CatalogSuggestIndex
+from config import (get_suggest_index, get_catalog_cache, get_catalog_reader, get_settings, BaseAppSettings,
+                    get_columnar_catalog)
+from cache import (CacheBackendInterface, ReadThroughCache, cache_key, CATALOG_TAG, make_etag, is_not_modified,
+                   cache_headers, accepts_encoding)
+from catalog import (MovieFilterParams, apply_movie_filters, configure_movie_filters, paginate_catalog,
+                     paginate_movies_by_cursor, refresh_search_documents,
+                     refresh_movie_cards, movie_cards_select, MOVIES_VERSION, GENRES_VERSION, get_catalog_version,
+                     bump_catalog_versions, get_movie_version, REACTION_COUNT_COLUMNS, adjust_engagement,
+                     paginate_comment_threads, load_movie_cards, count_movie_facets,
+                     movie_facets_schema, record_movie_changes, read_movie_changes, request_movie_deletion,
+                     is_stale_deletion)
+from exceptions import InvalidCursorError, MovieImportError
+from workers.tasks import process_movie_deletion
+
+
+def current_user_profile(claims: AccessClaims = Depends(get_current_claims)) -> AccessClaims:
+    if claims.profile_id is None:
         raise HTTPException(status_code=404, detail="User not found.")
-    return existing_user_profile
+    return claims
 
 
-async def current_moderator_profile(
-        current_user_id: int = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
-):
-    user_profile = await db.execute(select(UserProfileModel)
-    .join(UserModel)
-    .where(
-        UserProfileModel.user_id == current_user_id,
-        or_(UserModel.group_id == 2,
-            UserModel.group_id == 3)))
-    existing_user_profile = user_profile.scalar_one_or_none()
-    if not existing_user_profile:
+def current_moderator_profile(claims: AccessClaims = Depends(current_user_profile)) -> AccessClaims:
+    if not claims.is_moderator:
         raise HTTPException(status_code=404, detail="User not found.")
-    return existing_user_profile
+    return claims
 
 
 router = APIRouter()
 
-
-class MovieSortField(str, Enum):
-    YEAR_ASC = "year_asc"
-    YEAR_DESC = "year_desc"
-    PRICE_ASC = "price_asc"
-    PRICE_DESC = "price_desc"
-    IMDB_ASC = "imdb_asc"
-    IMDB_DESC = "imdb_desc"
-    POPULARITY_ASC = "popularity_asc"
-    POPULARITY_DESC = "popularity_desc"
+GENRES_COUNT_ADAPTER = TypeAdapter(List[GenresMoviesCountSchema])
 
 
 @router.get("/movies/", response_model=Page[MovieListSchema])
 async def get_movies(
+        request: Request,
         db: AsyncSession = Depends(get_db),
-        year: Optional[int] = Query(None, description="Filter by exact release year"),
-        year_min: Optional[int] = Query(None, description="Minimum release year"),
-        year_max: Optional[int] = Query(None, description="Maximum release year"),
-        imdb_min: Optional[float] = Query(None, ge=0, le=10, description="Minimum IMDb rating (0-10)"),
-        imdb_max: Optional[float] = Query(None, ge=0, le=10, description="Maximum IMDb rating (0-10)"),
-        price_min: Optional[float] = Query(None, ge=0, description="Minimum price"),
-        price_max: Optional[float] = Query(None, ge=0, description="Maximum price"),
-        genres: Optional[List[str]] = Query(None, description="Filter by genre names"),
-        directors: Optional[List[str]] = Query(None, description="Filter by director names"),
-        actors: Optional[List[str]] = Query(None, description="Filter by actor names"),
-        search: Optional[str] = Query(None, description="Search in title, description, actors or directors"),
-        sort_by: Optional[MovieSortField] = Query(
-            MovieSortField.YEAR_DESC,
-            description="Sort by field and direction"
-        ),
+        filters: MovieFilterParams = Depends(),
+        params: Params = Depends(),
+        catalog_reader: ReadThroughCache = Depends(get_catalog_reader),
+        columnar_catalog: Optional[ColumnarCatalog] = Depends(get_columnar_catalog),
+        settings: BaseAppSettings = Depends(get_settings),
 ):
-    query = select(MovieModel).options(
-        joinedload(MovieModel.genres),
-        joinedload(MovieModel.directors),
-        joinedload(MovieModel.stars)
-    )
+    async def load_page(db: AsyncSession) -> bytes:
+        if columnar_catalog is not None and columnar_catalog.supports(filters, version):
+            raw_params = params.to_raw_params()
+            total, movie_ids = columnar_catalog.page(filters, raw_params.offset, raw_params.limit)
+            page = create_page(await load_movie_cards(db, movie_ids), total=total, params=params)
+            return page.model_dump_json().encode()
 
-    if year:
-        query = query.where(MovieModel.year == year)
+        page = await paginate_catalog(db, filters, params)
+        return page.model_dump_json().encode()
 
-    if year_min:
-        query = query.where(MovieModel.year >= year_min)
+    version = await get_catalog_version(db, MOVIES_VERSION)
+    key = cache_key("movies", {**asdict(filters), "page": params.page, "size": params.size, "version": version})
+    headers = cache_headers(make_etag(key), settings.CATALOG_HTTP_MAX_AGE_SECONDS)
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    if year_max:
-        query = query.where(MovieModel.year <= year_max)
+    content = await catalog_reader.get_or_load(key, load_page, tags=[CATALOG_TAG])
+    return Response(content=content, media_type="application/json", headers=headers)
 
-    if imdb_min:
-        query = query.where(MovieModel.imdb >= imdb_min)
 
-    if imdb_max:
-        query = query.where(MovieModel.imdb <= imdb_max)
+@router.get("/movies/facets/", response_model=MovieFacetsSchema)
+async def get_movie_facets(
+        request: Request,
+        db: AsyncSession = Depends(get_db),
+        filters: MovieFilterParams = Depends(),
+        limit: int = Query(20, ge=1, le=100, description="Maximum genre and director values to return"),
+        catalog_reader: ReadThroughCache = Depends(get_catalog_reader),
+        columnar_catalog: Optional[ColumnarCatalog] = Depends(get_columnar_catalog),
+        settings: BaseAppSettings = Depends(get_settings),
+):
+    async def load_facets(db: AsyncSession) -> bytes:
+        if columnar_catalog is not None and columnar_catalog.supports(filters, version):
+            counts = columnar_catalog.facet_counts(filters)
+        else:
+            counts = await count_movie_facets(db, filters)
+        return movie_facets_schema(counts, limit).model_dump_json().encode()
+
+    version = await get_catalog_version(db, MOVIES_VERSION)
+    key = cache_key("movie_facets", {**asdict(filters), "limit": limit, "version": version})
+    headers = cache_headers(make_etag(key), settings.CATALOG_HTTP_MAX_AGE_SECONDS)
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    content = await catalog_reader.get_or_load(key, load_facets, tags=[CATALOG_TAG])
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@router.get("/movies/export/")
+async def export_movies(
+        request: Request,
+        filters: MovieFilterParams = Depends(),
+        file_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="Export format"),
+):
+    compress = accepts_encoding(request, "gzip")
+    headers = {
+        "Content-Disposition": f'attachment; filename="movies.{file_format}"',
+        "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding",
+        "X-Accel-Buffering": "no",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_movie_export(AsyncPostgresqlSessionLocal, filters, file_format, compress),
+        media_type=EXPORT_FORMATS[file_format],
+        headers=headers,
+    )
 
-    if price_min:
-        query = query.where(MovieModel.price >= price_min)
 
-    if price_max:
-        query = query.where(MovieModel.price <= price_max)
+@router.get("/movies/cursor/", response_model=MovieCursorPageSchema)
+async def get_movies_by_cursor(
+        db: AsyncSession = Depends(get_db),
+        filters: MovieFilterParams = Depends(),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+        size: int = Query(50, ge=1, le=100, description="Page size"),
+):
+    query = apply_movie_filters(movie_cards_select(), filters)
 
-    if genres:
-        query = query.where(GenresModel.name.in_(genres))
+    await configure_movie_filters(db, filters)
+    try:
+        return await paginate_movies_by_cursor(db, query, filters, cursor, size)
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
 
-    if directors:
-        query = query.where(DirectorsModel.name.in_(directors))
 
-    if actors:
-        query = query.where(StarsModel.name.in_(actors))
+@router.get("/suggest/", response_model=CatalogSuggestionsSchema)
+async def suggest(
+        q: str = Query(min_length=1, max_length=100, description="Prefix of a title, actor, director or genre"),
+        limit: int = Query(10, ge=1, le=50, description="Maximum suggestions per kind"),
+        suggest_index: CatalogSuggestIndex = Depends(get_suggest_index),
+):
+    suggestions = suggest_index.suggest(q, limit)
+    return CatalogSuggestionsSchema(**{
+        kind: [{"id": entity_id, "name": name} for entity_id, name in items]
+        for kind, items in suggestions.items()
+    })
 
-    if search:
-        search = f"%{search}%"
-        query = query.where(
-            or_(
-                MovieModel.name.ilike(search),
-                MovieModel.description.ilike(search),
-                DirectorsModel.name.ilike(search),
-                StarsModel.name.ilike(search)
-            )
-        )
 
-    if sort_by == MovieSortField.YEAR_ASC:
-        query = query.order_by(MovieModel.year.asc())
-    elif sort_by == MovieSortField.YEAR_DESC:
-        query = query.order_by(MovieModel.year.desc())
-    elif sort_by == MovieSortField.PRICE_ASC:
-        query = query.order_by(MovieModel.price.asc())
-    elif sort_by == MovieSortField.PRICE_DESC:
-        query = query.order_by(MovieModel.price.desc())
-    elif sort_by == MovieSortField.IMDB_ASC:
-        query = query.order_by(MovieModel.imdb.asc())
-    elif sort_by == MovieSortField.IMDB_DESC:
-        query = query.order_by(MovieModel.imdb.desc())
-    elif sort_by == MovieSortField.POPULARITY_ASC:
-        query = query.order_by(MovieModel.votes.asc())
-    elif sort_by == MovieSortField.POPULARITY_DESC:
-        query = query.order_by(MovieModel.votes.desc())
-
-    return await paginate(db, query)
+@router.get("/changes/", response_model=MovieChangesPageSchema)
+async def get_movie_changes(
+        db: AsyncSession = Depends(get_db),
+        since: Optional[str] = Query(None, description="Cursor from a previous response; omit to start from scratch"),
+        size: int = Query(500, ge=1, le=5000, description="Maximum number of changes"),
+):
+    try:
+        return await read_movie_changes(db, since, size)
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
 
 
 @router.get("/movies/detail/{movie_id}/", response_model=MovieDetailSchema)
-async def get_movie_detail(movie_id: int, db: AsyncSession = Depends(get_db)):
-    stmt = await db.execute(select(MovieModel)
-                            .where(MovieModel.id == movie_id)
-                            .options(selectinload(MovieModel.genres),
-                                     selectinload(MovieModel.stars),
-                                     selectinload(MovieModel.directors),
-                                     selectinload(MovieModel.certification),
-                                     selectinload(MovieModel.reactions),
-                                     selectinload(MovieModel.comments)))
-    result = stmt.scalars().first()
+async def get_movie_detail(
+        movie_id: int,
+        request: Request,
+        db: AsyncSession = Depends(get_db),
+        catalog_reader: ReadThroughCache = Depends(get_catalog_reader),
+        settings: BaseAppSettings = Depends(get_settings),
+):
+    async def load_detail(db: AsyncSession) -> bytes:
+        stmt = await db.execute(select(MovieModel)
+                                .where(MovieModel.id == movie_id)
+                                .options(selectinload(MovieModel.genres),
+                                         selectinload(MovieModel.stars),
+                                         selectinload(MovieModel.directors),
+                                         selectinload(MovieModel.certification)))
+        result = stmt.scalars().first()
+
+        if not result:
+            raise HTTPException(status_code=404, detail="Movie not found.")
+
+        return MovieDetailSchema.model_validate(result).model_dump_json().encode()
 
-    if not result:
+    version = await get_movie_version(db, movie_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Movie not found.")
 
-    return MovieDetailSchema.model_validate(result)
+    headers = cache_headers(make_etag("movie", movie_id, version), settings.CATALOG_HTTP_MAX_AGE_SECONDS)
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    key = cache_key("movie_detail", {"movie_id": movie_id, "version": version})
+    content = await catalog_reader.get_or_load(key, load_detail, tags=[CATALOG_TAG])
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @router.post("/movies/add/", response_model=MovieCreateResponseSchema, status_code=status.HTTP_201_CREATED)
 async def add_movie(movie: MovieCreateSchema,
-                    _moderator_profile: UserProfileModel = Depends(current_moderator_profile),
-                    db: AsyncSession = Depends(get_db)):
+                    _moderator_profile: AccessClaims = Depends(current_moderator_profile),
+                    db: AsyncSession = Depends(get_db),
+                    suggest_index: CatalogSuggestIndex = Depends(get_suggest_index),
+                    cache: CacheBackendInterface = Depends(get_catalog_cache),
+                    columnar_catalog: Optional[ColumnarCatalog] = Depends(get_columnar_catalog)):
     stmt = await db.execute(select(MovieModel).where(MovieModel.name == movie.name))
     result = stmt.scalars().first()
     if result:
         raise HTTPException(status_code=400, detail="Movie already exists.")
 
     try:
-        stars = []
-        for star_name in movie.stars:
-            stmt = await db.execute(select(StarsModel).where(StarsModel.name == star_name))
-            star = stmt.scalars().first()
-            if not star:
-                star = StarsModel(name=star_name)
-                db.add(star)
-                await db.flush()
-            stars.append(star)
-
-        genres = []
-        for genre_name in movie.genres:
-            stmt = await db.execute(select(GenresModel).where(GenresModel.name == genre_name))
-            genre = stmt.scalars().first()
-            if not genre:
-                genre = GenresModel(name=genre_name)
-                db.add(genre)
-                await db.flush()
-            genres.append(genre)
-
-        directors = []
-        for director_name in movie.directors:
-            stmt = await db.execute(select(DirectorsModel).where(DirectorsModel.name == director_name))
-            director = stmt.scalars().first()
-            if not director:
-                director = DirectorsModel(name=director_name)
-                db.add(director)
-                await db.flush()
-            directors.append(director)
-
         movie_db = MovieModel(
             uuid=uuid.uuid4(),
             name=movie.name,
@@ -223,13 +254,26 @@ async def add_movie(movie: MovieCreateSchema,
             description=movie.description,
             price=movie.price,
             certification_id=movie.certification_id,
-            stars=stars,
-            genres=genres,
-            directors=directors,
         )
         db.add(movie_db)
+        await db.flush()
+        for relation, (model, association, foreign_key) in CARD_RELATIONS.items():
+            ids = await resolve_names(db, model, getattr(movie, relation))
+            if ids:
+                await db.execute(insert(association).values([
+                    {"movie_id": movie_db.id, foreign_key: related_id} for related_id in ids.values()
+                ]))
+        await refresh_search_documents(db, [movie_db.id])
+        await refresh_movie_cards(db, [movie_db.id])
+        await record_movie_changes(db, [movie_db.id], MovieChangeType.UPSERT)
+        await bump_catalog_versions(db, MOVIES_VERSION, GENRES_VERSION)
+        version = await get_catalog_version(db, MOVIES_VERSION)
         await db.commit()
         await db.refresh(movie_db, ["stars", "genres", "directors"])
+        suggest_index.upsert_movie(movie_db)
+        if columnar_catalog is not None:
+            columnar_catalog.upsert_movie(movie_db, version)
+        await cache.invalidate_tags(CATALOG_TAG)
 
         return MovieCreateResponseSchema.model_validate(movie_db)
 
@@ -238,104 +282,127 @@ async def add_movie(movie: MovieCreateSchema,
         raise HTTPException(status_code=400, detail="Invalid input data.")
 
 
-@router.delete("/movie/{movie_id}/delete/", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_movie(
-        movie_id: int,
-        moderator_profile: UserProfileModel = Depends(current_moderator_profile),
-        db: AsyncSession = Depends(get_db)
+@router.post("/movies/import/", response_model=MovieImportResultSchema)
+async def import_movies_file(
+        request: Request,
+        file_format: Optional[Literal["csv", "ndjson"]] = Query(
+            None,
+            alias="format",
+            description="Body format; taken from the Content-Type header when omitted"
+        ),
+        batch_size: int = Query(DEFAULT_IMPORT_BATCH_SIZE, ge=1, le=50000, description="Movies per transaction"),
+        _moderator_profile: AccessClaims = Depends(current_moderator_profile),
+        db: AsyncSession = Depends(get_db),
+        cache: CacheBackendInterface = Depends(get_catalog_cache),
 ):
-    try:
-        movie = await db.get(MovieModel, movie_id)
-        if not movie:
-            raise HTTPException(status_code=404, detail="Movie not found.")
-
-        count_in_carts = await db.execute(
-            select(func.count()).where(CartItemsModel.movie_id == movie.id)
-        )
-        count_in_carts = count_in_carts.scalar()
-
-        if count_in_carts > 0:
-            moderators = await db.execute(
-                select(UserModel).options(
-                    selectinload(UserModel.profile))
-                .join(UserGroupModel)
-                .where(UserGroupModel.name == UserGroupEnum.moderator)
+    if file_format is None:
+        content_type = request.headers.get("content-type", "")
+        file_format = "ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv"
+
+    with tempfile.TemporaryFile() as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        try:
+            for _ in read_movie_rows(text, file_format):
+                pass
+            text.seek(0)
+            result = await import_movies(db, read_movie_rows(text, file_format), batch_size,
+                                         lambda progress: logging.info(f"Movie import progress: {progress}"))
+        except (UnicodeDecodeError, csv.Error, json.JSONDecodeError) as error:
+            raise HTTPException(status_code=400, detail=f"Malformed import file: {error}")
+        except MovieImportError as error:
+            if error.result.imported:
+                await cache.invalidate_tags(CATALOG_TAG)
+            invalid_data = isinstance(error.__cause__, IntegrityError)
+            raise HTTPException(
+                status_code=400 if invalid_data else 500,
+                detail={
+                    "message": "Invalid input data." if invalid_data else str(error),
+                    "committed": error.result.model_dump(),
+                },
             )
-            moderators = moderators.scalars().all()
-
-            message = (f"{moderator_profile.first_name} {moderator_profile.last_name} delete "
-                       f"movie {movie.name}. Movie exists in {count_in_carts} carts.")
-            notifications_data = [{
-                "user_profile_id": moderator.profile.id,
-                "movie_id": movie.id,
-                "message": message,
-                "movie_title": movie.name
-            } for moderator in moderators]
-
-            if notifications_data:
-                await db.execute(insert(NotificationsModel).values(notifications_data))
-
-        await db.execute(delete(CartItemsModel).where(CartItemsModel.movie_id == movie.id))
-
-        orders_with_film = await db.execute(
-            select(OrderItemsModel).options(selectinload(OrderItemsModel.order))
-            .where(OrderItemsModel.movie_id == movie.id))
-        orders_with_film = orders_with_film.scalars().all()
-        orders_id = [order_item.order_id for order_item in orders_with_film]
-
-        users_in_order = [order_item.order.user_id for order_item in orders_with_film]
-        message = (f"Movie {movie.name} has been deleted from our site. "
-                   f"Film was excluded from your order and recalculated the amount order.")
-        notifications_data = [{
-            "user_id": user_id,
-            "message": message,
-            "movie_title": movie.name,
-            "movie_id": movie.id,
-        } for user_id in users_in_order]
-
-        if notifications_data:
-            await db.execute(insert(NotificationsModel).values(notifications_data))
-
-        await db.execute(delete(CommentsModel).where(CommentsModel.movie_id == movie.id))
-        await db.execute(delete(RatingsModel).where(RatingsModel.movie_id == movie.id))
-        await db.delete(movie)
-        await db.flush()
+        finally:
+            text.detach()
 
-        orders = await db.execute(
-            select(OrdersModel)
-            .options(selectinload(OrdersModel.items))
-            .where(OrdersModel.id.in_(orders_id))
-        )
-        orders = orders.scalars().all()
+    if result.imported:
+        await cache.invalidate_tags(CATALOG_TAG)
+    return result
+
+
+@router.delete("/movie/{movie_id}/delete/", response_model=MovieDeletionSchema,
+               status_code=status.HTTP_202_ACCEPTED)
+async def delete_movie(
+        movie_id: int,
+        moderator_profile: AccessClaims = Depends(current_moderator_profile),
+        db: AsyncSession = Depends(get_db),
+        suggest_index: CatalogSuggestIndex = Depends(get_suggest_index),
+        cache: CacheBackendInterface = Depends(get_catalog_cache),
+        columnar_catalog: Optional[ColumnarCatalog] = Depends(get_columnar_catalog)
+):
+    movie = await db.get(MovieModel, movie_id)
+    if not movie:
+        raise HTTPException(status_code=404, detail="Movie not found.")
 
-        for order in orders:
-            order.total_amount = sum(item.price_at_order for item in order.items)
+    try:
+        deletion, created = await request_movie_deletion(db, movie, moderator_profile.profile_id)
+        version = await get_catalog_version(db, MOVIES_VERSION)
         await db.commit()
-    except Exception as e:
+    except SQLAlchemyError as e:
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+    if created:
+        suggest_index.remove("movies", movie_id)
+        if columnar_catalog is not None:
+            columnar_catalog.remove_movie(movie_id, version)
+        await cache.invalidate_tags(CATALOG_TAG)
+    if deletion.status == MovieDeletionStatus.PENDING or is_stale_deletion(deletion):
+        try:
+            process_movie_deletion.delay(deletion.id)
+        except BrokerError as error:
+            logging.error(f"Failed to enqueue movie deletion {deletion.id}, the requeue job will retry it: {error}")
+    return MovieDeletionSchema.model_validate(deletion)
+
+
+@router.get("/movies/deletions/{deletion_id}/", response_model=MovieDeletionSchema)
+async def get_movie_deletion(
+        deletion_id: int,
+        _moderator_profile: AccessClaims = Depends(current_moderator_profile),
+        db: AsyncSession = Depends(get_db)
+):
+    deletion = await db.get(MovieDeletionModel, deletion_id)
+    if not deletion:
+        raise HTTPException(status_code=404, detail="Movie deletion not found.")
+    return MovieDeletionSchema.model_validate(deletion)
+
 
 @router.post("/genres/add/", response_model=GenresDetailSchema, status_code=status.HTTP_201_CREATED)
 async def create_genre(
         genre: GenresSchema,
-        _moderator_profile: UserProfileModel = Depends(current_moderator_profile),
-        db: AsyncSession = Depends(get_db)
+        _moderator_profile: AccessClaims = Depends(current_moderator_profile),
+        db: AsyncSession = Depends(get_db),
+        suggest_index: CatalogSuggestIndex = Depends(get_suggest_index),
+        cache: CacheBackendInterface = Depends(get_catalog_cache)
 ):
-    existing_genre = await db.execute(select(GenresModel).where(GenresModel.name == genre.name))
-    existing_genre = existing_genre.scalar_one_or_none()
-    if existing_genre:
+    created = await insert_names(db, GenresModel, [genre.name])
+    if not created:
         raise HTTPException(status_code=400, detail="Genre already exists.")
-    new_genre = GenresModel(name=genre.name)
-    db.add(new_genre)
+    await bump_catalog_versions(db, GENRES_VERSION)
     await db.commit()
-    return GenresDetailSchema.model_validate(new_genre)
+    suggest_index.upsert("genres", created[genre.name], genre.name)
+    await cache.invalidate_tags(CATALOG_TAG)
+    return GenresDetailSchema.model_validate({"id": created[genre.name], "name": genre.name})
 
 
 @router.delete("/genres/{genre_id}/delete/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_genre(
         genre_id: int,
-        _moderator_profile: UserProfileModel = Depends(current_moderator_profile),
-        db: AsyncSession = Depends(get_db)
+        _moderator_profile: AccessClaims = Depends(current_moderator_profile),
+        db: AsyncSession = Depends(get_db),
+        suggest_index: CatalogSuggestIndex = Depends(get_suggest_index),
+        cache: CacheBackendInterface = Depends(get_catalog_cache)
 ):
     genre = await db.get(GenresModel, genre_id)
     if not genre:
@@ -346,31 +413,37 @@ async def delete_genre(
         raise HTTPException(status_code=400, detail="The current genre corresponds to one or more movies")
 
     await db.delete(genre)
+    await bump_catalog_versions(db, GENRES_VERSION)
     await db.commit()
+    suggest_index.remove("genres", genre_id)
+    await cache.invalidate_tags(CATALOG_TAG)
     return
 
 
 @router.post("/stars/create/", response_model=StarsDetailSchema, status_code=status.HTTP_201_CREATED)
 async def create_star(
         star: StarSchema,
-        _moderator_profile: UserProfileModel = Depends(current_moderator_profile),
-        db: AsyncSession = Depends(get_db)
+        _moderator_profile: AccessClaims = Depends(current_moderator_profile),
+        db: AsyncSession = Depends(get_db),
+        suggest_index: CatalogSuggestIndex = Depends(get_suggest_index),
+        cache: CacheBackendInterface = Depends(get_catalog_cache)
 ):
-    existing_star = await db.execute(select(StarsModel).where(StarsModel.name == star.name))
-    existing_star = existing_star.scalar_one_or_none()
-    if existing_star:
+    created = await insert_names(db, StarsModel, [star.name])
+    if not created:
         raise HTTPException(status_code=400, detail="Star already exists.")
-    star = StarsModel(name=star.name)
-    db.add(star)
     await db.commit()
-    return StarsDetailSchema.model_validate(star)
+    suggest_index.upsert("stars", created[star.name], star.name)
+    await cache.invalidate_tags(CATALOG_TAG)
+    return StarsDetailSchema.model_validate({"id": created[star.name], "name": star.name})
 
 
 @router.delete("/stars/{star_id}/delete/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_star(
         star_id: int,
-        _moderator_profile: UserProfileModel = Depends(current_moderator_profile),
-        db: AsyncSession = Depends(get_db)
+        _moderator_profile: AccessClaims = Depends(current_moderator_profile),
+        db: AsyncSession = Depends(get_db),
+        suggest_index: CatalogSuggestIndex = Depends(get_suggest_index),
+        cache: CacheBackendInterface = Depends(get_catalog_cache)
 ):
     star = await db.get(StarsModel, star_id)
     if not star:
@@ -382,30 +455,35 @@ async def delete_star(
 
     await db.delete(star)
     await db.commit()
+    suggest_index.remove("stars", star_id)
+    await cache.invalidate_tags(CATALOG_TAG)
     return
 
 
 @router.post("/directors/create/", response_model=DirectorsDetailSchema, status_code=status.HTTP_201_CREATED)
 async def create_director(
         director: DirectorSchema,
-        _moderator_profile: UserProfileModel = Depends(current_moderator_profile),
-        db: AsyncSession = Depends(get_db)
+        _moderator_profile: AccessClaims = Depends(current_moderator_profile),
+        db: AsyncSession = Depends(get_db),
+        suggest_index: CatalogSuggestIndex = Depends(get_suggest_index),
+        cache: CacheBackendInterface = Depends(get_catalog_cache)
 ):
-    existing_director = await db.execute(select(DirectorsModel).where(DirectorsModel.name == director.name))
-    existing_director = existing_director.scalar_one_or_none()
-    if existing_director:
+    created = await insert_names(db, DirectorsModel, [director.name])
+    if not created:
         raise HTTPException(status_code=400, detail="Director already exists.")
-    director = DirectorsModel(name=director.name)
-    db.add(director)
     await db.commit()
-    return DirectorsDetailSchema.model_validate(director)
+    suggest_index.upsert("directors", created[director.name], director.name)
+    await cache.invalidate_tags(CATALOG_TAG)
+    return DirectorsDetailSchema.model_validate({"id": created[director.name], "name": director.name})
 
 
 @router.delete("/directors/{director_id}/delete/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_director(
         director_id: int,
-        _moderator_profile: UserProfileModel = Depends(current_moderator_profile),
-        db: AsyncSession = Depends(get_db)
+        _moderator_profile: AccessClaims = Depends(current_moderator_profile),
+        db: AsyncSession = Depends(get_db),
+        suggest_index: CatalogSuggestIndex = Depends(get_suggest_index),
+        cache: CacheBackendInterface = Depends(get_catalog_cache)
 ):
     director = await db.get(DirectorsModel, director_id)
     if not director:
@@ -418,6 +496,8 @@ async def delete_director(
         raise HTTPException(status_code=400, detail="The current star corresponds to one or more movies")
     await db.delete(director)
     await db.commit()
+    suggest_index.remove("directors", director_id)
+    await cache.invalidate_tags(CATALOG_TAG)
     return
 
 
@@ -427,7 +507,7 @@ async def create_comment(
         movie_id: int,
         comment: MovieCommentCreateRequestSchema,
         db: AsyncSession = Depends(get_db),
-        user_profile: UserProfileModel = Depends(current_user_profile)
+        user_profile: AccessClaims = Depends(current_user_profile)
 ):
     movie = await db.get(MovieModel, movie_id)
     if not movie:
@@ -435,34 +515,54 @@ async def create_comment(
 
     comment = CommentsModel(
         text=comment.text,
-        user_profile_id=user_profile.id,
+        user_profile_id=user_profile.profile_id,
         movie_id=movie.id,
     )
     db.add(comment)
+    await adjust_engagement(db, movie.id, comments_count=1)
     await db.commit()
     await db.refresh(comment)
 
     return MovieCommentCreateResponseSchema.model_validate(comment)
 
 
+@router.get("/movies/{movie_id}/comments/", response_model=MovieCommentsPageSchema)
+async def get_movie_comments(
+        movie_id: int,
+        db: AsyncSession = Depends(get_db),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+        size: int = Query(20, ge=1, le=100, description="Top-level comments per page"),
+        depth: int = Query(2, ge=0, le=5, description="Levels of replies to expand under each comment"),
+):
+    movie = await db.get(MovieModel, movie_id)
+    if not movie:
+        raise HTTPException(status_code=404, detail="Movie not found.")
+
+    try:
+        return await paginate_comment_threads(db, movie_id, cursor, size, depth)
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
 @router.delete("/movies/{movie_id}/{comment_id}/delete/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_comment(
         movie_id: int,
         comment_id: int,
         db: AsyncSession = Depends(get_db),
-        user_profile: UserProfileModel = Depends(current_user_profile)
+        user_profile: AccessClaims = Depends(current_user_profile)
 ):
     movie = await db.get(MovieModel, movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found.")
 
     stmt_comment = await db.execute(select(CommentsModel).where(CommentsModel.id == comment_id,
-                                                                CommentsModel.user_profile_id == user_profile.id))
+                                                                CommentsModel.user_profile_id == user_profile.profile_id))
     existing_comment = stmt_comment.scalars().first()
     if not existing_comment:
         raise HTTPException(status_code=404, detail="Comment not found.")
 
     await db.delete(existing_comment)
+    await adjust_engagement(db, existing_comment.movie_id, comments_count=-1)
     await db.commit()
     return
 
@@ -473,7 +573,7 @@ async def delete_comment(
 async def create_replies(
         parent_comment_id: int,
         comment_data: MovieCommentCreateRequestSchema,
-        user_profile: UserProfileModel = Depends(current_user_profile),
+        user_profile: AccessClaims = Depends(current_user_profile),
         db: AsyncSession = Depends(get_db)
 ):
     parent_comment = await db.get(CommentsModel, parent_comment_id)
@@ -482,16 +582,18 @@ async def create_replies(
 
     reply_comment = CommentsModel(
         text=comment_data.text,
-        user_profile_id=user_profile.id,
+        user_profile_id=user_profile.profile_id,
         movie_id=parent_comment.movie_id,
         parent_id=parent_comment_id
     )
     db.add(reply_comment)
+    await adjust_engagement(db, parent_comment.movie_id, comments_count=1)
 
-    if user_profile.id != parent_comment.user_profile_id:
+    if user_profile.profile_id != parent_comment.user_profile_id:
+        author = await db.get(UserProfileModel, user_profile.profile_id)
         notification = NotificationsModel(
-            user_profile_id=user_profile.id,
-            message=f"User {user_profile.first_name} {user_profile.last_name} answer on your comment.",
+            user_profile_id=user_profile.profile_id,
+            message=f"User {author.first_name} {author.last_name} answer on your comment.",
             comment_id=parent_comment_id,
         )
         db.add(notification)
@@ -506,7 +608,7 @@ async def create_replies(
              status_code=status.HTTP_201_CREATED)
 async def like_comment(
         comment_id: int,
-        user_profile: UserProfileModel = Depends(current_user_profile),
+        user_profile: AccessClaims = Depends(current_user_profile),
         db: AsyncSession = Depends(get_db)):
     existing_comment = await db.get(CommentsModel, comment_id)
     if not existing_comment:
@@ -515,21 +617,22 @@ async def like_comment(
     existing_like_comment = await db.execute(
         select(CommentLikesModel)
         .where(CommentLikesModel.comment_id == comment_id,
-               CommentLikesModel.user_profile_id == user_profile.id))
+               CommentLikesModel.user_profile_id == user_profile.profile_id))
     existing_like_comment = existing_like_comment.scalar_one_or_none()
     if existing_like_comment:
         raise HTTPException(status_code=409, detail="You have already liked this comment.")
 
     record_like = CommentLikesModel(
         comment_id=comment_id,
-        user_profile_id=user_profile.id
+        user_profile_id=user_profile.profile_id
     )
     db.add(record_like)
 
-    if user_profile.id != existing_comment.user_profile_id:
+    if user_profile.profile_id != existing_comment.user_profile_id:
+        author = await db.get(UserProfileModel, user_profile.profile_id)
         notification = NotificationsModel(
-            user_profile_id=user_profile.id,
-            message=f"User {user_profile.first_name} {user_profile.last_name} liked your comment.",
+            user_profile_id=user_profile.profile_id,
+            message=f"User {author.first_name} {author.last_name} liked your comment.",
             comment_id=comment_id)
         db.add(notification)
     await db.commit()
@@ -540,12 +643,12 @@ async def like_comment(
 
 @router.delete("/comments/{comment_id}/delete_like/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_like_on_comment(comment_id: int,
-                                 user_profile: UserProfileModel = Depends(current_user_profile),
+                                 user_profile: AccessClaims = Depends(current_user_profile),
                                  db: AsyncSession = Depends(get_db)):
     existing_comment = await db.execute(
         select(CommentLikesModel)
         .where(CommentLikesModel.comment_id == comment_id,
-               CommentLikesModel.user_profile_id == user_profile.id))
+               CommentLikesModel.user_profile_id == user_profile.profile_id))
     existing_comment = existing_comment.scalar_one_or_none()
     if not existing_comment:
         raise HTTPException(status_code=404, detail="Comment not found.")
@@ -560,14 +663,14 @@ async def delete_like_on_comment(comment_id: int,
              status_code=status.HTTP_201_CREATED)
 async def like_movie(
         movie_id: int,
-        user_profile: UserProfileModel = Depends(current_user_profile),
+        user_profile: AccessClaims = Depends(current_user_profile),
         db: AsyncSession = Depends(get_db)):
     movie = await db.get(MovieModel, movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found.")
 
     stmt_reaction = await db.execute(select(ReactionsModel)
-                                     .where(ReactionsModel.user_profile_id == user_profile.id,
+                                     .where(ReactionsModel.user_profile_id == user_profile.profile_id,
                                             ReactionsModel.movie_id == movie.id))
     existing_reaction = stmt_reaction.scalars().first()
 
@@ -577,6 +680,7 @@ async def like_movie(
 
         elif existing_reaction.reaction_type == ReactionType.DISLIKE:
             existing_reaction.reaction_type = ReactionType.LIKE
+            await adjust_engagement(db, movie.id, likes_count=1, dislikes_count=-1)
             await db.commit()
             await db.refresh(existing_reaction)
             return MovieUserReactionResponseSchema(message="Movie liked successfully")
@@ -584,11 +688,12 @@ async def like_movie(
 
     else:
         like = ReactionsModel(
-            user_profile_id=user_profile.id,
+            user_profile_id=user_profile.profile_id,
             movie_id=movie.id,
             reaction_type=ReactionType.LIKE
         )
         db.add(like)
+        await adjust_engagement(db, movie.id, likes_count=1)
         await db.commit()
         await db.refresh(like)
 
@@ -599,14 +704,14 @@ async def like_movie(
              response_model=MovieUserReactionResponseSchema,
              status_code=status.HTTP_201_CREATED)
 async def dislike_movie(movie_id: int,
-                        user_profile: UserProfileModel = Depends(current_user_profile),
+                        user_profile: AccessClaims = Depends(current_user_profile),
                         db: AsyncSession = Depends(get_db)):
     movie = await db.get(MovieModel, movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found.")
 
     stmt_reaction = await db.execute(select(ReactionsModel)
-                                     .where(ReactionsModel.user_profile_id == user_profile.id,
+                                     .where(ReactionsModel.user_profile_id == user_profile.profile_id,
                                             ReactionsModel.movie_id == movie.id))
     existing_reaction = stmt_reaction.scalars().first()
 
@@ -616,17 +721,19 @@ async def dislike_movie(movie_id: int,
 
         elif existing_reaction.reaction_type == ReactionType.LIKE:
             existing_reaction.reaction_type = ReactionType.DISLIKE
+            await adjust_engagement(db, movie.id, likes_count=-1, dislikes_count=1)
             await db.commit()
             await db.refresh(existing_reaction)
             return MovieUserReactionResponseSchema(message="Movie disliked successfully")
 
     else:
         dislike = ReactionsModel(
-            user_profile_id=user_profile.id,
+            user_profile_id=user_profile.profile_id,
             movie_id=movie.id,
             reaction_type=ReactionType.DISLIKE
         )
         db.add(dislike)
+        await adjust_engagement(db, movie.id, dislikes_count=1)
         await db.commit()
         await db.refresh(dislike)
 
@@ -635,20 +742,21 @@ async def dislike_movie(movie_id: int,
 
 @router.delete("/movies/{movie_id}/delete_reaction/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_reaction(movie_id: int,
-                          user_profile: UserProfileModel = Depends(current_user_profile),
+                          user_profile: AccessClaims = Depends(current_user_profile),
                           db: AsyncSession = Depends(get_db)):
     movie = await db.get(MovieModel, movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found.")
 
     stmt_reaction = await db.execute(select(ReactionsModel)
-                                     .where(ReactionsModel.user_profile_id == user_profile.id,
+                                     .where(ReactionsModel.user_profile_id == user_profile.profile_id,
                                             ReactionsModel.movie_id == movie.id))
     existing_reaction = stmt_reaction.scalars().first()
     if not existing_reaction:
         raise HTTPException(status_code=404, detail="Reaction not found.")
 
     await db.delete(existing_reaction)
+    await adjust_engagement(db, movie.id, **{REACTION_COUNT_COLUMNS[existing_reaction.reaction_type]: -1})
     await db.commit()
     return
 
@@ -658,14 +766,14 @@ async def delete_reaction(movie_id: int,
              status_code=status.HTTP_201_CREATED)
 async def add_to_favorite(
         movie_id: int,
-        user_profile: UserProfileModel = Depends(current_user_profile),
+        user_profile: AccessClaims = Depends(current_user_profile),
         db: AsyncSession = Depends(get_db)
 ):
     stmt_existing_record = await db.execute(
         select(MovieFavoritesModel)
         .where(
             MovieFavoritesModel.c.movie_id == movie_id,
-            MovieFavoritesModel.c.user_profile_id == user_profile.id
+            MovieFavoritesModel.c.user_profile_id == user_profile.profile_id
         ))
     existing_record = stmt_existing_record.scalars().all()
     if existing_record:
@@ -674,8 +782,9 @@ async def add_to_favorite(
     await db.execute(
         insert(MovieFavoritesModel)
         .values(movie_id=movie_id,
-                user_profile_id=user_profile.id)
+                user_profile_id=user_profile.profile_id)
     )
+    await adjust_engagement(db, movie_id, favorites_count=1)
     await db.commit()
 
     return "Successfully added to favorite movies."
@@ -684,26 +793,27 @@ async def add_to_favorite(
 @router.delete("/movies/{movie_id}/delete_favorite/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_from_favorite(
         movie_id: int,
-        user_profile: UserProfileModel = Depends(current_user_profile),
+        user_profile: AccessClaims = Depends(current_user_profile),
         db: AsyncSession = Depends(get_db)
 ):
     stmt_existing_record = await db.execute(
         select(MovieFavoritesModel)
         .where(
             MovieFavoritesModel.c.movie_id == movie_id,
-            MovieFavoritesModel.c.user_profile_id == user_profile.id
+            MovieFavoritesModel.c.user_profile_id == user_profile.profile_id
         ))
     existing_record = stmt_existing_record.scalars().all()
     if not existing_record:
         raise HTTPException(status_code=400, detail="Movie not in your favorite movies.")
 
-    await db.execute(
+    result = await db.execute(
         delete(MovieFavoritesModel)
         .where(
             MovieFavoritesModel.c.movie_id == movie_id,
-            MovieFavoritesModel.c.user_profile_id == user_profile.id
+            MovieFavoritesModel.c.user_profile_id == user_profile.profile_id
         )
     )
+    await adjust_engagement(db, movie_id, favorites_count=-result.rowcount)
     await db.commit()
     return
 
@@ -711,131 +821,60 @@ async def delete_from_favorite(
 @router.get("/movies/favourites/", response_model=Page[MovieListSchema])
 async def get_favourite_movies(
         db: AsyncSession = Depends(get_db),
-        user_profile: UserProfileModel = Depends(current_user_profile),
-        year: Optional[int] = Query(None, description="Filter by exact release year"),
-        year_min: Optional[int] = Query(None, description="Minimum release year"),
-        year_max: Optional[int] = Query(None, description="Maximum release year"),
-        imdb_min: Optional[float] = Query(None, ge=0, le=10, description="Minimum IMDb rating (0-10)"),
-        imdb_max: Optional[float] = Query(None, ge=0, le=10, description="Maximum IMDb rating (0-10)"),
-        price_min: Optional[float] = Query(None, ge=0, description="Minimum price"),
-        price_max: Optional[float] = Query(None, ge=0, description="Maximum price"),
-        genres: Optional[List[str]] = Query(None, description="Filter by genre names"),
-        directors: Optional[List[str]] = Query(None, description="Filter by director names"),
-        actors: Optional[List[str]] = Query(None, description="Filter by actor names"),
-        search: Optional[str] = Query(None, description="Search in title, description, actors or directors"),
-        sort_by: Optional[MovieSortField] = Query(
-            MovieSortField.YEAR_DESC,
-            description="Sort by field and direction"
-        ),
+        user_profile: AccessClaims = Depends(current_user_profile),
+        filters: MovieFilterParams = Depends(),
+        params: Params = Depends(),
 ):
-    query = (select(MovieModel).join(
-        MovieFavoritesModel,
-        MovieFavoritesModel.c.movie_id == MovieModel.id
-    ).where(
-        MovieFavoritesModel.c.user_profile_id == user_profile.id
-    )
-    .options(
-        joinedload(MovieModel.genres),
-        joinedload(MovieModel.directors),
-        joinedload(MovieModel.stars)
-    ))
-
-    if year:
-        query = query.where(MovieModel.year == year)
-
-    if year_min:
-        query = query.where(MovieModel.year >= year_min)
-
-    if year_max:
-        query = query.where(MovieModel.year <= year_max)
-
-    if imdb_min:
-        query = query.where(MovieModel.imdb >= imdb_min)
-
-    if imdb_max:
-        query = query.where(MovieModel.imdb <= imdb_max)
-
-    if price_min:
-        query = query.where(MovieModel.price >= price_min)
+    return await paginate_catalog(db, filters, params, user_profile_id=user_profile.profile_id)
 
-    if price_max:
-        query = query.where(MovieModel.price <= price_max)
 
-    if genres:
-        query = query.where(GenresModel.name.in_(genres))
-
-    if directors:
-        query = query.where(DirectorsModel.name.in_(directors))
-
-    if actors:
-        query = query.where(StarsModel.name.in_(actors))
-
-    if search:
-        search = f"%{search}%"
-        query = query.where(
-            or_(
-                MovieModel.name.ilike(search),
-                MovieModel.description.ilike(search),
-                DirectorsModel.name.ilike(search),
-                StarsModel.name.ilike(search)
+@router.get("/genres/", response_model=List[GenresMoviesCountSchema], status_code=status.HTTP_200_OK)
+async def get_genres(
+        request: Request,
+        db: AsyncSession = Depends(get_db),
+        catalog_reader: ReadThroughCache = Depends(get_catalog_reader),
+        settings: BaseAppSettings = Depends(get_settings),
+):
+    async def load_genres(db: AsyncSession) -> bytes:
+        query = (
+            select(
+                GenresModel.id,
+                GenresModel.name,
+                func.count(MovieGenresModel.c.movie_id).label('movies_count')
             )
+            .select_from(GenresModel)
+            .join(
+                MovieGenresModel,
+                GenresModel.id == MovieGenresModel.c.genre_id,
+                isouter=True
+            )
+            .group_by(GenresModel.id, GenresModel.name)
+            .order_by(GenresModel.name)
         )
 
-    if sort_by == MovieSortField.YEAR_ASC:
-        query = query.order_by(MovieModel.year.asc())
-    elif sort_by == MovieSortField.YEAR_DESC:
-        query = query.order_by(MovieModel.year.desc())
-    elif sort_by == MovieSortField.PRICE_ASC:
-        query = query.order_by(MovieModel.price.asc())
-    elif sort_by == MovieSortField.PRICE_DESC:
-        query = query.order_by(MovieModel.price.desc())
-    elif sort_by == MovieSortField.IMDB_ASC:
-        query = query.order_by(MovieModel.imdb.asc())
-    elif sort_by == MovieSortField.IMDB_DESC:
-        query = query.order_by(MovieModel.imdb.desc())
-    elif sort_by == MovieSortField.POPULARITY_ASC:
-        query = query.order_by(MovieModel.votes.asc())
-    elif sort_by == MovieSortField.POPULARITY_DESC:
-        query = query.order_by(MovieModel.votes.desc())
-
-    return await paginate(db, query)
-
+        result = await db.execute(query)
+        genres = result.all()
+        return GENRES_COUNT_ADAPTER.dump_json(GENRES_COUNT_ADAPTER.validate_python(genres, from_attributes=True))
 
-@router.get("/genres/", response_model=List[GenresMoviesCountSchema], status_code=status.HTTP_200_OK)
-async def get_genres(db: AsyncSession = Depends(get_db)):
-    query = (
-        select(
-            GenresModel.id,
-            GenresModel.name,
-            func.count(MovieGenresModel.c.movie_id).label('movies_count')
-        )
-        .select_from(GenresModel)
-        .join(
-            MovieGenresModel,
-            GenresModel.id == MovieGenresModel.c.genre_id,
-            isouter=True
-        )
-        .group_by(GenresModel.id, GenresModel.name)
-        .order_by(GenresModel.name)
-    )
+    version = await get_catalog_version(db, GENRES_VERSION)
+    headers = cache_headers(make_etag("genres", version), settings.CATALOG_HTTP_MAX_AGE_SECONDS)
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    result = await db.execute(query)
-    genres = result.all()
-    return genres
+    key = cache_key("genres", {"version": version})
+    content = await catalog_reader.get_or_load(key, load_genres, tags=[CATALOG_TAG])
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @router.get("/movies/{name_genre}/", response_model=Page[MovieListSchema])
 async def get_movies_by_genre(
         name_genre: str,
         db: AsyncSession = Depends(get_db)):
-    movies = select(MovieModel).options(joinedload(MovieModel.genres),
-                                        joinedload(MovieModel.directors),
-                                        joinedload(MovieModel.stars),
-                                        joinedload(MovieModel.reactions),
-                                        joinedload(MovieModel.comments)).where(
-        MovieModel.genres.any(GenresModel.name == name_genre))
+    movies = (movie_cards_select()
+              .where(MovieCardModel.genre_names.contains([name_genre]))
+              .order_by(MovieModel.year.desc(), MovieModel.id.desc()))
 
-    return await paginate(db, movies)
+    return await paginate(db, movies, unwrap_mode="unwrap")
 
 
 @router.post("/movies/{movie_id}/rating/",
@@ -844,17 +883,18 @@ async def get_movies_by_genre(
 async def add_rating(
         movie_id: int,
         data: MovieRatingRequestSchema,
-        user_profile: UserProfileModel = Depends(current_user_profile),
+        user_profile: AccessClaims = Depends(current_user_profile),
         db: AsyncSession = Depends(get_db)
 ):
     movie = await db.get(MovieModel, movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found.")
 
-    stmt_rating = await db.execute(select(RatingsModel).where(RatingsModel.user_profile_id == user_profile.id,
+    stmt_rating = await db.execute(select(RatingsModel).where(RatingsModel.user_profile_id == user_profile.profile_id,
                                                               RatingsModel.movie_id == movie.id))
     existing_rating = stmt_rating.scalar_one_or_none()
     if existing_rating:
+        await adjust_engagement(db, movie.id, ratings_sum=data.rating - existing_rating.rating)
         existing_rating.rating = data.rating
         await db.commit()
         await db.refresh(existing_rating)
@@ -862,12 +902,13 @@ async def add_rating(
         return existing_rating
 
     rating = RatingsModel(
-        user_profile_id=user_profile.id,
+        user_profile_id=user_profile.profile_id,
         movie_id=movie.id,
         rating=data.rating
     )
 
     db.add(rating)
+    await adjust_engagement(db, movie.id, ratings_count=1, ratings_sum=data.rating)
     await db.commit()
     await db.refresh(rating)
 
@@ -877,7 +918,7 @@ async def add_rating(
 @router.delete("/movies/{movie_id}/delete_rating/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_rating(
         movie_id: int,
-        user_profile: UserProfileModel = Depends(current_user_profile),
+        user_profile: AccessClaims = Depends(current_user_profile),
         db: AsyncSession = Depends(get_db)
 ):
     movie = await db.get(MovieModel, movie_id)
@@ -885,13 +926,14 @@ async def delete_rating(
         raise HTTPException(status_code=404, detail="Movie not found.")
 
     stmt_rating = await db.execute(select(RatingsModel)
-                                   .where(RatingsModel.user_profile_id == user_profile.id,
+                                   .where(RatingsModel.user_profile_id == user_profile.profile_id,
                                           RatingsModel.movie_id == movie_id))
     rating = stmt_rating.scalar_one_or_none()
     if not rating:
         raise HTTPException(status_code=404, detail="Your rating on this movie not found.")
 
     await db.delete(rating)
+    await adjust_engagement(db, movie_id, ratings_count=-1, ratings_sum=-rating.rating)
     await db.commit()
 
     return
@@ -11,7 +11,8 @@ from database.models.movies import PurchasedMoviesModel
 from database.models.order import StatusOrderEnum
 from schemas.orders import OrderCreateSchema, OrdersUsersModeratorResponseSchema, OrdersUserListSchema
 
-from security.auth import get_current_user
+from security.auth import get_current_user, get_current_claims
+from security.claims import AccessClaims
 
 router = APIRouter()
 
@@ -138,14 +139,10 @@ async def list_orders_users_by_moderator(
         order_date_from: Optional[datetime] = Query(None, description="Start date for order filtering"),
         order_date_to: Optional[datetime] = Query(None, description="End date for order filtering"),
         status_order: Optional[str] = Query(None, description="Order status filter"),
-        current_user: int = Depends(get_current_user),
+        claims: AccessClaims = Depends(get_current_claims),
         db: AsyncSession = Depends(get_db)
 ):
-    moderator_user = await db.execute(select(UserModel).where(UserModel.id == current_user)
-                                      .options(joinedload(UserModel.group)))
-
-    moderator_user = moderator_user.scalar_one_or_none()
-    if moderator_user.group.name != "moderator":
+    if claims.group != "moderator":
         raise HTTPException(status_code=401,
                             detail="You do not have permissions for this action.")
 
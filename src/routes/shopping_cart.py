@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, load_only, joinedload
+from sqlalchemy.orm import selectinload, load_only
 from starlette import status
 
-from database import get_db, UserModel, MovieModel, CartItemsModel, CartsModel, UserGroupModel
+from database import get_db, UserModel, MovieModel, CartItemsModel, CartsModel
 from schemas.shopping_cart import CartAddMovieResponseSchema, CartMoviesResponseSchema
-from security.auth import get_current_user, current_user_or_prompt
+from security.auth import get_current_user, current_user_or_prompt, get_current_claims
+from security.claims import AccessClaims
 
 router = APIRouter()
 
@@ -91,14 +92,10 @@ async def list_cart(
 @router.get("/user/{user_id}/all/", response_model=list[CartMoviesResponseSchema])
 async def list_users_cart(
         user_id: int,
-        current_user: int = Depends(get_current_user),
+        claims: AccessClaims = Depends(get_current_claims),
         db: AsyncSession = Depends(get_db)
 ):
-    moderator_user = await db.execute(select(UserModel).where(UserModel.id == current_user)
-                                      .options(joinedload(UserModel.group)))
-
-    moderator_user = moderator_user.scalar_one_or_none()
-    if moderator_user.group.name != "moderator":
+    if claims.group != "moderator":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail="You do not have permissions for this action.")
     user_cart = await db.execute(
@@ -1,9 +1,24 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional, List
 
 from fastapi.params import Query
-from pydantic import BaseModel, field_validator, Field, ConfigDict
+from pydantic import BaseModel, field_validator, model_validator, Field, ConfigDict
 import uuid
+from uuid import UUID
+
+
+class MovieSortField(str, Enum):
+    YEAR_ASC = "year_asc"
+    YEAR_DESC = "year_desc"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    IMDB_ASC = "imdb_asc"
+    IMDB_DESC = "imdb_desc"
+    POPULARITY_ASC = "popularity_asc"
+    POPULARITY_DESC = "popularity_desc"
+    RELEVANCE = "relevance"
+
 
 class StarSchema(BaseModel):
     name: str = Query(min_length=1, max_length=20)
@@ -98,12 +113,82 @@ class MovieListSchema(MovieBaseSchema):
     model_config = ConfigDict(from_attributes=True)
 
 
+class MovieCursorPageSchema(BaseModel):
+    items: List[MovieListSchema]
+    size: int
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+class FacetValueSchema(BaseModel):
+    name: str
+    count: int
+
+
+class DecadeFacetSchema(BaseModel):
+    decade: int
+    count: int
+
+
+class FacetRangeSchema(BaseModel):
+    min: float
+    max: Optional[float]
+    count: int
+
+
+class MovieFacetsSchema(BaseModel):
+    genres: List[FacetValueSchema]
+    directors: List[FacetValueSchema]
+    decades: List[DecadeFacetSchema]
+    imdb: List[FacetRangeSchema]
+    price: List[FacetRangeSchema]
+
+
+class MovieChangeSchema(BaseModel):
+    movie_id: int
+    change_type: str
+    changed_at: datetime
+    movie: Optional[MovieListSchema]
+
+
+class MovieChangesPageSchema(BaseModel):
+    items: List[MovieChangeSchema]
+    next_cursor: Optional[str]
+    has_more: bool
+
+
+class MovieDeletionSchema(BaseModel):
+    id: int
+    movie_id: int
+    movie_name: str
+    status: str
+    stage: Optional[str]
+    processed: int
+    total: Optional[int]
+    error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def status_value(cls, value):
+        return getattr(value, "value", value)
+
+
 class MovieDetailSchema(MovieBaseSchema):
     id: int
     uuid: uuid.UUID
     stars: List[StarsDetailSchema]
     genres: List[GenresDetailSchema]
     directors: List[DirectorsDetailSchema]
+    likes_count: int
+    dislikes_count: int
+    comments_count: int
+    favorites_count: int
+    ratings_count: int
+    rating_average: Optional[float]
 
     class Config:
         from_attributes = True
@@ -120,6 +205,36 @@ class MovieCreateSchema(MovieBaseSchema):
         return [item.title() for item in value]
 
 
+class MovieImportSchema(MovieCreateSchema):
+    uuid: Optional[UUID] = None
+    available: bool = True
+    certification_id: Optional[int] = None
+    certification: Optional[str] = None
+
+    @field_validator("stars", "genres", "directors", mode="before")
+    @classmethod
+    def normalize_list_fields(cls, value: Optional[List[str] | str]) -> List[str]:
+        if value is None:
+            return []
+        if isinstance(value, str):
+            value = value.split(",")
+        return list(dict.fromkeys(item.strip().title() for item in value if item.strip()))
+
+    @model_validator(mode="after")
+    def check_certification(self) -> "MovieImportSchema":
+        if self.certification_id is None and not self.certification:
+            raise ValueError("Either certification_id or certification is required.")
+        return self
+
+
+class MovieImportResultSchema(BaseModel):
+    received: int = 0
+    imported: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    errors: List[str] = []
+
+
 class MovieCreateResponseSchema(MovieBaseSchema):
     id: int
     uuid: uuid.UUID
@@ -186,10 +301,37 @@ class MovieRatingResponseSchema(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class CommentThreadSchema(MovieCommentBaseSchema):
+    id: int
+    parent_id: Optional[int]
+    created_at: datetime
+    likes_count: int
+    replies_count: int
+    replies: List["CommentThreadSchema"] = []
+
+
+class MovieCommentsPageSchema(BaseModel):
+    items: List[CommentThreadSchema]
+    size: int
+    next_cursor: Optional[str]
+
+
 class CommentLikeResponseSchema(BaseModel):
     id: int
     comment_id: int
     user_profile_id: int
     created_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SuggestionSchema(BaseModel):
+    id: int
+    name: str
+
+
+class CatalogSuggestionsSchema(BaseModel):
+    movies: List[SuggestionSchema]
+    stars: List[SuggestionSchema]
+    directors: List[SuggestionSchema]
+    genres: List[SuggestionSchema]
@@ -1,3 +1,5 @@
 from security.utils import generate_secure_token
-from security.passwords import verify_password, hash_password
-from security.token_manager import JWTAuthManager
\ No newline at end of file
+from security.passwords import verify_password, hash_password, AsyncPasswordHasher
+from security.token_manager import JWTAuthManager
+from security.token_cache import VerifiedTokenCache
+from security.claims import AccessClaims, TokenVersionCache
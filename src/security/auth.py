@@ -1,6 +1,14 @@
+from typing import Optional
+
 from fastapi import Request, HTTPException, status, Depends
-from config.dependencies import get_jwt_auth_manager
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.dependencies import get_jwt_auth_manager, get_token_versions
+from database import get_db
+from database.models.accounts import UserModel
 from exceptions import TokenExpiredError, InvalidTokenError
+from security.claims import AccessClaims, TokenVersionCache
 from security.interface import JWTAuthManagerInterface
 
 
@@ -31,23 +39,84 @@ def get_token(request: Request) -> str:
     return token
 
 
-def get_current_user(request: Request, jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager)):
+def get_access_claims(
+        request: Request,
+        jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager)
+) -> AccessClaims:
+    return _decode_access_claims(get_token(request), jwt_manager)
+
+
+async def get_current_claims(
+        claims: AccessClaims = Depends(get_access_claims),
+        token_versions: TokenVersionCache = Depends(get_token_versions),
+        db: AsyncSession = Depends(get_db)
+) -> AccessClaims:
+    """
+    Authorize a request from the claims signed into its access token.
+
+    The only check left to the database is the user's token version, and it is
+    cached per process, so most requests are authorized without a query; the
+    session does not open a connection unless the version has to be read.
+    """
+    await _check_token_version(claims, token_versions, db)
+    return claims
+
+
+async def get_current_user(claims: AccessClaims = Depends(get_current_claims)) -> int:
+    """
+    Authorize a request and return the id of its user.
+
+    Goes through `get_current_claims`, so a token revoked by bumping the user's
+    token version is rejected here too.
+    """
+    return claims.user_id
+
+
+async def current_user_or_prompt(
+        request: Request,
+        jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+        token_versions: TokenVersionCache = Depends(get_token_versions),
+        db: AsyncSession = Depends(get_db)
+) -> Optional[int]:
+    """
+    Like `get_current_user`, but return None instead of failing when the request carries no bearer token.
+    """
     try:
-        token = jwt_manager.decode_access_token(token=get_token(request))
-        return token.get("user_id")
+        token = get_token(request)
+    except HTTPException:
+        return None
+    claims = _decode_access_claims(token, jwt_manager)
+    await _check_token_version(claims, token_versions, db)
+    return claims.user_id
+
+
+def _decode_access_claims(token: str, jwt_manager: JWTAuthManagerInterface) -> AccessClaims:
+    try:
+        payload = jwt_manager.decode_access_token(token=token)
     except (TokenExpiredError, InvalidTokenError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token expired.")
+    claims = AccessClaims.from_payload(payload)
+    if claims is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token is missing required claims, please log in again.")
+    return claims
 
 
-def current_user_or_prompt(request: Request, jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager)):
-    try:
-        token = jwt_manager.decode_access_token(token=get_token(request))
-        return token.get("user_id")
-    except (TokenExpiredError, InvalidTokenError):
+async def _check_token_version(claims: AccessClaims, token_versions: TokenVersionCache, db: AsyncSession) -> None:
+    version = token_versions.get(claims.user_id)
+    if version is None:
+        version = await db.scalar(
+            select(UserModel.token_version).where(UserModel.id == claims.user_id, UserModel.is_active)
+        )
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found or not active.")
+        token_versions.set(claims.user_id, version)
+    if version != claims.version:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token expired.")
-    except HTTPException:
-        return None
+            detail="Token has been revoked.")
@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+MODERATOR_GROUPS = ("moderator", "admin")
+
+
+@dataclass(frozen=True)
+class AccessClaims:
+    """
+    Identity carried by an access token, enough to authorize a request without a database lookup.
+
+    `version` is the user's token version when the token was issued; it is
+    compared with the current one to revoke tokens early.
+    """
+    user_id: int
+    profile_id: Optional[int]
+    group: str
+    version: int
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> Optional["AccessClaims"]:
+        """
+        Read the claims of a decoded token, or return None for a token issued without them.
+        """
+        user_id, profile_id = payload.get("user_id"), payload.get("profile_id")
+        group, version = payload.get("group"), payload.get("ver")
+        if not isinstance(user_id, int) or not isinstance(group, str) or not isinstance(version, int):
+            return None
+        if profile_id is not None and not isinstance(profile_id, int):
+            return None
+        return cls(user_id, profile_id, group, version)
+
+    def to_payload(self) -> dict:
+        return {"user_id": self.user_id, "profile_id": self.profile_id, "group": self.group, "ver": self.version}
+
+    @property
+    def is_moderator(self) -> bool:
+        return self.group in MODERATOR_GROUPS
+
+
+class TokenVersionCache:
+    """
+    Per-process map of user ids to their current token version, trusted for `ttl_seconds`.
+
+    A token revoked by another worker process is therefore accepted here for at
+    most `ttl_seconds`; revocations made by this process take effect at once.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[float, int]] = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[int]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, version = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        return version
+
+    def set(self, user_id: int, version: int) -> None:
+        if self._ttl_seconds <= 0 or self._max_entries <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self._ttl_seconds, version)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
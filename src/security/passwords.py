@@ -1,18 +1,129 @@
+import asyncio
+import fcntl
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from multiprocessing import get_context
+from typing import Callable, Optional, TypeVar
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    bcrypt__rounds=14,
-    deprecated="auto"
-)
+T = TypeVar("T")
+
+PASSWORD_HASH_SCHEMES = ("bcrypt", "argon2")
+PASSWORD_HASH_COST_SETTINGS = {"bcrypt": "rounds", "argon2": "time_cost"}
+PASSWORD_HASH_COST_LIMITS = {"bcrypt": (10, 16), "argon2": (2, 16)}
+PASSWORD_HASH_DEFAULT_COSTS = {"bcrypt": 14, "argon2": 3}
+PASSWORD_HASH_COST_PATTERNS = {"bcrypt": re.compile(r"^\$2[abxy]?\$(\d+)\$"), "argon2": re.compile(r"[$,]t=(\d+)")}
+
+
+@dataclass(frozen=True)
+class PasswordHashPolicy:
+    """
+    Scheme and cost new password hashes are made with.
+
+    `cost` is the bcrypt rounds (log2 of the work) or the argon2id time cost,
+    within the scheme's `PASSWORD_HASH_COST_LIMITS`; when omitted, the scheme's
+    `PASSWORD_HASH_DEFAULT_COSTS` is used. Hashes of any other scheme, or of a
+    lower cost, still verify, but are reported as outdated so they can be
+    rehashed on the next successful login.
+    """
+    scheme: str = "bcrypt"
+    cost: Optional[int] = None
+
+    def __post_init__(self):
+        if self.scheme not in PASSWORD_HASH_SCHEMES:
+            raise ValueError(f"Unsupported password hash scheme: {self.scheme}.")
+        if self.cost is None:
+            object.__setattr__(self, "cost", PASSWORD_HASH_DEFAULT_COSTS[self.scheme])
+        lowest, highest = PASSWORD_HASH_COST_LIMITS[self.scheme]
+        if not lowest <= self.cost <= highest:
+            raise ValueError(f"The {self.scheme} cost must be between {lowest} and {highest}, not {self.cost}.")
+
+    def context(self) -> CryptContext:
+        schemes = [self.scheme] + [scheme for scheme in PASSWORD_HASH_SCHEMES if scheme != self.scheme]
+        return CryptContext(
+            schemes=schemes,
+            deprecated="auto",
+            **{f"{self.scheme}__{PASSWORD_HASH_COST_SETTINGS[self.scheme]}": self.cost}
+        )
+
+
+pwd_context = PasswordHashPolicy().context()
+
+
+def set_password_policy(policy: PasswordHashPolicy) -> None:
+    """
+    Make `policy` the one `hash_password` uses in this process.
+    """
+    global pwd_context
+    pwd_context = policy.context()
+
+
+def calibrate_password_policy(
+        scheme: str,
+        target_seconds: float,
+        shared_path: Optional[str] = None
+) -> PasswordHashPolicy:
+    """
+    Pick the highest cost of `scheme` whose hash still takes at most `target_seconds` on this machine.
+
+    Costs are timed from the lowest accepted one upwards, stopping before the
+    next cost is expected to overrun the budget. The lowest cost is used even
+    if it is already over budget.
+
+    With `shared_path`, the first process to calibrate stores its result in that
+    file under an exclusive lock, and every other process (the other server
+    workers on the host, or later restarts) reuses it instead of timing on its own.
+    """
+    if shared_path is None:
+        return _time_password_policy(scheme, target_seconds)
+    with open(shared_path, "a+") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            file.seek(0)
+            try:
+                stored = json.loads(file.read())
+                if stored["scheme"] == scheme:
+                    return PasswordHashPolicy(scheme, int(stored["cost"]))
+            except (ValueError, KeyError, TypeError):
+                pass
+            policy = _time_password_policy(scheme, target_seconds)
+            file.seek(0)
+            file.truncate()
+            file.write(json.dumps({"scheme": policy.scheme, "cost": policy.cost}))
+            file.flush()
+            return policy
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def _time_password_policy(scheme: str, target_seconds: float) -> PasswordHashPolicy:
+    lowest, highest = PASSWORD_HASH_COST_LIMITS[scheme]
+    cost = lowest
+    for candidate in range(lowest, highest + 1):
+        context = PasswordHashPolicy(scheme, candidate).context()
+        started = time.perf_counter()
+        context.hash("password hash calibration")
+        elapsed = time.perf_counter() - started
+        if elapsed > target_seconds and candidate > lowest:
+            break
+        cost = candidate
+        growth = 2 if scheme == "bcrypt" else (candidate + 1) / candidate
+        if elapsed * growth > target_seconds:
+            break
+    return PasswordHashPolicy(scheme, cost)
 
 
 def hash_password(password: str) -> str:
     """
     Hash a plain-text password using the configured password context.
 
-    This function takes a plain-text password and returns its bcrypt hash.
-    The bcrypt algorithm is used with a specified number of rounds for enhanced security.
+    This function takes a plain-text password and returns its hash, made with the scheme
+    and cost of the password hash policy set for this process (bcrypt with 14 rounds until a policy is set).
 
     Args:
         password (str): The plain-text password to hash.
@@ -38,3 +149,134 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         bool: True if the password is correct, False otherwise.
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def default_hash_workers() -> int:
+    """
+    Size a hasher pool so the pools of all web server workers together get one process per CPU.
+
+    Every server worker process runs its own hasher, so the CPUs are divided by
+    `WEB_CONCURRENCY`, the number of server workers, instead of each one taking all of them.
+    """
+    web_concurrency = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    return max(1, (os.cpu_count() or 1) // max(1, web_concurrency))
+
+
+@dataclass
+class PasswordHasherStats:
+    max_workers: int
+    max_concurrency: int
+    in_flight: int = 0
+    waiting: int = 0
+    peak_waiting: int = 0
+    completed: int = 0
+
+
+class AsyncPasswordHasher:
+    """
+    Run bcrypt hashing and verification in a process pool instead of on the event loop.
+
+    The pool has `max_workers` processes, `default_hash_workers()` when not
+    given. At most `max_concurrency` calls are handed to the pool at a time;
+    further callers wait on a semaphore, and how many are waiting is reported
+    by `stats()`. The pool is started on first use and stopped by `shutdown()`.
+    New hashes follow the hasher's `PasswordHashPolicy`, which is applied to
+    the pool processes and to this process alike.
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            max_concurrency: Optional[int] = None,
+            policy: PasswordHashPolicy = PasswordHashPolicy()
+    ):
+        max_workers = max_workers or default_hash_workers()
+        self._stats = PasswordHasherStats(max_workers=max_workers, max_concurrency=max_concurrency or max_workers)
+        self._semaphore = asyncio.Semaphore(self._stats.max_concurrency)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.configure(policy)
+
+    @property
+    def policy(self) -> PasswordHashPolicy:
+        return self._policy
+
+    def configure(self, policy: PasswordHashPolicy) -> None:
+        """
+        Switch to `policy`; pool processes started with the previous one are replaced on the next call.
+        """
+        self._policy = policy
+        self._context = policy.context()
+        set_password_policy(policy)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def calibrate(
+            self,
+            scheme: str,
+            target_seconds: float,
+            shared_path: Optional[str] = None
+    ) -> PasswordHashPolicy:
+        """
+        Time `scheme` in the pool, then switch to the highest cost that fits in `target_seconds`.
+
+        With `shared_path`, a result already calibrated by another process is reused;
+        see `calibrate_password_policy`.
+        """
+        policy = await self._run(calibrate_password_policy, scheme, target_seconds, shared_path)
+        self.configure(policy)
+        return policy
+
+    def needs_update(self, hashed_password: str) -> bool:
+        """
+        Tell whether a stored hash was made with another scheme, or a lower cost, than the current policy.
+
+        A hash above the policy cost counts as current, so processes that
+        ended up with different costs never rehash a password back and forth.
+        """
+        scheme = self._context.identify(hashed_password)
+        if scheme != self._policy.scheme:
+            return True
+        match = PASSWORD_HASH_COST_PATTERNS[scheme].search(hashed_password)
+        return match is None or int(match.group(1)) < self._policy.cost
+
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        if self._executor is None:
+            # Spawned rather than forked: the server process already runs an event loop and threads.
+            self._executor = ProcessPoolExecutor(self._stats.max_workers, mp_context=get_context("spawn"),
+                                                 initializer=set_password_policy, initargs=(self._policy,))
+        stats = self._stats
+        if self._semaphore.locked():
+            stats.waiting += 1
+            stats.peak_waiting = max(stats.peak_waiting, stats.waiting)
+            try:
+                await self._semaphore.acquire()
+            finally:
+                stats.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        stats.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            stats.in_flight -= 1
+            stats.completed += 1
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> PasswordHasherStats:
+        """
+        Return a snapshot of the pool size, the calls running in it and the calls queued for it.
+        """
+        return replace(self._stats)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
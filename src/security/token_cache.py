@@ -0,0 +1,73 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Optional
+
+
+@dataclass
+class TokenCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class VerifiedTokenCache:
+    """
+    Per-process LRU of tokens whose signature was already verified, mapped to their claims.
+
+    Entries are keyed by a digest of the token bound to the verifying key, so a
+    hit needs neither parsing nor an HMAC check, and the same token verified
+    with another key never matches. An entry is dropped once the token's `exp`
+    has passed, which sends the token back through full verification to be
+    rejected there.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._stats = TokenCacheStats()
+
+    @staticmethod
+    def digest(token: str, key: bytes) -> bytes:
+        return hashlib.blake2b(token.encode(), key=key, digest_size=32).digest()
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[digest]
+            self._stats.expired += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self._stats.hits += 1
+        return dict(claims)
+
+    def set(self, digest: bytes, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or self._max_entries <= 0:
+            return
+        self._entries[digest] = (expires_at, dict(claims))
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> TokenCacheStats:
+        """
+        Return a snapshot of the hit, miss, expiry and eviction counters.
+        """
+        return replace(self._stats)
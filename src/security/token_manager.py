@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -5,6 +6,7 @@ from jose import jwt, JWTError, ExpiredSignatureError
 
 from exceptions import TokenExpiredError, InvalidTokenError
 from security.interface import JWTAuthManagerInterface
+from security.token_cache import VerifiedTokenCache
 
 
 class JWTAuthManager(JWTAuthManagerInterface):
@@ -15,13 +17,25 @@ class JWTAuthManager(JWTAuthManagerInterface):
     _ACCESS_KEY_TIMEDELTA_MINUTES = 60
     _REFRESH_KEY_TIMEDELTA_MINUTES = 60 * 24 * 7
 
-    def __init__(self, secret_key_access: str, secret_key_refresh: str, algorithm: str):
+    def __init__(
+            self,
+            secret_key_access: str,
+            secret_key_refresh: str,
+            algorithm: str,
+            token_cache: Optional[VerifiedTokenCache] = None
+    ):
         """
         Initialize the manager with secret keys and algorithm for token operations.
+
+        With a `token_cache`, access tokens that were already verified are
+        answered from it until they expire.
         """
         self._secret_key_access = secret_key_access
         self._secret_key_refresh = secret_key_refresh
         self._algorithm = algorithm
+        self._token_cache = token_cache
+        if token_cache is not None:
+            self._access_cache_key = hashlib.sha256(f"{algorithm}:{secret_key_access}".encode()).digest()
 
     def _create_token(self, data: dict, secret_key: str, expires_delta: timedelta) -> str:
         """
@@ -54,12 +68,20 @@ class JWTAuthManager(JWTAuthManagerInterface):
         """
         Decode and validate an access token, returning the token's data.
         """
+        if self._token_cache is not None:
+            digest = self._token_cache.digest(token, self._access_cache_key)
+            claims = self._token_cache.get(digest)
+            if claims is not None:
+                return claims
         try:
-            return jwt.decode(token, self._secret_key_access, algorithms=[self._algorithm])
+            claims = jwt.decode(token, self._secret_key_access, algorithms=[self._algorithm])
         except ExpiredSignatureError:
             raise TokenExpiredError
         except JWTError:
             raise InvalidTokenError
+        if self._token_cache is not None:
+            self._token_cache.set(digest, claims)
+        return claims
 
     def decode_refresh_token(self, token: str) -> dict:
         """
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from security.auth import current_user_or_prompt
+from security.claims import AccessClaims, TokenVersionCache
+
+
+class FakeJWTManager:
+    def __init__(self, claims: AccessClaims):
+        self.claims = claims
+
+    def decode_access_token(self, token: str) -> dict:
+        return self.claims.to_payload()
+
+
+class FakeSession:
+    def __init__(self, version):
+        self.version = version
+
+    async def scalar(self, statement):
+        return self.version
+
+
+def request(authorization=None) -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "headers": headers})
+
+
+def resolve(claims: AccessClaims, current_version, authorization="Bearer token"):
+    return asyncio.run(current_user_or_prompt(
+        request(authorization), FakeJWTManager(claims), TokenVersionCache(60, 10), FakeSession(current_version)
+    ))
+
+
+def test_optional_user_checks_the_token_version():
+    claims = AccessClaims(user_id=7, profile_id=None, group="user", version=2)
+
+    assert resolve(claims, 2) == 7
+    assert resolve(claims, 2, authorization=None) is None
+    with pytest.raises(HTTPException) as revoked:
+        resolve(claims, 3)
+    assert revoked.value.detail == "Token has been revoked."
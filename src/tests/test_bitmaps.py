@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from catalog.bitmaps import RoaringBitmap, ARRAY_CONTAINER_LIMIT, _is_bitmap
+
+
+def container_kinds(bitmap: RoaringBitmap) -> dict[int, str]:
+    return {key: "bitmap" if _is_bitmap(container) else "array" for key, container in bitmap._containers.items()}
+
+
+@pytest.mark.parametrize("size, kind", [
+    (ARRAY_CONTAINER_LIMIT - 1, "array"),
+    (ARRAY_CONTAINER_LIMIT, "array"),
+    (ARRAY_CONTAINER_LIMIT + 1, "bitmap"),
+])
+def test_container_kind_follows_cardinality(size, kind):
+    bitmap = RoaringBitmap(range(0, size * 2, 2))
+
+    assert container_kinds(bitmap) == {0: kind}
+    assert len(bitmap) == size
+
+
+def test_add_past_the_limit_converts_array_to_bitmap():
+    bitmap = RoaringBitmap(range(ARRAY_CONTAINER_LIMIT))
+    assert container_kinds(bitmap) == {0: "array"}
+
+    bitmap.add(ARRAY_CONTAINER_LIMIT)
+
+    assert container_kinds(bitmap) == {0: "bitmap"}
+    assert len(bitmap) == ARRAY_CONTAINER_LIMIT + 1
+    assert ARRAY_CONTAINER_LIMIT in bitmap
+
+
+def test_discard_back_to_the_limit_converts_bitmap_to_array():
+    bitmap = RoaringBitmap(range(ARRAY_CONTAINER_LIMIT + 1))
+
+    bitmap.discard(7)
+
+    assert container_kinds(bitmap) == {0: "array"}
+    assert 7 not in bitmap
+    assert len(bitmap) == ARRAY_CONTAINER_LIMIT
+
+
+def test_discarding_the_last_value_drops_the_container():
+    bitmap = RoaringBitmap([65536])
+
+    bitmap.discard(65536)
+
+    assert not bitmap
+    assert bitmap._containers == {}
+
+
+def test_values_are_split_at_chunk_boundaries():
+    values = [0, 65535, 65536, 131071, 2 ** 32 - 1]
+    bitmap = RoaringBitmap(values)
+
+    assert sorted(bitmap._containers) == [0, 1, 65535]
+    assert bitmap.to_array().tolist() == values
+    assert all(value in bitmap for value in values)
+    assert 65537 not in bitmap
+
+
+def test_out_of_range_values_are_rejected():
+    with pytest.raises(ValueError):
+        RoaringBitmap([-1])
+    with pytest.raises(ValueError):
+        RoaringBitmap([2 ** 32])
+
+
+@pytest.mark.parametrize("left_size, right_size", [(100, 200), (100, 9000), (9000, 100), (9000, 12000)])
+def test_set_operations_match_python_sets_across_container_kinds(left_size, right_size):
+    rng = np.random.default_rng(left_size + right_size)
+    left_values = set(rng.choice(3 * 65536, left_size, replace=False).tolist())
+    right_values = set(rng.choice(3 * 65536, right_size, replace=False).tolist())
+    left, right = RoaringBitmap(left_values), RoaringBitmap(right_values)
+
+    assert (left & right).to_array().tolist() == sorted(left_values & right_values)
+    assert (left | right).to_array().tolist() == sorted(left_values | right_values)
+    assert (left - right).to_array().tolist() == sorted(left_values - right_values)
+    assert left.intersection_len(right) == len(left_values & right_values)
+
+
+def test_dense_intersection_that_becomes_sparse_is_stored_as_an_array():
+    evens = RoaringBitmap(range(0, 20000, 2))
+    low_range = RoaringBitmap(range(0, 5000))
+
+    both = evens & low_range
+
+    assert container_kinds(both) == {0: "array"}
+    assert len(both) == 2500
+
+
+def test_bytes_round_trip_keeps_values_and_container_kinds():
+    bitmap = RoaringBitmap(list(range(ARRAY_CONTAINER_LIMIT + 10)) + [70000, 2 ** 32 - 1])
+
+    restored = RoaringBitmap.from_bytes(bitmap.to_bytes())
+
+    assert restored == bitmap
+    assert container_kinds(restored) == container_kinds(bitmap)
+
+
+def test_empty_bitmap():
+    bitmap = RoaringBitmap()
+
+    assert len(bitmap) == 0
+    assert bitmap.to_array().tolist() == []
+    assert RoaringBitmap.from_bytes(bitmap.to_bytes()) == bitmap
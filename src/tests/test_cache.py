@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from cache import InMemoryCache
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("cache.memory.time", clock)
+    return clock
+
+
+def test_in_memory_cache_expires_entries_after_their_ttl(clock):
+    async def scenario():
+        cache = InMemoryCache(max_entries=10)
+        await cache.set("page", b"cards", ttl_seconds=30)
+        clock.now += 29
+        fresh = await cache.get("page")
+        clock.now += 1
+        return fresh, await cache.get("page"), cache._entries
+
+    fresh, expired, entries = asyncio.run(scenario())
+
+    assert fresh == b"cards"
+    assert expired is None
+    assert not entries
+
+
+def test_in_memory_cache_evicts_the_least_recently_used_entry(clock):
+    async def scenario():
+        cache = InMemoryCache(max_entries=2)
+        await cache.set("a", b"1", ttl_seconds=60, tags=["catalog"])
+        await cache.set("b", b"2", ttl_seconds=60)
+        await cache.get("a")
+        await cache.set("c", b"3", ttl_seconds=60)
+        return [await cache.get(key) for key in "abc"]
+
+    assert asyncio.run(scenario()) == [b"1", None, b"3"]
+
+
+def test_in_memory_cache_invalidates_by_tag_and_forgets_evicted_keys(clock):
+    async def scenario():
+        cache = InMemoryCache(max_entries=1)
+        await cache.set("old", b"1", ttl_seconds=60, tags=["catalog"])
+        await cache.set("page", b"2", ttl_seconds=60, tags=["catalog", "genres"])
+        tagged = {tag: set(keys) for tag, keys in cache._tagged.items()}
+        await cache.invalidate_tags("genres")
+        return tagged, await cache.get("page"), cache._tagged
+
+    tagged, page, remaining = asyncio.run(scenario())
+
+    assert tagged == {"catalog": {"page"}, "genres": {"page"}}
+    assert page is None
+    assert remaining == {}
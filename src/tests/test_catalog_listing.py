@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.util import find_tables
+
+from catalog.cards import load_movie_cards
+from catalog.filters import MOVIE_SORT_COLUMNS
+from catalog.query import catalog_statements
+from schemas.movies import MovieSortField
+
+LIST_FILTERS = ("year_min", "price_max", "genres", "directors", "actors")
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def statement_tables(statement) -> set[str]:
+    return {table.name for from_ in statement.get_final_froms() for table in find_tables(from_)}
+
+
+@pytest.mark.parametrize("favourites, tables", [
+    (False, {"movie_cards", "movies"}),
+    (True, {"movie_cards", "movies", "movie_favorites"}),
+])
+def test_list_statements_read_cards_without_collection_tables(favourites, tables):
+    page, count = catalog_statements(LIST_FILTERS, MovieSortField.YEAR_DESC, favourites)
+
+    assert statement_tables(page) == tables
+    assert statement_tables(count) == tables
+
+
+@pytest.mark.parametrize("sort_by", list(MOVIE_SORT_COLUMNS))
+def test_page_statement_orders_by_sort_column_then_id(sort_by):
+    column, descending = MOVIE_SORT_COLUMNS[sort_by]
+    direction = "DESC" if descending else "ASC"
+    page, _ = catalog_statements((), sort_by)
+
+    order_by = compile_sql(page).split("ORDER BY", 1)[1].split("LIMIT", 1)[0].strip()
+
+    assert order_by == f"movies.{column.key} {direction}, movies.id {direction}"
+
+
+class CardsResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def tuples(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class CardsSession:
+    """
+    Answers a card query with one row per movie id it asks for, skipping ids in `missing`.
+    """
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.statements = []
+        self.rows_fetched = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        (movie_ids,) = (value for value in statement.compile().params.values() if isinstance(value, list))
+        rows = [(movie_id, {"id": movie_id}) for movie_id in movie_ids if movie_id not in self.missing]
+        self.rows_fetched += len(rows)
+        return CardsResult(rows[::-1])
+
+
+@pytest.mark.parametrize("page_size", [1, 10, 50, 100])
+def test_load_movie_cards_fetches_one_row_per_requested_movie(page_size):
+    movie_ids = list(range(page_size * 7, 0, -7))
+    session = CardsSession()
+
+    cards = asyncio.run(load_movie_cards(session, movie_ids))
+
+    assert [card["id"] for card in cards] == movie_ids
+    assert session.rows_fetched == page_size
+    assert len(session.statements) == 1
+
+
+def test_load_movie_cards_skips_movies_without_a_card():
+    session = CardsSession(missing={4})
+
+    cards = asyncio.run(load_movie_cards(session, [2, 3, 4, 1]))
+
+    assert [card["id"] for card in cards] == [2, 3, 1]
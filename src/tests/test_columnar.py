@@ -0,0 +1,116 @@
+import asyncio
+from dataclasses import fields
+from decimal import Decimal
+from types import SimpleNamespace
+
+from catalog.columnar import ColumnarCatalog, ColumnarSnapshot
+from catalog.filters import MovieFilterParams
+from schemas.movies import MovieSortField
+
+
+def movie_filters(**values) -> MovieFilterParams:
+    defaults = {field.name: None for field in fields(MovieFilterParams)}
+    return MovieFilterParams(**{**defaults, "fuzzy": False, "sort_by": MovieSortField.YEAR_DESC, **values})
+
+
+FILTERS = movie_filters()
+
+
+def movie(movie_id: int, year: int, genres=()) -> SimpleNamespace:
+    return SimpleNamespace(id=movie_id, year=year, imdb=7.0, price=10.0, votes=100,
+                           genres=[SimpleNamespace(name=name) for name in genres], stars=[], directors=[])
+
+
+def loaded_catalog(version: int) -> ColumnarCatalog:
+    catalog = ColumnarCatalog()
+    catalog._snapshot = ColumnarSnapshot.build([
+        (1, {"year": 2001, "imdb": 7.0, "price": 10.0, "votes": 100}, {"genres": ["Drama"]}),
+    ])
+    catalog._version = version
+    return catalog
+
+
+def test_local_deltas_keep_the_snapshot_servable():
+    catalog = loaded_catalog(version=4)
+
+    catalog.upsert_movie(movie(2, 2010, ["Drama"]), version=5)
+    assert catalog.supports(FILTERS, 5)
+    assert catalog.page(FILTERS, 0, 10) == (2, [2, 1])
+
+    catalog.remove_movie(1, version=6)
+    assert catalog.supports(FILTERS, 6)
+    assert catalog.page(FILTERS, 0, 10) == (1, [2])
+    assert not catalog._refresh_requested.is_set()
+
+
+def test_deltas_applied_out_of_order_advance_once_contiguous():
+    catalog = loaded_catalog(version=4)
+
+    catalog.upsert_movie(movie(3, 2012), version=6)
+    assert not catalog.supports(FILTERS, 6)
+    catalog.upsert_movie(movie(2, 2010), version=5)
+    assert catalog.supports(FILTERS, 6)
+
+
+def test_a_write_from_another_process_requests_a_reload():
+    catalog = loaded_catalog(version=4)
+
+    catalog.upsert_movie(movie(2, 2010), version=6)
+    assert not catalog.supports(FILTERS, 6)
+    assert catalog._refresh_requested.is_set()
+
+
+def test_an_older_request_version_falls_back_without_a_reload():
+    catalog = loaded_catalog(version=4)
+
+    assert not catalog.supports(FILTERS, 3)
+    assert not catalog._refresh_requested.is_set()
+
+
+class FakeStreamResult:
+    def __init__(self, batches):
+        self.batches = batches
+
+    async def partitions(self):
+        for batch in self.batches:
+            yield batch
+
+
+class FakeStreamSession:
+    def __init__(self, batches):
+        self.batches = batches
+
+    async def stream(self, statement):
+        return FakeStreamResult(self.batches)
+
+
+def test_reload_builds_the_snapshot_from_streamed_batches():
+    batches = [
+        [(1, 2001, 7.0, Decimal("10.00"), 100, ["Drama"], ["Ann"], ["Bo"]),
+         (2, 2010, 8.0, Decimal("12.50"), 300, ["Drama", "War"], [], ["Cy"])],
+        [(3, 1999, 6.5, Decimal("5.00"), 50, None, ["Ann"], [])],
+    ]
+
+    snapshot = asyncio.run(ColumnarCatalog._query_snapshot(FakeStreamSession(batches)))
+
+    assert snapshot.size == 3
+    assert snapshot.rows == {1: 0, 2: 1, 3: 2}
+    assert snapshot.page(FILTERS, 0, 10) == (3, [2, 1, 3])
+    assert snapshot.postings["genres"]["Drama"].to_array().tolist() == [0, 1]
+    assert snapshot.postings["stars"]["Ann"].to_array().tolist() == [0, 2]
+    assert snapshot.columns["price"][1] == 12.5
+
+
+def test_facet_counts_follow_filters_and_in_place_deltas():
+    catalog = loaded_catalog(version=4)
+    catalog.upsert_movie(movie(2, 2010, ["Drama", "War"]), version=5)
+    assert catalog.facet_counts(FILTERS)["genres"] == {"Drama": 2, "War": 1}
+
+    catalog.upsert_movie(movie(3, 2012, ["War"]), version=6)
+    catalog.remove_movie(1, version=7)
+    counts = catalog.facet_counts(FILTERS)
+    assert counts["genres"] == {"Drama": 1, "War": 2}
+    assert counts["decades"] == {2010: 2}
+
+    filtered = catalog.facet_counts(movie_filters(year_min=2011))
+    assert filtered["genres"] == {"War": 1}
@@ -0,0 +1,157 @@
+import asyncio
+import base64
+import operator
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.sql.operators import desc_op
+
+from catalog.cards import movie_cards_select
+from catalog.filters import MOVIE_SORT_COLUMNS
+from catalog.pagination import (CURSOR_NEXT, CURSOR_PREV, _movie_cursor, _parse_movie_cursor, decode_cursor,
+                                encode_cursor, paginate_movies_by_cursor)
+from exceptions import InvalidCursorError
+from schemas.movies import MovieSortField
+from tests.test_columnar import movie_filters
+
+YEAR = MOVIE_SORT_COLUMNS[MovieSortField.YEAR_DESC][0]
+PRICE = MOVIE_SORT_COLUMNS[MovieSortField.PRICE_DESC][0]
+IMDB = MOVIE_SORT_COLUMNS[MovieSortField.IMDB_DESC][0]
+
+
+def test_cursor_round_trips_without_padding():
+    payload = {"s": MovieSortField.PRICE_ASC.value, "v": "9.99", "id": 42, "d": CURSOR_NEXT}
+
+    cursor = encode_cursor(payload)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == payload
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"{not json").decode(),
+    encode_cursor([1, 2]),
+    encode_cursor({"s": MovieSortField.YEAR_DESC.value})[:-3],
+])
+def test_decode_cursor_rejects_tampered_cursors(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("sort_by, direction", [
+    (MovieSortField.YEAR_ASC, CURSOR_NEXT),
+    (MovieSortField.YEAR_DESC, "sideways"),
+])
+def test_cursor_for_another_ordering_is_rejected(sort_by, direction):
+    cursor = encode_cursor({"s": sort_by.value, "v": 2000, "id": 1, "d": direction})
+
+    with pytest.raises(InvalidCursorError, match="requested ordering"):
+        _parse_movie_cursor(cursor, MovieSortField.YEAR_DESC, YEAR)
+
+
+@pytest.mark.parametrize("sort_by, expression, value, movie_id", [
+    (MovieSortField.YEAR_DESC, YEAR, True, 1),
+    (MovieSortField.YEAR_DESC, YEAR, 2 ** 31, 1),
+    (MovieSortField.YEAR_DESC, YEAR, "2000", 1),
+    (MovieSortField.YEAR_DESC, YEAR, 2000, "1"),
+    (MovieSortField.YEAR_DESC, YEAR, 2000, -2 ** 31 - 1),
+    (MovieSortField.PRICE_DESC, PRICE, "cheap", 1),
+    (MovieSortField.PRICE_DESC, PRICE, "NaN", 1),
+    (MovieSortField.PRICE_DESC, PRICE, 9.99, 1),
+    (MovieSortField.IMDB_DESC, IMDB, "7.5", 1),
+    (MovieSortField.IMDB_DESC, IMDB, float("inf"), 1),
+])
+def test_cursor_values_must_bind_to_the_sort_column(sort_by, expression, value, movie_id):
+    cursor = encode_cursor({"s": sort_by.value, "v": value, "id": movie_id, "d": CURSOR_NEXT})
+
+    with pytest.raises(InvalidCursorError):
+        _parse_movie_cursor(cursor, sort_by, expression)
+
+
+@pytest.mark.parametrize("sort_by, expression, value, parsed", [
+    (MovieSortField.YEAR_ASC, YEAR, 1999, 1999),
+    (MovieSortField.PRICE_ASC, PRICE, Decimal("9.99"), Decimal("9.99")),
+    (MovieSortField.IMDB_ASC, IMDB, 7, 7.0),
+])
+def test_issued_cursor_parses_back_to_the_column_type(sort_by, expression, value, parsed):
+    cursor = _movie_cursor(7, value, sort_by, CURSOR_PREV)
+
+    result = _parse_movie_cursor(cursor, sort_by, expression)
+
+    assert result == (parsed, 7, CURSOR_PREV)
+    assert type(result[0]) is type(parsed)
+
+
+def card(movie_id: int) -> dict:
+    return {
+        "id": movie_id, "uuid": str(uuid.UUID(int=movie_id)), "name": f"Movie {movie_id}", "year": 2000,
+        "time": 120, "imdb": 7.0, "votes": 100, "meta_score": None, "gross": None, "description": None,
+        "price": 10.0, "available": True, "certification_id": 1, "stars": [], "genres": [], "directors": [],
+    }
+
+
+class KeysetSession:
+    """
+    Answers a keyset page statement from in-memory (sort value, id) rows, applying its
+    row comparison, ORDER BY direction and LIMIT the way the database would.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, statement):
+        rows = self.rows
+        clause = statement.whereclause
+        if clause is not None:
+            assert clause.operator in (operator.lt, operator.gt)
+            bound = tuple(element.value for element in clause.right.clauses)
+            rows = [row for row in rows if clause.operator(row, bound)]
+        descending = {order.modifier for order in statement._order_by_clauses} == {desc_op}
+        rows = sorted(rows, reverse=descending)[:statement._limit]
+        return KeysetResult([(card(movie_id), value, movie_id) for value, movie_id in rows])
+
+
+class KeysetResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+def walk(session, filters, size, cursor=None, key="next_cursor"):
+    pages = []
+    while True:
+        page = asyncio.run(paginate_movies_by_cursor(session, movie_cards_select(), filters, cursor, size))
+        pages.append([item.id for item in page.items])
+        cursor = getattr(page, key)
+        if cursor is None:
+            return pages, page
+
+
+ROWS = {
+    YEAR: [(2001, 4), (1999, 7), (2001, 2), (2010, 1), (1999, 3), (2001, 9), (1985, 5)],
+    PRICE: [(Decimal("9.99"), 3), (Decimal("4.50"), 1), (Decimal("9.99"), 2), (Decimal("12.00"), 4)],
+}
+
+
+@pytest.mark.parametrize("sort_by", [
+    MovieSortField.YEAR_ASC, MovieSortField.YEAR_DESC, MovieSortField.PRICE_ASC, MovieSortField.PRICE_DESC,
+])
+@pytest.mark.parametrize("size", [1, 2, 3])
+def test_keyset_pages_cover_the_ordering_once_in_both_directions(sort_by, size):
+    column, descending = MOVIE_SORT_COLUMNS[sort_by]
+    rows = ROWS[column]
+    expected = [movie_id for _, movie_id in sorted(rows, reverse=descending)]
+    session = KeysetSession(rows)
+    filters = movie_filters(sort_by=sort_by)
+
+    forward, last = walk(session, filters, size)
+    backward, first = walk(session, filters, size, last.prev_cursor, "prev_cursor") if last.prev_cursor else ([], last)
+
+    assert [movie_id for page in forward for movie_id in page] == expected
+    assert all(len(page) == size for page in forward[:-1])
+    assert backward == forward[-2::-1]
+    assert first.prev_cursor is None
@@ -0,0 +1,15 @@
+from datetime import datetime, timedelta, timezone
+
+from catalog.deletion import is_stale_deletion
+from database.models.movies import MovieDeletionModel, MovieDeletionStatus
+
+
+def deletion(status: MovieDeletionStatus, idle_seconds: int) -> MovieDeletionModel:
+    return MovieDeletionModel(status=status, updated_at=datetime.now(timezone.utc) - timedelta(seconds=idle_seconds))
+
+
+def test_only_running_deletions_without_recent_progress_are_stale():
+    assert is_stale_deletion(deletion(MovieDeletionStatus.RUNNING, 600), stale_after_seconds=300)
+    assert not is_stale_deletion(deletion(MovieDeletionStatus.RUNNING, 60), stale_after_seconds=300)
+    assert not is_stale_deletion(deletion(MovieDeletionStatus.COMPLETED, 600), stale_after_seconds=300)
+    assert not is_stale_deletion(deletion(MovieDeletionStatus.PENDING, 600), stale_after_seconds=300)
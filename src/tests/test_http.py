@@ -0,0 +1,29 @@
+import pytest
+from starlette.requests import Request
+
+from cache import accepts_encoding
+
+
+def request_with(accept_encoding):
+    headers = [] if accept_encoding is None else [(b"accept-encoding", accept_encoding.encode())]
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.mark.parametrize("header, accepted", [
+    (None, False),
+    ("", False),
+    ("gzip", True),
+    ("deflate, gzip;q=0.5", True),
+    ("GZIP", True),
+    ("x-gzip", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, br", False),
+    ("br, *", True),
+    ("*;q=0", False),
+    ("gzip;q=0, *", False),
+    ("*, gzip;q=0", False),
+    ("gzip;q=abc", False),
+    ("gzipped", False),
+])
+def test_accepts_encoding_honours_q_values(header, accepted):
+    assert accepts_encoding(request_with(header), "gzip") is accepted
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from passlib.context import CryptContext
+
+from security import passwords
+from security.passwords import AsyncPasswordHasher, PasswordHashPolicy, calibrate_password_policy
+
+
+def bcrypt_hash(rounds: int) -> str:
+    return CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash("secret")
+
+
+def test_needs_update_only_for_weaker_or_foreign_hashes():
+    hasher = AsyncPasswordHasher(max_workers=1, policy=PasswordHashPolicy("bcrypt", 11))
+    try:
+        assert hasher.needs_update(bcrypt_hash(10))
+        assert not hasher.needs_update(bcrypt_hash(11))
+        assert not hasher.needs_update(bcrypt_hash(12))
+        assert hasher.needs_update("$argon2id$v=19$m=65536,t=3,p=4$c2FsdHNhbHQ$aGFzaGhhc2hoYXNo")
+    finally:
+        hasher.configure(PasswordHashPolicy())
+
+
+def test_calibration_is_shared_through_the_file(tmp_path, monkeypatch):
+    path = tmp_path / "policy.json"
+    timings = []
+
+    def time_policy(scheme, target_seconds):
+        timings.append(scheme)
+        return PasswordHashPolicy(scheme, 12)
+
+    monkeypatch.setattr(passwords, "_time_password_policy", time_policy)
+
+    assert calibrate_password_policy("bcrypt", 0.25, str(path)) == PasswordHashPolicy("bcrypt", 12)
+    assert json.loads(path.read_text()) == {"scheme": "bcrypt", "cost": 12}
+    path.write_text(json.dumps({"scheme": "bcrypt", "cost": 13}))
+    assert calibrate_password_policy("bcrypt", 0.25, str(path)) == PasswordHashPolicy("bcrypt", 13)
+    assert timings == ["bcrypt"]
+
+    assert calibrate_password_policy("argon2", 0.25, str(path)) == PasswordHashPolicy("argon2", 12)
+    assert timings == ["bcrypt", "argon2"]
+
+
+def test_policy_cost_defaults_and_limits_follow_the_scheme():
+    assert PasswordHashPolicy("bcrypt").cost == 14
+    assert PasswordHashPolicy("argon2").cost == 3
+    with pytest.raises(ValueError):
+        PasswordHashPolicy("argon2", 20)
+    with pytest.raises(ValueError):
+        PasswordHashPolicy("bcrypt", 4)
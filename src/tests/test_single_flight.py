@@ -0,0 +1,62 @@
+import asyncio
+
+from cache import SingleFlight
+
+
+def test_single_flight_runs_one_load_for_concurrent_callers():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("page", loader) for _ in range(5)))
+        return results, flight.is_in_flight("page")
+
+    results, in_flight = asyncio.run(scenario())
+
+    assert results == [1] * 5
+    assert calls == 1
+    assert not in_flight
+
+
+def test_single_flight_shares_the_loader_error():
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise LookupError("boom")
+
+    async def scenario():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do("page", loader) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, LookupError) for result in results)
+
+
+def test_single_flight_hands_the_load_to_a_waiter_when_the_leader_is_cancelled():
+    started = []
+
+    async def loader():
+        started.append(len(started))
+        await asyncio.sleep(0.01)
+        return len(started)
+
+    async def scenario():
+        flight = SingleFlight()
+        leader = asyncio.create_task(flight.do("page", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("page", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await waiter, leader.cancelled()
+
+    result, leader_cancelled = asyncio.run(scenario())
+
+    assert leader_cancelled
+    assert started == [0, 1]
+    assert result == 2
@@ -0,0 +1,37 @@
+from catalog.suggest import PrefixIndex
+
+
+def test_search_matches_the_name_and_every_word_start():
+    index = PrefixIndex([(1, "The Dark Knight"), (2, "Dark City"), (3, "Darkman")])
+
+    assert index.search("dark", 10) == [(2, "Dark City"), (1, "The Dark Knight"), (3, "Darkman")]
+    assert index.search("  KNIGHT ", 10) == [(1, "The Dark Knight")]
+    assert index.search("ark", 10) == []
+    assert index.search(" ", 10) == []
+
+
+def test_search_stops_at_the_limit_and_returns_each_entity_once():
+    index = PrefixIndex([(1, "Alien Alien"), (2, "Aliens"), (3, "Alien 3")])
+
+    assert index.search("alien", 2) == [(1, "Alien Alien"), (3, "Alien 3")]
+
+
+def test_upsert_evicts_the_keys_of_the_previous_name():
+    index = PrefixIndex([(1, "Star Wars")])
+
+    index.upsert(1, "Star Trek")
+
+    assert index.search("wars", 10) == []
+    assert index.search("trek", 10) == [(1, "Star Trek")]
+    assert len(index._entries) == 2
+
+
+def test_remove_evicts_every_key_of_the_entity():
+    index = PrefixIndex([(1, "Blade Runner"), (2, "Blade")])
+
+    index.remove(1)
+    index.remove(42)
+
+    assert len(index) == 1
+    assert index._entries == [("blade", 2)]
+    assert index.search("runner", 10) == []
@@ -0,0 +1,76 @@
+import pytest
+
+from security.token_cache import VerifiedTokenCache
+
+
+class Clock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("security.token_cache.time", clock)
+    return clock
+
+
+def test_entries_expire_at_the_token_exp(clock):
+    cache = VerifiedTokenCache(max_entries=10)
+    digest = cache.digest("token", b"key")
+    cache.set(digest, {"user_id": 1, "exp": clock.now + 60})
+
+    clock.now += 59
+    assert cache.get(digest) == {"user_id": 1, "exp": clock.now + 1}
+    clock.now += 1
+    assert cache.get(digest) is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expired) == (1, 1, 1)
+    assert len(cache) == 0
+
+
+def test_tokens_without_a_numeric_exp_are_not_cached(clock):
+    cache = VerifiedTokenCache(max_entries=10)
+
+    cache.set(b"no-exp", {"user_id": 1})
+    cache.set(b"text-exp", {"user_id": 1, "exp": "tomorrow"})
+
+    assert len(cache) == 0
+
+
+def test_least_recently_used_token_is_evicted(clock):
+    cache = VerifiedTokenCache(max_entries=2)
+    exp = clock.now + 60
+    for digest in (b"a", b"b"):
+        cache.set(digest, {"exp": exp})
+    cache.get(b"a")
+    cache.set(b"c", {"exp": exp})
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") is not None
+    assert cache.stats().evictions == 1
+
+
+def test_zero_entries_disables_the_cache(clock):
+    cache = VerifiedTokenCache(max_entries=0)
+
+    cache.set(b"a", {"exp": clock.now + 60})
+
+    assert cache.get(b"a") is None
+
+
+def test_digest_is_bound_to_the_verifying_key():
+    assert VerifiedTokenCache.digest("token", b"one") != VerifiedTokenCache.digest("token", b"two")
+
+
+def test_returned_claims_are_copies(clock):
+    cache = VerifiedTokenCache(max_entries=10)
+    cache.set(b"a", {"exp": clock.now + 60})
+
+    cache.get(b"a")["exp"] = 0
+
+    assert cache.get(b"a")["exp"] == clock.now + 60
@@ -9,4 +9,15 @@ celery_app = Celery("tasks")
 celery_app.conf.broker_url = os.environ.get("CELERY_BROKER_URL")
 celery_app.conf.result_backend = os.environ.get("CELERY_RESULT_BACKEND")
 
-celery_app.autodiscover_tasks(['workers'])
\ No newline at end of file
+celery_app.autodiscover_tasks(['workers'])
+
+celery_app.conf.beat_schedule = {
+    "reconcile-movie-engagement": {
+        "task": "workers.tasks.reconcile_movie_engagement",
+        "schedule": float(os.environ.get("ENGAGEMENT_RECONCILE_SECONDS", 60 * 60)),
+    },
+    "requeue-movie-deletions": {
+        "task": "workers.tasks.requeue_movie_deletions",
+        "schedule": float(os.environ.get("MOVIE_DELETION_REQUEUE_SECONDS", 5 * 60)),
+    },
+}
\ No newline at end of file
@@ -48,3 +48,102 @@ def remove_activation_token_after_delay(user_id: int, delay_seconds: int):
 
     delete_expired_token(user_id)
     print(f"Token removed after {delay_seconds} seconds for user {user_id}")
+
+
+@celery_app.task
+def reconcile_movie_engagement():
+    from catalog.engagement import reconcile_engagement
+
+    postgres_connection = f"postgresql+asyncpg://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}@"f"{os.getenv('POSTGRES_HOST', 'db')}:{os.getenv('POSTGRES_PORT', 5432)}/{os.getenv('POSTGRES_DB')}"
+
+    async_postgres_engine = create_async_engine(postgres_connection)
+
+    AsyncPostgresqlSessionLocal = sessionmaker(  # type: ignore
+        bind=async_postgres_engine,
+        class_=AsyncSession,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    async def async_reconcile():
+        async with AsyncPostgresqlSessionLocal() as session:
+            try:
+                corrected = await reconcile_engagement(session)
+                await session.commit()
+                print(f"Engagement counters corrected for {corrected} movies")
+            except Exception as e:
+                print(f"Error reconciling engagement counters: {e}")
+                await session.rollback()
+                raise
+        await async_postgres_engine.dispose()
+
+    asyncio.run(async_reconcile())
+
+
+@celery_app.task
+def process_movie_deletion(deletion_id: int):
+    from catalog.deletion import run_movie_deletion, fail_movie_deletion
+    from database.models.movies import MovieDeletionStatus
+
+    postgres_connection = f"postgresql+asyncpg://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}@"f"{os.getenv('POSTGRES_HOST', 'db')}:{os.getenv('POSTGRES_PORT', 5432)}/{os.getenv('POSTGRES_DB')}"
+
+    async_postgres_engine = create_async_engine(postgres_connection)
+
+    AsyncPostgresqlSessionLocal = sessionmaker(  # type: ignore
+        bind=async_postgres_engine,
+        class_=AsyncSession,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    async def async_delete_movie():
+        async with AsyncPostgresqlSessionLocal() as session:
+            try:
+                deletion = await run_movie_deletion(
+                    session, deletion_id,
+                    stale_after_seconds=int(os.environ.get("MOVIE_DELETION_REQUEUE_SECONDS", 5 * 60))
+                )
+                if deletion is not None and deletion.status == MovieDeletionStatus.COMPLETED:
+                    print(f"Movie {deletion.movie_id} deleted, {deletion.processed} dependent rows removed")
+            except Exception as e:
+                print(f"Error deleting movie for deletion {deletion_id}: {e}")
+                await session.rollback()
+                await fail_movie_deletion(session, deletion_id, str(e))
+                await session.commit()
+                raise
+        await async_postgres_engine.dispose()
+
+    asyncio.run(async_delete_movie())
+
+
+@celery_app.task
+def requeue_movie_deletions():
+    from catalog.deletion import stale_movie_deletions
+
+    postgres_connection = f"postgresql+asyncpg://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}@"f"{os.getenv('POSTGRES_HOST', 'db')}:{os.getenv('POSTGRES_PORT', 5432)}/{os.getenv('POSTGRES_DB')}"
+
+    async_postgres_engine = create_async_engine(postgres_connection)
+
+    AsyncPostgresqlSessionLocal = sessionmaker(  # type: ignore
+        bind=async_postgres_engine,
+        class_=AsyncSession,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    async def async_find_stale():
+        async with AsyncPostgresqlSessionLocal() as session:
+            deletion_ids = await stale_movie_deletions(
+                session, int(os.environ.get("MOVIE_DELETION_REQUEUE_SECONDS", 5 * 60))
+            )
+        await async_postgres_engine.dispose()
+        return deletion_ids
+
+    deletion_ids = asyncio.run(async_find_stale())
+    for deletion_id in deletion_ids:
+        process_movie_deletion.delay(deletion_id)
+    if deletion_ids:
+        print(f"Re-enqueued stale movie deletions {deletion_ids}")